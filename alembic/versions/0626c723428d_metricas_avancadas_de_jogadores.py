@@ -0,0 +1,72 @@
+"""Métricas avançadas de jogadores por jogo (particionada) e por temporada
+
+Revision ID: 0626c723428d
+Revises: 806e766e56e1
+Create Date: 2026-10-19 17:55:03.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0626c723428d'
+down_revision: Union[str, Sequence[str], None] = '806e766e56e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+METRIC_COLUMNS = ['ts_pct', 'efg_pct', 'usg_pct', 'ast_to_ratio', 'ast_ratio', 'tov_pct', 'per']
+
+
+def _metric_columns() -> list:
+    return [sa.Column(name, sa.Float(), nullable=True) for name in METRIC_COLUMNS]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('player_game_advanced',
+    sa.Column('season', sa.Integer(), nullable=False, comment='Chave de partição (LIST por temporada)'),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('minutes', sa.Float(), nullable=False),
+    *_metric_columns(),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.source_id'], ),
+    sa.ForeignKeyConstraint(['player_id'], ['players.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.source_id'], ),
+    # A PK (temporada, jogador, jogo) atende o histórico do jogador na temporada
+    sa.PrimaryKeyConstraint('season', 'player_id', 'game_id'),
+    postgresql_partition_by='LIST (season)'
+    )
+    op.execute("SELECT create_season_partition('player_game_advanced', season) FROM seasons ORDER BY season")
+
+    op.create_table('player_season_advanced',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False, comment='Time do último jogo na temporada'),
+    sa.Column('games_played', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('minutes', sa.Float(), server_default='0', nullable=False),
+    *_metric_columns(),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['players.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.source_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('player_id', 'season', name='_player_season_advanced_uc')
+    )
+    op.create_index(op.f('ix_player_season_advanced_season'), 'player_season_advanced', ['season'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_player_season_advanced_season'), table_name='player_season_advanced')
+    op.drop_table('player_season_advanced')
+    # Remove também as partições
+    op.drop_table('player_game_advanced')
@@ -0,0 +1,52 @@
+"""Somas de prefixo por jogador e jogo para médias dos últimos N jogos (particionada)
+
+Revision ID: 0d5d954a6d18
+Revises: ece7e162ba3e
+Create Date: 2026-10-19 19:58:41.206317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d5d954a6d18'
+down_revision: Union[str, Sequence[str], None] = 'ece7e162ba3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STAT_COLUMNS = [
+    'points', 'fgm', 'fga', 'ftm', 'fta', 'tpm', 'tpa', 'off_reb', 'def_reb', 'tot_reb',
+    'assists', 'steals', 'blocks', 'turnovers', 'p_fouls',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('player_game_form',
+    sa.Column('season', sa.Integer(), nullable=False, comment='Chave de partição (LIST por temporada)'),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('game_number', sa.Integer(), nullable=False, comment='Ordem do jogo com minutos na temporada do jogador (1 = primeiro)'),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('cum_minutes', sa.Float(), nullable=False),
+    *[sa.Column(f'cum_{name}', sa.Integer(), nullable=False) for name in STAT_COLUMNS],
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.source_id'], ),
+    sa.ForeignKeyConstraint(['player_id'], ['players.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.source_id'], ),
+    # A PK (temporada, jogador, nº do jogo) localiza as duas linhas de qualquer janela
+    sa.PrimaryKeyConstraint('season', 'player_id', 'game_number'),
+    postgresql_partition_by='LIST (season)'
+    )
+    op.execute("SELECT create_season_partition('player_game_form', season) FROM seasons ORDER BY season")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Remove também as partições
+    op.drop_table('player_game_form')
@@ -0,0 +1,168 @@
+"""Agregados de temporada de jogadores e times mantidos pelo banco
+
+Revision ID: 153498b0b3b7
+Revises: 26f2a83e27b4
+Create Date: 2026-10-19 10:03:17.552940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '153498b0b3b7'
+down_revision: Union[str, Sequence[str], None] = '26f2a83e27b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colunas somadas a partir das estatísticas por jogo
+TOTAL_COLUMNS = [
+    "points", "fgm", "fga", "ftm", "fta", "tpm", "tpa",
+    "off_reb", "def_reb", "tot_reb", "assists", "steals", "blocks", "turnovers", "p_fouls",
+]
+# Médias por jogo: coluna de destino -> coluna total
+AVERAGE_COLUMNS = {
+    "minutes_per_game": "minutes",
+    "points_per_game": "points",
+    "rebounds_per_game": "tot_reb",
+    "assists_per_game": "assists",
+    "steals_per_game": "steals",
+    "blocks_per_game": "blocks",
+    "turnovers_per_game": "turnovers",
+}
+# Aproveitamentos (0-100, mesmo formato da API): coluna de destino -> (convertidos, tentados)
+PERCENTAGE_COLUMNS = {
+    "fgp": ("fgm", "fga"),
+    "ftp": ("ftm", "fta"),
+    "tpp": ("tpm", "tpa"),
+}
+
+PARSE_MINUTES_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION parse_minutes(value text)
+RETURNS numeric AS $$
+    SELECT CASE
+        WHEN value ~ '^\d+:\d{1,2}$' THEN split_part(value, ':', 1)::numeric + split_part(value, ':', 2)::numeric / 60
+        WHEN value ~ '^\d+(\.\d+)?$' THEN value::numeric
+        ELSE 0
+    END
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+"""
+
+
+def _aggregate_columns() -> list:
+    columns = [
+        sa.Column('games_played', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('minutes', sa.Numeric(precision=8, scale=2), nullable=False, server_default='0'),
+    ]
+    columns += [sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in TOTAL_COLUMNS]
+    columns += [sa.Column(name, sa.Numeric(precision=6, scale=2), nullable=True) for name in AVERAGE_COLUMNS]
+    columns += [sa.Column(name, sa.Numeric(precision=5, scale=2), nullable=True) for name in PERCENTAGE_COLUMNS]
+    return columns
+
+
+def _refresh_function(name: str, target: str, source: str, key: str,
+                      games_played: str = "COUNT(*) FILTER (WHERE parse_minutes(s.min_played) > 0)") -> str:
+    """
+    Monta a função que recalcula os agregados de UMA temporada. Como a origem é particionada
+    por temporada, a agregação lê somente a partição da temporada informada. O upsert só
+    reescreve linhas cujo total mudou, e leitores nunca são bloqueados (MVCC), o que dá o
+    mesmo efeito de um REFRESH MATERIALIZED VIEW CONCURRENTLY restrito à temporada.
+    games_played é a expressão que conta os jogos (por padrão, linhas com minutos jogados).
+    """
+    tracked = ["games_played", "minutes", *TOTAL_COLUMNS]
+    sums = ",\n                ".join(f"COALESCE(SUM(s.{column}), 0) AS {column}" for column in TOTAL_COLUMNS)
+    averages = ",\n            ".join(f"round(agg.{total}::numeric / NULLIF(agg.games_played, 0), 2)" for total in AVERAGE_COLUMNS.values())
+    percentages = ",\n            ".join(f"round(100.0 * agg.{made} / NULLIF(agg.{attempted}, 0), 2)" for made, attempted in PERCENTAGE_COLUMNS.values())
+    insert_columns = ", ".join([key, "season", *tracked, *AVERAGE_COLUMNS, *PERCENTAGE_COLUMNS])
+    select_totals = ", ".join(f"agg.{column}" for column in tracked)
+    updates = ",\n            ".join(f"{column} = EXCLUDED.{column}" for column in [*tracked, *AVERAGE_COLUMNS, *PERCENTAGE_COLUMNS])
+    current = ", ".join(f"{target}.{column}" for column in tracked)
+    excluded = ", ".join(f"EXCLUDED.{column}" for column in tracked)
+
+    return f"""
+CREATE OR REPLACE FUNCTION {name}(season_year integer)
+RETURNS integer AS $$
+DECLARE
+    affected integer;
+BEGIN
+    WITH agg AS (
+        SELECT s.{key},
+               {games_played} AS games_played,
+               COALESCE(SUM(parse_minutes(s.min_played)), 0) AS minutes,
+               {sums}
+        FROM {source} s
+        WHERE s.season = season_year
+        GROUP BY s.{key}
+    )
+    INSERT INTO {target} ({insert_columns})
+    SELECT agg.{key}, season_year, {select_totals},
+            {averages},
+            {percentages}
+    FROM agg
+    ON CONFLICT ({key}, season) DO UPDATE SET
+            {updates},
+            updated_at = now()
+    WHERE ({current}) IS DISTINCT FROM ({excluded});
+    GET DIAGNOSTICS affected = ROW_COUNT;
+
+    DELETE FROM {target} t
+    WHERE t.season = season_year
+      AND NOT EXISTS (SELECT 1 FROM {source} s WHERE s.season = season_year AND s.{key} = t.{key});
+
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(PARSE_MINUTES_FUNCTION)
+
+    op.create_table('player_season_statistics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    *_aggregate_columns(),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['players.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('player_id', 'season', name='_player_season_uc')
+    )
+    op.create_index(op.f('ix_player_season_statistics_season'), 'player_season_statistics', ['season'], unique=False)
+
+    op.create_table('team_season_aggregates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    *_aggregate_columns(),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('team_id', 'season', name='_team_season_aggregate_uc')
+    )
+    op.create_index(op.f('ix_team_season_aggregates_season'), 'team_season_aggregates', ['season'], unique=False)
+
+    op.execute(_refresh_function("refresh_player_season_statistics", "player_season_statistics", "player_statistics", "player_id"))
+    op.execute(_refresh_function("refresh_team_season_aggregates", "team_season_aggregates", "team_statistics", "team_id"))
+
+    # Carga inicial para as temporadas já ingeridas
+    op.execute("SELECT refresh_player_season_statistics(season) FROM seasons ORDER BY season")
+    op.execute("SELECT refresh_team_season_aggregates(season) FROM seasons ORDER BY season")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION IF EXISTS refresh_team_season_aggregates(integer)")
+    op.execute("DROP FUNCTION IF EXISTS refresh_player_season_statistics(integer)")
+    op.drop_index(op.f('ix_team_season_aggregates_season'), table_name='team_season_aggregates')
+    op.drop_table('team_season_aggregates')
+    op.drop_index(op.f('ix_player_season_statistics_season'), table_name='player_season_statistics')
+    op.drop_table('player_season_statistics')
+    op.execute("DROP FUNCTION IF EXISTS parse_minutes(text)")
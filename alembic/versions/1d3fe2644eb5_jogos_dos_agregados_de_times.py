@@ -0,0 +1,44 @@
+"""Jogos dos agregados de times contam todas as linhas de team_statistics
+
+Revision ID: 1d3fe2644eb5
+Revises: ec462d029526
+Create Date: 2026-10-20 10:41:05.128734
+
+"""
+import importlib.util
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d3fe2644eb5'
+down_revision: Union[str, Sequence[str], None] = 'ec462d029526'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# A ingestão de team_statistics não trazia os minutos (min_played nulo): contar só linhas com minutos
+# zerava games_played e anulava as médias. Cada linha de time é um jogo disputado, então todas contam.
+# O gerador da função fica na migração que a criou.
+_spec = importlib.util.spec_from_file_location(
+    "agregados_de_temporada", Path(__file__).with_name("153498b0b3b7_agregados_de_temporada_de_jogadores_e_times.py")
+)
+_aggregates = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_aggregates)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(_aggregates._refresh_function(
+        "refresh_team_season_aggregates", "team_season_aggregates", "team_statistics", "team_id", games_played="COUNT(*)"
+    ))
+    op.execute("SELECT refresh_team_season_aggregates(season) FROM seasons ORDER BY season")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(_aggregates._refresh_function(
+        "refresh_team_season_aggregates", "team_season_aggregates", "team_statistics", "team_id"
+    ))
+    op.execute("SELECT refresh_team_season_aggregates(season) FROM seasons ORDER BY season")
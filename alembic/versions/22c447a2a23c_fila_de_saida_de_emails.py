@@ -0,0 +1,45 @@
+"""Fila de saída de e-mails (email_outbox) consumida pelo worker de envio
+
+Revision ID: 22c447a2a23c
+Revises: 4bbee3ac106d
+Create Date: 2026-10-19 16:10:27.804512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '22c447a2a23c'
+down_revision: Union[str, Sequence[str], None] = '4bbee3ac106d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('email_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recipient', sa.String(length=255), nullable=False),
+    sa.Column('template', sa.String(length=50), nullable=False),
+    sa.Column('context', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # O worker busca por (status, next_attempt_at) com FOR UPDATE SKIP LOCKED
+    op.create_index('ix_email_outbox_status_next_attempt', 'email_outbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_outbox_status_next_attempt', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,107 @@
+"""Particiona player_statistics e team_statistics por temporada
+
+Revision ID: 26f2a83e27b4
+Revises: a75855aa7662
+Create Date: 2026-10-19 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26f2a83e27b4'
+down_revision: Union[str, Sequence[str], None] = 'a75855aa7662'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONED_TABLES = ("player_statistics", "team_statistics")
+
+# Chaves estrangeiras e índices recriados na tabela particionada (nomes iguais aos do schema inicial)
+FOREIGN_KEYS = {
+    "player_statistics": [("player_id", "players", "source_id"), ("team_id", "teams", "source_id"), ("game_id", "games", "source_id")],
+    "team_statistics": [("game_id", "games", "source_id"), ("team_id", "teams", "source_id")],
+}
+INDEXED_COLUMNS = {
+    "player_statistics": ["game_id", "player_id", "team_id"],
+    "team_statistics": ["game_id", "team_id"],
+}
+UNIQUE_CONSTRAINTS = {
+    "player_statistics": ("_player_game_uc", ["player_id", "game_id"]),
+    "team_statistics": ("_game_team_uc", ["game_id", "team_id"]),
+}
+
+CREATE_SEASON_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_season_partition(parent_table text, season_year integer)
+RETURNS text AS $$
+DECLARE
+    partition_name text := parent_table || '_' || season_year;
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)', partition_name, parent_table);
+    -- A CHECK equivalente ao limite da partição evita a varredura de validação no ATTACH
+    EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I CHECK (season = %s)', partition_name, partition_name || '_season_check', season_year);
+    EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES IN (%s)', parent_table, partition_name, season_year);
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(CREATE_SEASON_PARTITION_FUNCTION)
+
+    for table in PARTITIONED_TABLES:
+        # Coluna desnormalizada: a temporada vem do jogo, evitando o join com games nas consultas por temporada
+        op.add_column(table, sa.Column('season', sa.Integer(), nullable=True))
+        op.execute(f"UPDATE {table} SET season = games.season FROM games WHERE games.source_id = {table}.game_id")
+        op.alter_column(table, 'season', nullable=False)
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_legacy INCLUDING DEFAULTS) PARTITION BY LIST (season)")
+        # Sem partição DEFAULT: ela impediria o DETACH ... CONCURRENTLY; a ingestão garante a partição antes da carga
+        op.execute(f"SELECT create_season_partition('{table}', season) FROM seasons ORDER BY season")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_legacy")
+
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+        op.drop_table(f"{table}_legacy")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+        # Em tabelas particionadas a chave de partição precisa fazer parte da PK e das restrições de unicidade
+        op.create_primary_key(f"{table}_pkey", table, ['id', 'season'])
+        uc_name, uc_columns = UNIQUE_CONSTRAINTS[table]
+        op.create_unique_constraint(uc_name, table, uc_columns + ['season'])
+        op.create_foreign_key(f"{table}_season_fkey", table, 'seasons', ['season'], ['season'])
+        for column, referred_table, referred_column in FOREIGN_KEYS[table]:
+            op.create_foreign_key(f"{table}_{column}_fkey", table, referred_table, [column], [referred_column])
+        for column in INDEXED_COLUMNS[table]:
+            op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in PARTITIONED_TABLES:
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+        op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+        op.drop_column(table, 'season')
+        op.create_primary_key(f"{table}_pkey", table, ['id'])
+        uc_name, uc_columns = UNIQUE_CONSTRAINTS[table]
+        op.create_unique_constraint(uc_name, table, uc_columns)
+        for column, referred_table, referred_column in FOREIGN_KEYS[table]:
+            op.create_foreign_key(f"{table}_{column}_fkey", table, referred_table, [column], [referred_column])
+        for column in INDEXED_COLUMNS[table]:
+            op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=False)
+
+    op.execute("DROP FUNCTION IF EXISTS create_season_partition(text, integer)")
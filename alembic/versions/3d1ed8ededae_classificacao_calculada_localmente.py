@@ -0,0 +1,60 @@
+"""Classificação calculada localmente a partir dos jogos, com conferência contra a API
+
+Revision ID: 3d1ed8ededae
+Revises: 0d5d954a6d18
+Create Date: 2026-10-19 20:47:12.903415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d1ed8ededae'
+down_revision: Union[str, Sequence[str], None] = '0d5d954a6d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('computed_standings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('conference_name', sa.String(length=100), nullable=True),
+    sa.Column('conference_rank', sa.Integer(), nullable=True),
+    sa.Column('division_name', sa.String(length=100), nullable=True),
+    sa.Column('division_rank', sa.Integer(), nullable=True),
+    sa.Column('win', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('loss', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('home_win', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('home_loss', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('away_win', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('away_loss', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('win_pct', sa.Float(), nullable=True),
+    sa.Column('games_behind', sa.Float(), nullable=True, comment='Jogos atrás do líder da conferência'),
+    sa.Column('streak', sa.Integer(), nullable=True),
+    sa.Column('win_streak', sa.Boolean(), nullable=True),
+    sa.Column('last_game_id', sa.Integer(), nullable=True, comment='Último jogo aplicado ao time'),
+    sa.Column('last_game_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('api_payload_hash', sa.String(length=64), nullable=True, comment='payload_hash da linha de standings (API) conferida'),
+    sa.Column('drift_fields', sa.JSON(), nullable=True, comment='Campos em que a API diverge do cálculo local (vazio = em dia)'),
+    sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['last_game_id'], ['games.source_id'], ),
+    sa.ForeignKeyConstraint(['league_id'], ['leagues.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.source_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('league_id', 'season', 'team_id', name='_computed_standing_uc')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('computed_standings')
@@ -0,0 +1,55 @@
+"""Probabilidades de playoff e play-in simuladas a partir da classificação e do Elo
+
+Revision ID: 49556ebf4dc4
+Revises: 3d1ed8ededae
+Create Date: 2026-10-19 22:05:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '49556ebf4dc4'
+down_revision: Union[str, Sequence[str], None] = '3d1ed8ededae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('playoff_odds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('conference_name', sa.String(length=100), nullable=True),
+    sa.Column('win', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('loss', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('remaining_games', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('elo', sa.Float(), nullable=True, comment='Elo usado na simulação'),
+    sa.Column('projected_win', sa.Float(), nullable=True, comment='Média de vitórias ao fim da temporada'),
+    sa.Column('projected_loss', sa.Float(), nullable=True),
+    sa.Column('top6_prob', sa.Float(), nullable=True, comment='Classificação direta (1º a 6º)'),
+    sa.Column('play_in_prob', sa.Float(), nullable=True, comment='Vaga no play-in (7º a 10º)'),
+    sa.Column('playoff_prob', sa.Float(), nullable=True, comment='Classificação direta ou pelo play-in'),
+    sa.Column('seed_probs', sa.JSON(), nullable=True, comment='Probabilidade de cada colocação na conferência (posição 0 = 1º)'),
+    sa.Column('simulations', sa.Integer(), nullable=False),
+    sa.Column('random_seed', sa.Integer(), nullable=False),
+    sa.Column('inputs_hash', sa.String(length=64), nullable=False, comment='Hash da classificação, calendário e Elo simulados'),
+    sa.Column('simulated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['league_id'], ['leagues.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.source_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('league_id', 'season', 'team_id', name='_playoff_odds_uc')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('playoff_odds')
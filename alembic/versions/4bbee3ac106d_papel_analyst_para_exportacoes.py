@@ -0,0 +1,35 @@
+"""Papel ANALYST no enum userrole para as exportações
+
+Revision ID: 4bbee3ac106d
+Revises: d36616fd8eac
+Create Date: 2026-10-19 15:02:41.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4bbee3ac106d'
+down_revision: Union[str, Sequence[str], None] = 'd36616fd8eac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ALTER TYPE ... ADD VALUE não pode ser usado na mesma transação em que o valor é criado
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE userrole ADD VALUE IF NOT EXISTS 'ANALYST' AFTER 'ADMIN'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # O PostgreSQL não remove valores de um enum: o tipo é recriado sem ANALYST
+    op.execute("UPDATE users SET role = 'USER' WHERE role = 'ANALYST'")
+    op.execute("ALTER TYPE userrole RENAME TO userrole_old")
+    op.execute("CREATE TYPE userrole AS ENUM ('ADMIN', 'USER')")
+    op.execute("ALTER TABLE users ALTER COLUMN role TYPE userrole USING role::text::userrole")
+    op.execute("DROP TYPE userrole_old")
@@ -0,0 +1,33 @@
+"""payload_hash em player_statistics para detectar temporadas alteradas pela ingestão
+
+Revision ID: 806e766e56e1
+Revises: 22c447a2a23c
+Create Date: 2026-10-19 16:58:12.301447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '806e766e56e1'
+down_revision: Union[str, Sequence[str], None] = '22c447a2a23c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Coluna na tabela particionada: o PostgreSQL propaga para todas as partições.
+    # Linhas existentes ficam com NULL e são reescritas uma vez na próxima ingestão.
+    op.add_column('player_statistics', sa.Column(
+        'payload_hash', sa.String(length=64), nullable=True,
+        comment='Hash SHA-256 do payload da API; o upsert só reescreve a linha quando ele muda',
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('player_statistics', 'payload_hash')
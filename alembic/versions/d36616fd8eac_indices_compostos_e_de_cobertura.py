@@ -0,0 +1,84 @@
+"""Índices compostos, de cobertura e parciais apontados pela auditoria de planos
+
+Revision ID: d36616fd8eac
+Revises: 153498b0b3b7
+Create Date: 2026-10-19 11:26:04.318877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd36616fd8eac'
+down_revision: Union[str, Sequence[str], None] = '153498b0b3b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FINISHED_GAME_STATUSES = ("Finished", "Completed", "FT")
+
+# Tabela comum: criados com CONCURRENTLY para não bloquear a escrita durante o build
+GAMES_INDEXES = [
+    ("ix_games_season_home_team_date", ["season", "home_team_id", "game_date"],
+     ["source_id", "visitor_team_id", "status", "home_score", "visitor_score"], None),
+    ("ix_games_season_visitor_team_date", ["season", "visitor_team_id", "game_date"],
+     ["source_id", "home_team_id", "status", "home_score", "visitor_score"], None),
+    ("ix_games_finished_season_date", ["season", "game_date"],
+     ["source_id", "home_team_id", "visitor_team_id", "home_score", "visitor_score"],
+     "status IN ({})".format(", ".join(f"'{status}'" for status in FINISHED_GAME_STATUSES))),
+]
+
+# Tabela particionada: o índice do pai é criado ON ONLY e cada partição é indexada com CONCURRENTLY e anexada
+PLAYER_GAME_LOG_INDEX = "ix_player_statistics_player_game_log"
+PLAYER_GAME_LOG_COLUMNS = ["player_id", "game_id"]
+PLAYER_GAME_LOG_INCLUDE = ["team_id", "min_played", "points", "tot_reb", "assists", "steals", "blocks", "turnovers"]
+
+
+def _index_sql(name: str, table: str, columns: list, include: list, where: str | None, prefix: str = "") -> str:
+    sql = f'CREATE INDEX {prefix}IF NOT EXISTS "{name}" ON {table} ({", ".join(columns)})'
+    if include:
+        sql += f' INCLUDE ({", ".join(include)})'
+    if where:
+        sql += f" WHERE {where}"
+    return sql
+
+
+def _season_partitions(table: str) -> list:
+    bind = op.get_bind()
+    return bind.execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+    ), {"table": table}).scalars().all()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(_index_sql(PLAYER_GAME_LOG_INDEX, "ONLY player_statistics", PLAYER_GAME_LOG_COLUMNS, PLAYER_GAME_LOG_INCLUDE, None))
+    partitions = _season_partitions("player_statistics")
+
+    with op.get_context().autocommit_block():
+        for name, columns, include, where in GAMES_INDEXES:
+            op.execute(_index_sql(name, "games", columns, include, where, prefix="CONCURRENTLY "))
+        for partition in partitions:
+            op.execute(_index_sql(f"{partition}_player_game_log_idx", partition, PLAYER_GAME_LOG_COLUMNS, PLAYER_GAME_LOG_INCLUDE, None, prefix="CONCURRENTLY "))
+
+    # Com todas as partições anexadas o índice do pai passa a ser válido
+    for partition in partitions:
+        op.execute(f'ALTER INDEX "{PLAYER_GAME_LOG_INDEX}" ATTACH PARTITION "{partition}_player_game_log_idx"')
+
+    # Prefixos dos novos índices: ix_games_season é coberto por (season, home_team_id, game_date) e
+    # ix_player_statistics_player_id pelo índice do histórico do jogador
+    op.drop_index(op.f('ix_games_season'), table_name='games')
+    op.drop_index(op.f('ix_player_statistics_player_id'), table_name='player_statistics')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_player_statistics_player_id'), 'player_statistics', ['player_id'], unique=False)
+    op.create_index(op.f('ix_games_season'), 'games', ['season'], unique=False)
+
+    op.drop_index(PLAYER_GAME_LOG_INDEX, table_name='player_statistics')
+    for name, _, _, _ in reversed(GAMES_INDEXES):
+        op.drop_index(name, table_name='games')
@@ -0,0 +1,36 @@
+"""Versão das tabelas de origem usada na última gravação dos derivados de analytics
+
+Revision ID: ec462d029526
+Revises: 49556ebf4dc4
+Create Date: 2026-10-20 09:12:37.514820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ec462d029526'
+down_revision: Union[str, Sequence[str], None] = '49556ebf4dc4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analytics_refreshes',
+    sa.Column('name', sa.String(length=100), nullable=False, comment='Derivado (ex.: advanced_metrics)'),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('source_version', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.PrimaryKeyConstraint('name', 'season')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('analytics_refreshes')
@@ -0,0 +1,72 @@
+"""Elo dos times: histórico por jogo e estado atual por time
+
+Revision ID: ece7e162ba3e
+Revises: f26613cf04d4
+Create Date: 2026-10-19 19:26:08.441730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ece7e162ba3e'
+down_revision: Union[str, Sequence[str], None] = 'f26613cf04d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('game_elo_ratings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('sequence', sa.Integer(), nullable=False, comment='Ordem de aplicação do jogo no histórico completo'),
+    sa.Column('home_team_id', sa.Integer(), nullable=False),
+    sa.Column('visitor_team_id', sa.Integer(), nullable=False),
+    sa.Column('home_elo_pre', sa.Float(), nullable=False),
+    sa.Column('visitor_elo_pre', sa.Float(), nullable=False),
+    sa.Column('home_win_prob', sa.Float(), nullable=False, comment='Probabilidade de vitória do mandante antes do jogo (com mando de quadra)'),
+    sa.Column('home_elo_post', sa.Float(), nullable=False),
+    sa.Column('visitor_elo_post', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.source_id'], ),
+    sa.ForeignKeyConstraint(['home_team_id'], ['teams.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.ForeignKeyConstraint(['visitor_team_id'], ['teams.source_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('game_id'),
+    sa.UniqueConstraint('sequence')
+    )
+    op.create_index(op.f('ix_game_elo_ratings_season'), 'game_elo_ratings', ['season'], unique=False)
+    op.create_index(op.f('ix_game_elo_ratings_home_team_id'), 'game_elo_ratings', ['home_team_id'], unique=False)
+    op.create_index(op.f('ix_game_elo_ratings_visitor_team_id'), 'game_elo_ratings', ['visitor_team_id'], unique=False)
+
+    op.create_table('team_elo_ratings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('elo', sa.Float(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False, comment='Temporada do último jogo aplicado (reversão à média na virada)'),
+    sa.Column('games_played', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_game_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['last_game_id'], ['games.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.source_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('team_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('team_elo_ratings')
+    op.drop_index(op.f('ix_game_elo_ratings_visitor_team_id'), table_name='game_elo_ratings')
+    op.drop_index(op.f('ix_game_elo_ratings_home_team_id'), table_name='game_elo_ratings')
+    op.drop_index(op.f('ix_game_elo_ratings_season'), table_name='game_elo_ratings')
+    op.drop_table('game_elo_ratings')
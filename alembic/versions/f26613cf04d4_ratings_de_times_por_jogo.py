@@ -0,0 +1,56 @@
+"""Ratings de times por jogo (pace, ORtg, DRtg, net e janela móvel)
+
+Revision ID: f26613cf04d4
+Revises: 0626c723428d
+Create Date: 2026-10-19 18:41:37.552910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f26613cf04d4'
+down_revision: Union[str, Sequence[str], None] = '0626c723428d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RATING_COLUMNS = [
+    'possessions', 'pace', 'off_rating', 'def_rating', 'net_rating',
+    'rolling_pace', 'rolling_off_rating', 'rolling_def_rating', 'rolling_net_rating',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('team_game_ratings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('opponent_id', sa.Integer(), nullable=True),
+    sa.Column('game_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_home', sa.Boolean(), nullable=True),
+    sa.Column('game_number', sa.Integer(), nullable=False, comment='Ordem do jogo na temporada do time (1 = primeiro)'),
+    sa.Column('minutes', sa.Float(), nullable=False),
+    *[sa.Column(name, sa.Float(), nullable=True) for name in RATING_COLUMNS],
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.source_id'], ),
+    sa.ForeignKeyConstraint(['opponent_id'], ['teams.source_id'], ),
+    sa.ForeignKeyConstraint(['season'], ['seasons.season'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.source_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('team_id', 'game_id', name='_team_game_rating_uc')
+    )
+    op.create_index(op.f('ix_team_game_ratings_season'), 'team_game_ratings', ['season'], unique=False)
+    op.create_index('ix_team_game_ratings_team_season_number', 'team_game_ratings', ['team_id', 'season', 'game_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_team_game_ratings_team_season_number', table_name='team_game_ratings')
+    op.drop_index(op.f('ix_team_game_ratings_season'), table_name='team_game_ratings')
+    op.drop_table('team_game_ratings')
@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
-from .controllers import user_controller, auth_controller, ingestion_controller, verify_connection
+from .controllers import (
+    user_controller, auth_controller, ingestion_controller, verify_connection,
+    games_controller, teams_controller, players_controller, standings_controller, exports_controller,
+    leaderboards_controller,
+)
 
 api_router = APIRouter()
 
@@ -8,6 +12,12 @@ api_router.include_router(verify_connection.router, prefix="/verify", tags=["Ver
 api_router.include_router(auth_controller.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(user_controller.router, prefix="/users", tags=["Users"])
 api_router.include_router(ingestion_controller.router, prefix="/admin", tags=["Admin"])
+api_router.include_router(games_controller.router, prefix="/games", tags=["Games"])
+api_router.include_router(teams_controller.router, prefix="/teams", tags=["Teams"])
+api_router.include_router(players_controller.router, prefix="/players", tags=["Players"])
+api_router.include_router(standings_controller.router, prefix="/standings", tags=["Standings"])
+api_router.include_router(exports_controller.router, prefix="/exports", tags=["Exports"])
+api_router.include_router(leaderboards_controller.router, prefix="/leaderboards", tags=["Leaderboards"])
 
 @api_router.get("/ping")
 def ping():
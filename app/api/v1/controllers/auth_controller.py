@@ -1,12 +1,13 @@
 import logging
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_db
 from app.core import security
 from app.core.config import get_settings
+from app.core.rate_limit import login_rate_limit, sign_up_rate_limit, password_recovery_rate_limit, reset_password_rate_limit
 from app.repository import user_repository
 from app.schemas import token_schemas, user_schemas, password_reset_schemas
 from app.services import email_service
@@ -15,8 +16,8 @@ router = APIRouter()
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
-@router.post("/sign-up", response_model=user_schemas.User, status_code=status.HTTP_201_CREATED, summary="Cria um novo usuário")
-async def create_new_user(*, db: Session = Depends(get_db), user_in: user_schemas.UserCreate, background_tasks: BackgroundTasks,):  
+@router.post("/sign-up", response_model=user_schemas.User, status_code=status.HTTP_201_CREATED, summary="Cria um novo usuário", dependencies=[Depends(sign_up_rate_limit)])
+async def create_new_user(*, db: Session = Depends(get_db), user_in: user_schemas.UserCreate,):  
     logger.info(f"Criando usuário para: {user_in.email_to_lower}")
     user_existing = user_repository.user.get_by_email(db, email=user_in.email)
     if user_existing:
@@ -34,8 +35,10 @@ async def create_new_user(*, db: Session = Depends(get_db), user_in: user_schema
             detail="Já existe um usuário com este CPF",
         )
     
+    # bcrypt fora do event loop, no pool dedicado
+    password_hash = await security.get_password_hash_async(user_in.password)
     try:
-        user = user_repository.user.create(db, obj_in=user_in)
+        user = user_repository.user.create(db, obj_in=user_in, password_hash=password_hash)
     except Exception as e:
         logger.error(f"Erro ao criar usuário {user_in.email} no banco: {e}")
         raise HTTPException(
@@ -45,14 +48,14 @@ async def create_new_user(*, db: Session = Depends(get_db), user_in: user_schema
 
     token_expires = timedelta(minutes=settings.email_verification_token_expire_minutes)
     verify_token = security.create_access_token(user.email, token_expires)
-    background_tasks.add_task(email_service.send_verification_email, user.email, verify_token)
+    email_service.queue_verification_email(db, user.email, verify_token)
     logger.info(f"Usuário {user.email} criado com sucesso. E-mail de verificação enfileirado.")
     return user
 
-@router.post("/login/access-token", response_model=token_schemas.Token, summary="Obtém um token de acesso JWT")
-def login_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
+@router.post("/login/access-token", response_model=token_schemas.Token, summary="Obtém um token de acesso JWT", dependencies=[Depends(login_rate_limit)])
+async def login_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
     logger.info(f"Tentativa de login para o usuário: {form_data.username}")
-    user = user_repository.user.authenticate(db, email=form_data.username, password=form_data.password)
+    user = await user_repository.user.authenticate_async(db, email=form_data.username, password=form_data.password)
     
     if not user:
         logger.warning(f"Falha na autenticação para o usuário: {form_data.username}")
@@ -78,9 +81,8 @@ def login_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordR
     logger.info(f"Login bem-sucedido para o usuário: {form_data.username}")
     return {"access_token": access_token, "token_type": "bearer"}
 
-@router.post("/password-rec", status_code=status.HTTP_202_ACCEPTED, summary="Solicita reset de senha")
+@router.post("/password-rec", status_code=status.HTTP_202_ACCEPTED, summary="Solicita reset de senha", dependencies=[Depends(password_recovery_rate_limit)])
 async def request_password_recovery(request_data: password_reset_schemas.PasswordResetRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     user = user_repository.user.get_by_email(db, email=request_data.email)
@@ -91,12 +93,12 @@ async def request_password_recovery(request_data: password_reset_schemas.Passwor
     
     reset_token = security.create_password_reset_token(email=user.email)
     user_repository.user.set_password_reset_token(db=db, user=user, token=reset_token)
-    background_tasks.add_task(email_service.send_password_reset_email, user.email, reset_token)
+    email_service.queue_password_reset_email(db, user.email, reset_token)
     return {"message": "Se um usuário com este e-mail existir e estiver ativo, um link de reset será enviado."}
 
 
-@router.post("/reset-password", summary="Define uma nova senha usando o token de reset")
-def reset_password(reset_data: password_reset_schemas.PasswordResetConfirm, db: Session = Depends(get_db),):
+@router.post("/reset-password", summary="Define uma nova senha usando o token de reset", dependencies=[Depends(reset_password_rate_limit)])
+async def reset_password(reset_data: password_reset_schemas.PasswordResetConfirm, db: Session = Depends(get_db),):
     email = security.verify_password_reset_token(reset_data.token)
     if not email:
         logger.warning("Token de reset inválido ou expirado fornecido.")
@@ -123,8 +125,9 @@ def reset_password(reset_data: password_reset_schemas.PasswordResetConfirm, db:
          logger.error(f"Discrepância entre e-mail do token ({email}) e usuário encontrado ({user.email}).")
          raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno.")
 
+    # bcrypt fora do event loop, no pool dedicado
+    hashed_password = await security.get_password_hash_async(reset_data.new_password)
     try:
-        hashed_password = security.get_password_hash(reset_data.new_password)
         user.password_hash = hashed_password
         user_repository.user.clear_password_reset_token(db=db, user=user)
         return {"message": "Senha atualizada com sucesso."}
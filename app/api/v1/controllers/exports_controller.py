@@ -0,0 +1,33 @@
+import logging
+from typing import Literal
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.core.dependencies import get_current_analyst_user
+from app.core.user_cache import CurrentUser
+from app.services import export_service
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/{dataset}", summary="Exporta uma temporada inteira em NDJSON ou CSV (streaming)")
+def export_dataset(
+    dataset: Literal["player_statistics", "team_statistics", "games"],
+    season: int,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    current_user: CurrentUser = Depends(get_current_analyst_user),
+):
+    logger.info(f"Usuário {current_user.id} exportando '{dataset}' da temporada {season} em {format} (gzip={gzip}).")
+
+    filename = f"{dataset}_{season}.{format}"
+    media_type = export_service.EXPORT_MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        export_service.export_stream(dataset, season, format, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
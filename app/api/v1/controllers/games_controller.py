@@ -0,0 +1,97 @@
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_read_db
+from app.core.response_cache import (
+    cache_response, collection_tag, current_season_year, game_tag, make_etag, rows_etag, season_tag, team_tag
+)
+from app.core.responses import FastJSONResponse
+from app.models.game_models import FINISHED_GAME_STATUSES
+from app.repository import read_repository
+from app.schemas.pagination_schemas import Page
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, parse_fields
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+GAME_FIELDS = read_repository.table_fields(read_repository.games_table, exclude=("id",))
+GAME_DEFAULT_FIELDS = [
+    name for name in GAME_FIELDS
+    if name not in ("home_linescore", "visitor_linescore", "created_at", "updated_at")
+]
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+@router.get("", response_model=Page, summary="Lista jogos com filtros e paginação por cursor")
+def list_games(
+    request: Request,
+    season: Optional[int] = None,
+    team_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, description="Data inicial (inclusiva), YYYY-MM-DD"),
+    date_to: Optional[date] = Query(None, description="Data final (inclusiva), YYYY-MM-DD"),
+    game_status: Optional[str] = Query(None, alias="status"),
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, GAME_FIELDS, GAME_DEFAULT_FIELDS, required=read_repository.GAME_SORT_KEYS)
+        cursor_values = decode_cursor(cursor, read_repository.GAME_SORT_TYPES)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("updated_at",) if field not in selected]
+    items, next_cursor = read_repository.list_games(
+        db, selected + version_fields, cursor_values, limit,
+        season=season,
+        team_id=team_id,
+        date_from=_day_start(date_from) if date_from else None,
+        date_to=_day_start(date_to + timedelta(days=1)) if date_to else None,
+        status=game_status,
+        descending=order == "desc",
+    )
+
+    tags = [season_tag(season)] if season is not None else [collection_tag("games")]
+    if team_id is not None:
+        tags.append(team_tag(team_id))
+    etag = rows_etag("games", items, [*read_repository.GAME_SORT_KEYS, "updated_at"], strip=version_fields)
+    cache_response(request, tags, etag=etag, immutable=season is not None and season < current_season_year())
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor, "limit": limit})
+
+@router.get("/{game_id}", summary="Obtém um jogo")
+def read_game(
+    request: Request,
+    game_id: int,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, GAME_FIELDS, GAME_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("status", "updated_at") if field not in selected]
+    game = read_repository.get_game(db, game_id, selected + version_fields)
+    if not game:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jogo não encontrado.")
+
+    finished = game["status"] in FINISHED_GAME_STATUSES
+    etag = rows_etag("games", [game], ["status", "updated_at"], strip=version_fields)
+    cache_response(request, [game_tag(game_id)], etag=etag, immutable=finished)
+    return FastJSONResponse(game)
+
+@router.get("/{game_id}/box-score", summary="Estatísticas dos times e jogadores em um jogo")
+def read_box_score(request: Request, game_id: int, db: Session = Depends(get_read_db)):
+    box_score = read_repository.get_box_score(db, game_id)
+    if not box_score:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jogo não encontrado.")
+
+    etag = make_etag("box-score", box_score["status"], box_score["updated_at"])
+    cache_response(request, [game_tag(game_id)], etag=etag, immutable=box_score["status"] in FINISHED_GAME_STATUSES)
+    return FastJSONResponse(box_score)
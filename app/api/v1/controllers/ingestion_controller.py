@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from app.core.config import get_settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_admin_user
-from app.models.user_models import User
+from app.core.user_cache import CurrentUser
 from app.services.api_client import ApiClient
 from app.tasks import game_task, league_task, player_task, team_task, season_task, standings_task
 
@@ -22,7 +22,7 @@ def get_api_client() -> ApiClient:
 async def run_initial_load(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     api_client: ApiClient = Depends(get_api_client),
 ):  
     if current_user.role != "admin":
@@ -46,7 +46,7 @@ async def run_player_load(
     season_year: int,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     api_client: ApiClient = Depends(get_api_client),
 ):
     if current_user.role != "admin":
@@ -68,7 +68,7 @@ async def run_historical_data_load(
     season: int,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     api_client: ApiClient = Depends(get_api_client),
 ):
     if current_user.role != "admin":
@@ -93,7 +93,7 @@ async def run_historical_data_load(
 async def run_daily_incremental_load(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     api_client: ApiClient = Depends(get_api_client),
     game_date: Optional[str] = None,
 ):
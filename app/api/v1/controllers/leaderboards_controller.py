@@ -0,0 +1,48 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import get_read_db
+from app.core.response_cache import cache_response, make_etag, season_tag
+from app.core.responses import FastJSONResponse
+from app.services.analytics import leaderboards
+
+router = APIRouter()
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+@router.get("/stats", summary="Estatísticas e posições disponíveis nos quadros de líderes")
+def list_leaderboard_stats():
+    return FastJSONResponse({
+        "stats": list(leaderboards.LEADERBOARD_STATS),
+        "positions": list(leaderboards.POSITIONS),
+        "max_limit": settings.leaderboard_size,
+    })
+
+@router.get("/{season}/{stat}", summary="Líderes da temporada numa estatística (por jogo, aproveitamentos e avançadas)")
+def read_leaderboard(
+    request: Request,
+    season: int,
+    stat: str,
+    position: Optional[str] = Query(None, description="G, F ou C (jogadores G-F entram nas duas)"),
+    min_games: int = Query(1, ge=1, le=100, description="Mínimo de jogos com minutos"),
+    limit: int = Query(25, ge=1),
+    db: Session = Depends(get_read_db),
+):
+    if stat not in leaderboards.LEADERBOARD_STATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Estatística desconhecida: {stat}.")
+    if position is not None:
+        position = position.upper()
+        if position not in leaderboards.POSITIONS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Posição inválida: {position}.")
+    if limit > settings.leaderboard_size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"limit deve ser no máximo {settings.leaderboard_size}.")
+
+    boards = leaderboards.get_leaderboards(db, season)
+    rows = boards.board(stat, position, min_games)[:limit]
+
+    etag = make_etag("leaderboards", season, stat, position, min_games, limit, boards.version)
+    cache_response(request, [season_tag(season)], etag=etag)
+    return FastJSONResponse({"season": season, "stat": stat, "position": position, "min_games": min_games, "items": rows})
@@ -0,0 +1,187 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import get_read_db
+from app.core.response_cache import (
+    cache_response, collection_tag, current_season_year, make_etag, player_tag, rows_etag, season_tag, team_tag
+)
+from app.core.responses import FastJSONResponse
+from app.repository import read_repository
+from app.schemas.pagination_schemas import Page
+from app.services.analytics import player_form, similarity
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, parse_fields
+
+router = APIRouter()
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PLAYER_FIELDS = read_repository.table_fields(read_repository.players_table, exclude=("id",))
+PLAYER_DEFAULT_FIELDS = [name for name in PLAYER_FIELDS if name not in ("created_at", "updated_at")]
+PLAYER_GAME_FIELDS = read_repository.table_fields(read_repository.player_statistics_table, exclude=("id",))
+PLAYER_GAME_DEFAULT_FIELDS = [name for name in PLAYER_GAME_FIELDS if name not in ("comment", "created_at", "updated_at")]
+ADVANCED_SEASON_FIELDS = read_repository.table_fields(read_repository.player_season_advanced_table, exclude=("id", "created_at"))
+ADVANCED_GAME_FIELDS = read_repository.table_fields(read_repository.player_game_advanced_table, exclude=("created_at",))
+ADVANCED_GAME_DEFAULT_FIELDS = [name for name in ADVANCED_GAME_FIELDS if name != "updated_at"]
+
+@router.get("", response_model=Page, summary="Lista jogadores com filtros e paginação por cursor")
+def list_players(
+    request: Request,
+    name: Optional[str] = Query(None, description="Início do sobrenome"),
+    team_id: Optional[int] = None,
+    season: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, PLAYER_FIELDS, PLAYER_DEFAULT_FIELDS, required=read_repository.PLAYER_SORT_KEYS)
+        cursor_values = decode_cursor(cursor, read_repository.PLAYER_SORT_TYPES)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("updated_at",) if field not in selected]
+    items, next_cursor = read_repository.list_players(
+        db, selected + version_fields, cursor_values, limit, name=name, team_id=team_id, season=season
+    )
+
+    tags = [collection_tag("players")]
+    if season is not None:
+        tags.append(season_tag(season))
+    if team_id is not None:
+        tags.append(team_tag(team_id))
+    etag = rows_etag("players", items, [*read_repository.PLAYER_SORT_KEYS, "updated_at"], strip=version_fields)
+    cache_response(request, tags, etag=etag)
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor, "limit": limit})
+
+@router.get("/{player_id}", summary="Obtém um jogador")
+def read_player(
+    request: Request,
+    player_id: int,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, PLAYER_FIELDS, PLAYER_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("updated_at",) if field not in selected]
+    player = read_repository.get_player(db, player_id, selected + version_fields)
+    if not player:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jogador não encontrado.")
+
+    etag = rows_etag("players", [player], ["updated_at"], strip=version_fields)
+    cache_response(request, [player_tag(player_id)], etag=etag)
+    return FastJSONResponse(player)
+
+@router.get("/{player_id}/games", response_model=Page, summary="Histórico jogo a jogo de um jogador na temporada")
+def list_player_games(
+    request: Request,
+    player_id: int,
+    season: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, PLAYER_GAME_FIELDS, PLAYER_GAME_DEFAULT_FIELDS, required=read_repository.PLAYER_GAME_SORT_KEYS)
+        cursor_values = decode_cursor(cursor, read_repository.PLAYER_GAME_SORT_TYPES)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("updated_at",) if field not in selected]
+    items, next_cursor = read_repository.list_player_games(db, player_id, season, selected + version_fields, cursor_values, limit)
+
+    etag = rows_etag("players", items, [*read_repository.PLAYER_GAME_SORT_KEYS, "updated_at"], strip=version_fields)
+    cache_response(request, [player_tag(player_id), season_tag(season)], etag=etag, immutable=season < current_season_year())
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor, "limit": limit})
+
+@router.get("/{player_id}/advanced", summary="Métricas avançadas do jogador na temporada (TS%, eFG%, USG%, PER...)")
+def read_player_advanced(
+    request: Request,
+    player_id: int,
+    season: int,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, ADVANCED_SEASON_FIELDS, ADVANCED_SEASON_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("updated_at",) if field not in selected]
+    metrics = read_repository.get_player_season_advanced(db, player_id, season, selected + version_fields)
+    if not metrics:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Métricas avançadas não encontradas para o jogador na temporada.")
+
+    etag = rows_etag("players", [metrics], ["updated_at"], strip=version_fields)
+    cache_response(request, [player_tag(player_id), season_tag(season)], etag=etag)
+    return FastJSONResponse(metrics)
+
+@router.get("/{player_id}/advanced/games", response_model=Page, summary="Métricas avançadas jogo a jogo do jogador na temporada")
+def list_player_advanced_games(
+    request: Request,
+    player_id: int,
+    season: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, ADVANCED_GAME_FIELDS, ADVANCED_GAME_DEFAULT_FIELDS, required=read_repository.PLAYER_GAME_SORT_KEYS)
+        cursor_values = decode_cursor(cursor, read_repository.PLAYER_GAME_SORT_TYPES)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("updated_at",) if field not in selected]
+    items, next_cursor = read_repository.list_player_game_advanced(db, player_id, season, selected + version_fields, cursor_values, limit)
+
+    etag = rows_etag("players", items, [*read_repository.PLAYER_GAME_SORT_KEYS, "updated_at"], strip=version_fields)
+    cache_response(request, [player_tag(player_id), season_tag(season)], etag=etag)
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor, "limit": limit})
+
+@router.get("/{player_id}/form", summary="Médias do jogador nos últimos N jogos da temporada")
+def read_player_form(
+    request: Request,
+    player_id: int,
+    season: int,
+    windows: Optional[str] = Query(None, description="Janelas separadas por vírgula (ex.: 5,10,20)"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = [int(value) for value in windows.split(",")] if windows else list(settings.player_form_windows)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Janelas inválidas: use inteiros separados por vírgula.")
+    if not selected or any(window < 1 or window > 100 for window in selected):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cada janela deve estar entre 1 e 100 jogos.")
+
+    form = player_form.get_player_form(db, player_id, season, sorted(set(selected)))
+    if form is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum jogo com minutos do jogador na temporada.")
+
+    etag = rows_etag("players", [form], ["updated_at"], strip=["updated_at"])
+    cache_response(request, [player_tag(player_id), season_tag(season)], etag=etag)
+    return FastJSONResponse(form)
+
+@router.get("/{player_id}/similar", summary="Temporadas de jogadores mais parecidas com a do jogador (todo o histórico)")
+def read_similar_players(
+    request: Request,
+    player_id: int,
+    season: int,
+    limit: int = Query(10, ge=1, le=100),
+    include_self: bool = Query(False, description="Inclui outras temporadas do próprio jogador"),
+    db: Session = Depends(get_read_db),
+):
+    results = similarity.find_similar(db, player_id, season, limit, include_self=include_self)
+    if results is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jogador sem perfil indexado na temporada (minutos insuficientes).")
+
+    etag = make_etag("players", "similar", player_id, season, limit, include_self, similarity.get_index().stamp)
+    cache_response(request, [player_tag(player_id), season_tag(season)], etag=etag)
+    return FastJSONResponse({"player_id": player_id, "season": season, "items": results})
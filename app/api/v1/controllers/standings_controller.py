@@ -0,0 +1,85 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_read_db
+from app.core.response_cache import cache_response, current_season_year, rows_etag, standings_tag
+from app.core.responses import FastJSONResponse
+from app.repository import read_repository
+from app.utils.pagination import parse_fields
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+STANDING_FIELDS = read_repository.table_fields(
+    read_repository.standings_table, exclude=("id", "payload_hash", "ingested_at", "is_active", "source_id")
+)
+STANDING_DEFAULT_FIELDS = [name for name in STANDING_FIELDS if name not in ("created_at",)]
+COMPUTED_STANDING_FIELDS = read_repository.table_fields(read_repository.computed_standings_table, exclude=("id", "created_at"))
+COMPUTED_STANDING_DEFAULT_FIELDS = [name for name in COMPUTED_STANDING_FIELDS if name not in ("api_payload_hash", "reconciled_at")]
+PLAYOFF_ODDS_FIELDS = read_repository.table_fields(read_repository.playoff_odds_table, exclude=("id", "created_at", "updated_at"))
+PLAYOFF_ODDS_DEFAULT_FIELDS = [name for name in PLAYOFF_ODDS_FIELDS if name not in ("inputs_hash", "random_seed")]
+
+@router.get("", summary="Classificação de uma temporada")
+def list_standings(
+    request: Request,
+    season: int,
+    league_id: Optional[int] = None,
+    conference: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, STANDING_FIELDS, STANDING_DEFAULT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("team_id", "payload_hash", "updated_at") if field not in selected]
+    standings = read_repository.list_standings(db, season, selected + version_fields, league_id=league_id, conference=conference)
+
+    etag = rows_etag("standings", standings, ["team_id", "payload_hash", "updated_at"], strip=version_fields)
+    cache_response(request, [standings_tag(season)], etag=etag, immutable=season < current_season_year())
+    return FastJSONResponse(standings)
+
+@router.get("/computed", summary="Classificação calculada dos jogos encerrados (atualizada a cada ingestão de jogos)")
+def list_computed_standings(
+    request: Request,
+    season: int,
+    league_id: Optional[int] = None,
+    conference: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, COMPUTED_STANDING_FIELDS, COMPUTED_STANDING_DEFAULT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("team_id", "updated_at") if field not in selected]
+    standings = read_repository.list_computed_standings(db, season, selected + version_fields, league_id=league_id, conference=conference)
+
+    etag = rows_etag("standings", standings, ["team_id", "updated_at"], strip=version_fields)
+    cache_response(request, [standings_tag(season)], etag=etag, immutable=season < current_season_year())
+    return FastJSONResponse(standings)
+
+@router.get("/odds", summary="Probabilidades de playoff, play-in e colocação simuladas a partir da classificação e do Elo")
+def list_playoff_odds(
+    request: Request,
+    season: int,
+    league_id: Optional[int] = None,
+    conference: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, PLAYOFF_ODDS_FIELDS, PLAYOFF_ODDS_DEFAULT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("team_id", "inputs_hash") if field not in selected]
+    odds = read_repository.list_playoff_odds(db, season, selected + version_fields, league_id=league_id, conference=conference)
+
+    etag = rows_etag("playoff_odds", odds, ["team_id", "inputs_hash"], strip=version_fields)
+    cache_response(request, [standings_tag(season)], etag=etag, immutable=season < current_season_year())
+    return FastJSONResponse(odds)
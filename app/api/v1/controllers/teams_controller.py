@@ -0,0 +1,124 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_read_db
+from app.core.response_cache import cache_response, collection_tag, current_season_year, make_etag, rows_etag, season_tag, team_tag
+from app.core.responses import FastJSONResponse
+from app.repository import read_repository
+from app.schemas.pagination_schemas import Page
+from app.services.analytics import linescores
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, parse_fields
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+TEAM_FIELDS = read_repository.table_fields(read_repository.teams_table, exclude=("id",))
+TEAM_DEFAULT_FIELDS = [name for name in TEAM_FIELDS if name not in ("created_at", "updated_at")]
+
+@router.get("", response_model=Page, summary="Lista times com paginação por cursor")
+def list_teams(
+    request: Request,
+    is_nba_franchise: Optional[bool] = None,
+    code: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, TEAM_FIELDS, TEAM_DEFAULT_FIELDS, required=read_repository.TEAM_SORT_KEYS)
+        cursor_values = decode_cursor(cursor, read_repository.TEAM_SORT_TYPES)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("updated_at",) if field not in selected]
+    items, next_cursor = read_repository.list_teams(
+        db, selected + version_fields, cursor_values, limit, is_nba_franchise=is_nba_franchise, code=code
+    )
+
+    etag = rows_etag("teams", items, [*read_repository.TEAM_SORT_KEYS, "updated_at"], strip=version_fields)
+    cache_response(request, [collection_tag("teams")], etag=etag)
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor, "limit": limit})
+
+@router.get("/{team_id}", summary="Obtém um time")
+def read_team(
+    request: Request,
+    team_id: int,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, TEAM_FIELDS, TEAM_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version_fields = [field for field in ("updated_at",) if field not in selected]
+    team = read_repository.get_team(db, team_id, selected + version_fields)
+    if not team:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Time não encontrado.")
+
+    etag = rows_etag("teams", [team], ["updated_at"], strip=version_fields)
+    cache_response(request, [team_tag(team_id)], etag=etag)
+    return FastJSONResponse(team)
+
+@router.get("/{team_id}/season-statistics", summary="Estatísticas de temporada de um time")
+def read_team_season_statistics(
+    request: Request,
+    team_id: int,
+    season: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+):
+    statistics = read_repository.list_team_season_statistics(db, team_id, season)
+
+    tags = [team_tag(team_id)] + ([season_tag(season)] if season is not None else [])
+    etag = rows_etag("teams", statistics, ["season", "updated_at"])
+    cache_response(request, tags, etag=etag, immutable=season is not None and season < current_season_year())
+    return FastJSONResponse(statistics)
+
+@router.get("/{team_id}/ratings", summary="Pace e ratings (ORtg, DRtg, net) do time por jogo, com janela móvel")
+def read_team_ratings(
+    request: Request,
+    team_id: int,
+    season: int,
+    db: Session = Depends(get_read_db),
+):
+    ratings = read_repository.list_team_game_ratings(db, team_id, season)
+
+    etag = rows_etag("teams", ratings, ["game_id", "updated_at"])
+    cache_response(request, [team_tag(team_id), season_tag(season)], etag=etag)
+    return FastJSONResponse(ratings)
+
+@router.get("/{team_id}/elo", summary="Elo atual do time e evolução jogo a jogo na temporada")
+def read_team_elo(
+    request: Request,
+    team_id: int,
+    season: int,
+    db: Session = Depends(get_read_db),
+):
+    current = read_repository.get_team_elo(db, team_id)
+    if current is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Elo do time não encontrado.")
+    games = read_repository.list_team_elo_history(db, team_id, season)
+    result = {"current": current, "games": games}
+
+    etag = rows_etag("teams", [current, *games], ["updated_at"])
+    cache_response(request, [team_tag(team_id), season_tag(season)], etag=etag)
+    return FastJSONResponse(result)
+
+@router.get("/{team_id}/linescores", summary="Saldo por quarto, viradas, jogos equilibrados e prorrogações do time na temporada")
+def read_team_linescores(
+    request: Request,
+    team_id: int,
+    season: int,
+    db: Session = Depends(get_read_db),
+):
+    season_linescores = linescores.get_linescores(db, season)
+    summary = season_linescores.teams.get(team_id)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Time sem linescores na temporada.")
+
+    etag = make_etag("linescores", season, team_id, season_linescores.version)
+    cache_response(request, [team_tag(team_id), season_tag(season)], etag=etag)
+    return FastJSONResponse({**summary, "league": season_linescores.league()})
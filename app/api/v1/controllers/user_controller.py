@@ -1,14 +1,14 @@
 import logging
 from datetime import timedelta
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core import security
 from app.core.config import get_settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_current_admin_user
-from app.models.user_models import User
+from app.core.user_cache import CurrentUser
 from app.repository import user_repository
 from app.schemas import user_schemas, token_schemas
 from app.services import email_service
@@ -46,7 +46,7 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
         return {"message": "Sua conta já foi verificada anteriormente."}
     
     try:
-        user_repository.user.set_user_verified(db, user)
+        user_repository.user.set_user_verified(db, email=user.email)
         return {"message": "E-mail verificado com sucesso."}
     except Exception as e:
         logger.error(f"Erro ao verificar e-mail do usuário {user.email}: {e}")
@@ -56,20 +56,20 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
         )
 
 @router.get("/profile", response_model=user_schemas.User, summary="Obtém o perfil do usuário")
-def read_user_profile(current_user: User = Depends(get_current_user)):
+def read_user_profile(db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     if not current_user.is_verified:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Por favor, verifique seu e-mail para ativar sua conta."
         )
-    return current_user
+    return user_repository.user.get(db, id=current_user.id)
 
 @router.patch("/profile", response_model=user_schemas.User, summary="Atualiza o perfil do usuário atual")
 def update_user_profile(
     *,
     db: Session = Depends(get_db),
     user_in: user_schemas.UserUpdate,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if not current_user.is_verified:
         raise HTTPException(
@@ -84,7 +84,8 @@ def update_user_profile(
         )
     
     try:
-        updated_user = user_repository.user.update(db, current_user, user_in)
+        user = user_repository.user.get(db, id=current_user.id)
+        updated_user = user_repository.user.update(db, db_obj=user, obj_in=user_in)
         logger.info(f"Perfil {current_user.email} atualizado com sucesso.")
         return updated_user
     except Exception as e:
@@ -95,7 +96,7 @@ def update_user_profile(
         )
 
 @router.get("/", response_model=List[user_schemas.User], summary="Obtém uma lista de todos os usuários [Admin apenas]")
-def read_users(db: Session = Depends(get_db), skip: int = 0, limit: int = 100, current_user: User = Depends(get_current_admin_user)):
+def read_users(db: Session = Depends(get_db), skip: int = 0, limit: int = 100, current_user: CurrentUser = Depends(get_current_admin_user)):
     if current_user:
         logger.info(f"Admin {current_user.email} solicitou a lista de usuários.")
     users = user_repository.user.get_multi(db, skip=skip, limit=limit)
@@ -105,7 +106,7 @@ def read_users(db: Session = Depends(get_db), skip: int = 0, limit: int = 100, c
 def read_user_by_id(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     if current_user:
         logger.info(f"Admin {current_user.email} solicitou detalhes do usuário ID: {user_id}")
@@ -121,7 +122,7 @@ def read_user_by_id(
 def delete_user_by_id(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     if current_user:
         logger.info(f"Admin {current_user.email} tentou excluir o usuário ID: {user_id}")
@@ -149,7 +150,6 @@ def delete_user_by_id(
 @router.post("/{user_id}/resend-email-verification", status_code=status.HTTP_202_ACCEPTED, summary="Reenvia o e-mail de verificação para um usuário")
 async def resend_email_verification(
     user_id: int,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     user = user_repository.user.get(db, id=user_id)
@@ -163,6 +163,6 @@ async def resend_email_verification(
     
     token_expires = timedelta(minutes=settings.email_verification_token_expire_minutes)
     verify_token = security.create_access_token(user.email, token_expires)
-    background_tasks.add_task(email_service.send_verification_email, user.email, verify_token)
+    email_service.queue_verification_email(db, user.email, verify_token)
     logger.info(f"E-mail de verificação reenviado para o usuário ID: {user_id}.")
     return {"message": "E-mail de verificação reenviado com sucesso."}
\ No newline at end of file
@@ -0,0 +1,85 @@
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.database import create_read_session
+from app.services.analytics import leaderboards
+from app.services.analytics.player_analytics import build_season_table
+from app.services.analytics.season_cache import invalidate_analytics
+
+# Reconstrução a frio dos quadros de líderes de uma temporada (como após um restart ou uma ingestão)
+# e custo de servir um quadro já montado. A reconstrução é separada em: tabela da temporada (COPY +
+# NumPy), métricas/posições/nomes e montagem dos quadros pré-calculados.
+# Uso: python -m app.benchmarks.leaderboards --season 2024 [--repeat 5] [--requests 20000] [--json]
+
+def run_benchmark(season: int, repeat: int, request_count: int) -> Dict[str, Any]:
+    db = create_read_session()
+    try:
+        table_ms: List[float] = []
+        rebuild_ms: List[float] = []
+        boards = None
+        for _ in range(repeat):
+            invalidate_analytics([season])
+            start = time.perf_counter()
+            build_season_table(db, season)
+            table_ms.append((time.perf_counter() - start) * 1000)
+
+            invalidate_analytics([season])
+            start = time.perf_counter()
+            boards = leaderboards.get_leaderboards(db, season)
+            rebuild_ms.append((time.perf_counter() - start) * 1000)
+
+        # Pedidos sobre filtros pré-calculados: hits no dicionário de quadros
+        rng = random.Random(42)
+        keys = [
+            (rng.choice(leaderboards.LEADERBOARD_STATS), rng.choice([None, *leaderboards.POSITIONS]),
+             rng.choice(leaderboards.settings.leaderboard_min_games))
+            for _ in range(request_count)
+        ]
+        start = time.perf_counter()
+        for stat, position, min_games in keys:
+            leaderboards.get_leaderboards(db, season).board(stat, position, min_games)[:25]
+        serve_us = (time.perf_counter() - start) / max(request_count, 1) * 1e6
+    finally:
+        db.close()
+
+    return {
+        "season": season,
+        "players": len(boards.player_ids) if boards else 0,
+        "precomputed_boards": len(boards.boards) if boards else 0,
+        "season_table_ms": round(statistics.median(table_ms), 2),
+        "cold_rebuild_ms": round(statistics.median(rebuild_ms), 2),
+        "cold_rebuild_max_ms": round(max(rebuild_ms), 2),
+        "serve_us": round(serve_us, 2),
+        "requests": request_count,
+    }
+
+def format_report(result: Dict[str, Any]) -> str:
+    return "\n".join([
+        f"temporada {result['season']}: {result['players']} jogadores, {result['precomputed_boards']} quadros pré-calculados",
+        f"tabela da temporada:  {result['season_table_ms']:>9.2f} ms (mediana)",
+        f"reconstrução a frio:  {result['cold_rebuild_ms']:>9.2f} ms (mediana, máx. {result['cold_rebuild_max_ms']:.2f} ms)",
+        f"servir um quadro:     {result['serve_us']:>9.2f} µs/pedido ({result['requests']} pedidos)",
+    ])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da reconstrução a frio e do acesso aos quadros de líderes.")
+    parser.add_argument("--season", type=int, required=True, help="Temporada (ex.: 2024).")
+    parser.add_argument("--repeat", type=int, default=5, help="Reconstruções medidas (vale a mediana).")
+    parser.add_argument("--requests", type=int, default=20000, help="Pedidos de quadros já montados.")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON.")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.season, args.repeat, args.requests)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
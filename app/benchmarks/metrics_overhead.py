@@ -0,0 +1,147 @@
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import FastAPI
+
+from app.benchmarks.serialization import build_rows
+from app.core.metrics import RequestMetrics
+from app.core.middleware import install_middleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.responses import FastJSONResponse
+
+# Custo da instrumentação do /metrics por requisição: a mesma rota de listagem (página de 50
+# linhas serializada com orjson, sem banco) atrás da pilha de middlewares da API (install_middleware),
+# com e sem as métricas de requisição, chamando a aplicação ASGI diretamente (sem rede).
+# As requisições com e sem métricas se alternam uma a uma (a ordem também alterna), e o overhead é a
+# mediana das diferenças de cada par: a variação de frequência da CPU afeta os dois lados do par.
+# O custo isolado (QueryStatsMiddleware com e sem métricas sobre uma aplicação ASGI vazia) é o limite
+# inferior, sem a rota.
+# Uso: python -m app.benchmarks.metrics_overhead --requests 5000 --repeat 3
+
+def build_app(page_size: int, metrics: bool) -> FastAPI:
+    keys, rows = build_rows(page_size)
+    items = [dict(zip(keys, row)) for row in rows]
+    app = FastAPI()
+    install_middleware(app, metrics=metrics)
+
+    # async: sem o threadpool, cuja variação de agendamento encobriria o custo medido
+    @app.get("/api/v1/games/{game_id}/players")
+    async def list_page(game_id: int):
+        return FastJSONResponse({"items": items, "next_cursor": None})
+
+    return app
+
+async def _noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+def _scope() -> Dict[str, Any]:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/v1/games/10001/players", "raw_path": b"/api/v1/games/10001/players", "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def _send(message):
+    pass
+
+async def _drive(app, count: int) -> float:
+    scope = _scope()
+    start = time.perf_counter()
+    for _ in range(count):
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - start
+
+async def _paired(base, instrumented, count: int) -> Tuple[List[float], List[float]]:
+    """
+    Tempo de cada requisição sem métricas e a diferença para a requisição com métricas do mesmo par.
+    """
+    scope = _scope()
+    clock = time.perf_counter
+    baseline: List[float] = []
+    differences: List[float] = []
+    for number in range(count):
+        pair = (base, instrumented) if number % 2 == 0 else (instrumented, base)
+        elapsed = []
+        for app in pair:
+            start = clock()
+            await app(dict(scope), _receive, _send)
+            elapsed.append(clock() - start)
+        plain, metered = elapsed if number % 2 == 0 else elapsed[::-1]
+        baseline.append(plain)
+        differences.append(metered - plain)
+    return baseline, differences
+
+def run_benchmark(request_count: int, repeat: int, page_size: int) -> Dict[str, Any]:
+    # Duas aplicações iguais a não ser pelas métricas; com os pares alternados, duas aplicações sem
+    # métricas medem diferença abaixo de 0,1%
+    app = build_app(page_size, metrics=False)
+    instrumented = build_app(page_size, metrics=True)
+    noop = QueryStatsMiddleware(_noop_app)
+    noop_instrumented = QueryStatsMiddleware(_noop_app, metrics=RequestMetrics())
+    best = {"noop": float("inf"), "noop com métricas": float("inf")}
+    baseline: List[float] = []
+    differences: List[float] = []
+
+    async def measure():
+        for warm in (app, instrumented, noop, noop_instrumented):
+            await _drive(warm, min(200, request_count))  # aquecimento (rotas, orjson, filhos das métricas)
+        for _ in range(repeat):
+            gc.collect()
+            plain, extra = await _paired(app, instrumented, request_count)
+            baseline.extend(plain)
+            differences.extend(extra)
+            # Custo isolado: melhor tempo sobre a aplicação vazia
+            for name, target in (("noop", noop), ("noop com métricas", noop_instrumented)):
+                gc.collect()
+                best[name] = min(best[name], await _drive(target, request_count))
+
+    asyncio.run(measure())
+    route = statistics.median(baseline)
+    overhead = statistics.median(differences)
+    middleware_only = (best["noop com métricas"] - best["noop"]) / request_count
+    return {
+        "requests": request_count * repeat,
+        "page_size": page_size,
+        "baseline_us": round(route * 1e6, 2),
+        "instrumented_us": round((route + overhead) * 1e6, 2),
+        "overhead_us": round(overhead * 1e6, 2),
+        "overhead_percent": round(100 * overhead / route, 2),
+        "middleware_only_us": round(middleware_only * 1e6, 2),
+        "middleware_only_percent": round(100 * middleware_only / route, 2),
+    }
+
+def format_report(result: Dict[str, Any]) -> str:
+    return "\n".join([
+        f"requisições: {result['requests']} pares  (página de {result['page_size']} linhas)",
+        f"sem métricas: {result['baseline_us']:>9.2f} µs/req",
+        f"com métricas: {result['instrumented_us']:>9.2f} µs/req",
+        f"overhead:     {result['overhead_us']:>9.2f} µs/req ({result['overhead_percent']:.2f}%)",
+        f"middleware isolado: {result['middleware_only_us']:.2f} µs/req ({result['middleware_only_percent']:.2f}% da rota sem métricas)",
+    ])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do overhead das métricas de requisição.")
+    parser.add_argument("--requests", type=int, default=5000, help="Pares de requisições por repetição.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (o custo isolado vale o melhor tempo).")
+    parser.add_argument("--page-size", type=int, default=50, help="Linhas na resposta da rota medida.")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON.")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.requests, args.repeat, args.page_size)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
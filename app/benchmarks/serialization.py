@@ -0,0 +1,124 @@
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+from app.schemas.player_schemas import PlayerStatistics
+
+# Compara o caminho padrão do FastAPI (response_model + jsonable_encoder + json) com a
+# FastJSONResponse sobre dicionários montados das tuplas do banco, em linhas no formato do
+# box score / game log (Numeric(5,2) em fgp, ftp e tpp).
+# Uso: python -m app.benchmarks.serialization --rows 5000 --repeat 5
+
+def build_rows(count: int, seed: int = 42) -> Tuple[List[str], List[tuple]]:
+    rng = random.Random(seed)
+    keys = [
+        "id", "player_id", "team_id", "game_id", "season", "points", "position", "min_played",
+        "fgm", "fga", "fgp", "ftm", "fta", "ftp", "tpm", "tpa", "tpp", "off_reb", "def_reb",
+        "tot_reb", "assists", "p_fouls", "steals", "turnovers", "blocks", "plus_minus",
+        "created_at", "updated_at",
+    ]
+    start = datetime(2024, 10, 22, tzinfo=timezone.utc)
+    rows = []
+    for index in range(count):
+        fga, fta, tpa = rng.randint(0, 25), rng.randint(0, 12), rng.randint(0, 12)
+        fgm, ftm, tpm = rng.randint(0, fga), rng.randint(0, fta), rng.randint(0, tpa)
+        timestamp = start + timedelta(minutes=index)
+        rows.append((
+            index, rng.randint(1, 600), rng.randint(1, 30), 10000 + index // 20, 2024,
+            2 * fgm + tpm + ftm, rng.choice(["G", "F", "C"]), f"{rng.randint(0, 48)}:{rng.randint(0, 59):02d}",
+            fgm, fga, Decimal(f"{100 * fgm / fga:.2f}") if fga else None,
+            ftm, fta, Decimal(f"{100 * ftm / fta:.2f}") if fta else None,
+            tpm, tpa, Decimal(f"{100 * tpm / tpa:.2f}") if tpa else None,
+            rng.randint(0, 5), rng.randint(0, 10), rng.randint(0, 15), rng.randint(0, 12),
+            rng.randint(0, 6), rng.randint(0, 4), rng.randint(0, 6), rng.randint(0, 4),
+            str(rng.randint(-20, 20)), timestamp, timestamp,
+        ))
+    return keys, rows
+
+def _best_of(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run_benchmark(row_count: int, repeat: int) -> List[Dict[str, Any]]:
+    keys, rows = build_rows(row_count)
+
+    def pydantic_models() -> bytes:
+        # Caminho com response_model: um modelo Pydantic por linha, jsonable_encoder e json.dumps
+        models = [PlayerStatistics.model_validate(dict(zip(keys, row))) for row in rows]
+        return JSONResponse(jsonable_encoder({"items": models})).body
+
+    def jsonable_dicts() -> bytes:
+        # Caminho padrão sem response_model: dicionários passam pelo jsonable_encoder e json.dumps
+        items = [dict(zip(keys, row)) for row in rows]
+        return JSONResponse(jsonable_encoder({"items": items})).body
+
+    def fast_tuples() -> bytes:
+        # Caminho rápido: dicionários das tuplas serializados direto com orjson
+        items = [dict(zip(keys, row)) for row in rows]
+        return FastJSONResponse({"items": items}).body
+
+    cases = [
+        ("pydantic + jsonable_encoder + json", pydantic_models),
+        ("dicts + jsonable_encoder + json", jsonable_dicts),
+        ("tuplas + FastJSONResponse (orjson)", fast_tuples),
+    ]
+
+    # O caminho rápido precisa produzir o mesmo JSON do jsonable_encoder (Decimal como número).
+    # O modo JSON do Pydantic v2 escreve Decimal como string, por isso fica fora da comparação.
+    if json.loads(fast_tuples()) != json.loads(jsonable_dicts()):
+        raise AssertionError("Saída da FastJSONResponse diverge do jsonable_encoder.")
+
+    results = []
+    baseline = None
+    for name, func in cases:
+        seconds = _best_of(func, repeat)
+        baseline = baseline or seconds
+        results.append({
+            "case": name,
+            "rows": row_count,
+            "ms": round(seconds * 1000, 2),
+            "rows_per_second": round(row_count / seconds),
+            "speedup": round(baseline / seconds, 2),
+        })
+    return results
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    lines = [f"{'caso':<38}{'linhas':>8}{'ms':>10}{'linhas/s':>12}{'speedup':>9}"]
+    for result in results:
+        lines.append(
+            f"{result['case']:<38}{result['rows']:>8}{result['ms']:>10.2f}"
+            f"{result['rows_per_second']:>12}{result['speedup']:>8.2f}x"
+        )
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da serialização JSON das respostas de listas.")
+    parser.add_argument("--rows", type=int, action="append", help="Quantidade de linhas (pode repetir). Padrão: 500 e 5000.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições por caso (vale o melhor tempo).")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for row_count in args.rows or [500, 5000]:
+        results.extend(run_benchmark(row_count, args.repeat))
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(results))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
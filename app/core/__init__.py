@@ -1,4 +1,4 @@
 from .config import Settings, get_settings
-from .database import Base, get_db, engine, SessionLocal, check_db_connection
-from .dependencies import get_current_user, get_current_admin_user
+from .database import Base, get_db, get_read_db, create_read_session, engine, SessionLocal, check_db_connection
+from .dependencies import get_current_user, get_current_admin_user, get_current_analyst_user
 from .security import verify_password, get_password_hash, create_access_token
\ No newline at end of file
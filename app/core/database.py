@@ -1,8 +1,15 @@
+import hashlib
+import itertools
 import logging
-from typing import Generator
-from sqlalchemy import create_engine, text, String, Integer, Float, Boolean
+import threading
+import time
+from typing import Generator, Dict, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event, text, String, Integer, Float, Boolean
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from app.core.config import get_settings
+from app.core.metrics import InstrumentedQueuePool, register_pool
+from app.core.query_stats import instrument_engine
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -10,10 +17,83 @@ settings = get_settings()
 engine = create_engine(
     str(settings.database_url),
     pool_pre_ping=True,
-    echo=False
+    echo=False,
+    poolclass=InstrumentedQueuePool,
+    pool_logging_name="primary",
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine)
+register_pool("primary", lambda: engine.pool)
+
+# Réplicas de leitura opcionais; sem réplicas configuradas tudo vai para o primário
+replica_engines = [
+    create_engine(url, pool_pre_ping=True, echo=False, poolclass=InstrumentedQueuePool, pool_logging_name=f"replica-{index}")
+    for index, url in enumerate(settings.replica_database_urls)
+]
+for index, replica_engine in enumerate(replica_engines):
+    instrument_engine(replica_engine)
+    register_pool(f"replica-{index}", lambda replica_engine=replica_engine: replica_engine.pool)
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+
+class ReadYourWritesPins:
+    """
+    Chaves (token/cliente) que escreveram recentemente e por isso leem do primário até a janela expirar,
+    evitando ler da réplica um dado que ela ainda não recebeu. O registro é por processo.
+    """
+    def __init__(self, window_seconds: float, max_entries: int = 10000):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._expires_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def pin(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._expires_at) >= self.max_entries:
+                self._expires_at = {k: v for k, v in self._expires_at.items() if v > now}
+            self._expires_at[key] = now + self.window_seconds
+
+    def is_pinned(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        expires_at = self._expires_at.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+read_your_writes = ReadYourWritesPins(settings.replica_pin_seconds)
+
+class RoutingSession(Session):
+    """
+    Sessão que envia leituras para as réplicas quando marcada com info["use_replica"].
+    Escritas, flush, sessões que já escreveram e chaves fixadas (read-your-writes) usam o primário.
+    """
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            _replica_cycle is not None
+            and self.info.get("use_replica")
+            and not self._flushing
+            and not self.info.get("wrote")
+            and not getattr(clause, "is_dml", False)
+            and not read_your_writes.is_pinned(self.info.get("pin_key"))
+        ):
+            return next(_replica_cycle)
+        return engine
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
+
+def _mark_write(session: Session, *args) -> None:
+    session.info["wrote"] = True
+
+def _mark_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+def _pin_after_commit(session: Session) -> None:
+    if session.info.pop("wrote", False) and session.info.get("pin_key"):
+        read_your_writes.pin(session.info["pin_key"])
+
+event.listen(SessionLocal, "after_flush", _mark_write)
+event.listen(SessionLocal, "do_orm_execute", _mark_dml)
+event.listen(SessionLocal, "after_commit", _pin_after_commit)
 
 Base = declarative_base(
     type_annotation_map={
@@ -24,8 +104,36 @@ Base = declarative_base(
     }
 )
 
-def get_db() -> Generator:
+def read_your_writes_key(request: Optional[Request]) -> Optional[str]:
+    # O mesmo token (ou o mesmo cliente, sem token) enxerga as próprias escritas
+    if request is None:
+        return None
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return "auth:" + hashlib.sha256(authorization.encode()).hexdigest()[:32]
+    if request.client:
+        return f"client:{request.client.host}"
+    return None
+
+def get_db(request: Request = None) -> Generator:
     db = SessionLocal()
+    db.info["pin_key"] = read_your_writes_key(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+def create_read_session() -> Session:
+    """
+    Sessão para consultas somente leitura e analytics: lê das réplicas quando configuradas.
+    """
+    db = SessionLocal()
+    db.info["use_replica"] = True
+    return db
+
+def get_read_db(request: Request = None) -> Generator:
+    db = create_read_session()
+    db.info["pin_key"] = read_your_writes_key(request)
     try:
         yield db
     finally:
@@ -6,7 +6,8 @@ from jose import jwt, JWTError
 
 from app.core.config import get_settings
 from app.core.database import get_db
-from app.models.user_models import User, UserRole
+from app.core.user_cache import CurrentUser, user_snapshot_cache
+from app.models.user_models import UserRole
 from app.schemas.token_schemas import TokenData
 from app.repository import user_repository
 
@@ -16,13 +17,20 @@ reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.api_v1_str}/auth/login/access-token"
 )
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)) -> User:
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais.",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    # Token já validado há pouco: sem decodificar o JWT nem consultar o banco
+    snapshot = user_snapshot_cache.get(token)
+    if snapshot is not None:
+        if not snapshot.is_active:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Conta de usuário inativa.")
+        return snapshot
+    
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
@@ -35,14 +43,24 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusabl
     
     if not user:
         raise credentials_exception    
+    snapshot = CurrentUser.from_user(user)
+    user_snapshot_cache.set(token, snapshot, payload.get("exp"))
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Conta de usuário inativa.")        
-    return user
+    return snapshot
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="O usuário não tem privilégios suficientes para esta operação."
         )
+    return current_user
+
+def get_current_analyst_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    if current_user.role not in (UserRole.ADMIN, UserRole.ANALYST):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="O usuário não tem privilégios suficientes para esta operação."
+        )
     return current_user
\ No newline at end of file
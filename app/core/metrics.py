@@ -0,0 +1,365 @@
+import logging
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Métricas no formato de exposição de texto do Prometheus (version 0.0.4), servidas em /metrics.
+# Implementação própria e enxuta: contadores em memória por processo, sem dependência externa.
+# Com vários workers do uvicorn cada processo expõe os próprios números (o Prometheus soma por instância).
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        # O filho de cada combinação de labels é criado uma vez; depois é só um lookup no dicionário
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}_total", dict(zip(self.labelnames, values)), child.value
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in list(self._children.items()):
+            yield self.name, dict(zip(self.labelnames, values)), child.value
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        # Contagem por faixa (não cumulativa); a soma acumulada é feita só na exposição
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def observe_unlocked(self, value: float) -> None:
+        # Para filhos gravados sempre pela mesma thread (o middleware HTTP, no event loop); a exposição
+        # pode ler uma contagem à frente da soma, o que o Prometheus tolera
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values))
+            with child._lock:
+                counts = list(child.counts)
+                total_sum = child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total_sum
+            yield f"{self.name}_count", labels, cumulative
+
+class MetricFamily:
+    """
+    Métrica calculada na hora da coleta (estado de pools, caches e filas que já mantêm os próprios números).
+    """
+    def __init__(self, name: str, kind: str, documentation: str, samples: Iterable[Sample]):
+        self.name = name
+        self.kind = kind
+        self.documentation = documentation
+        self._samples = list(samples)
+
+    def samples(self) -> Iterable[Sample]:
+        return self._samples
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        self._collectors.append(collector)
+
+    def _families(self) -> Iterable:
+        yield from self._metrics
+        for collector in self._collectors:
+            try:
+                yield from collector()
+            except Exception as e:
+                logger.warning(f"Falha no coletor de métricas {getattr(collector, '__name__', collector)}: {e}")
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self._families():
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for name, labels, value in family.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+# Caches e pools se registram aqui; um coletor único expõe todos sob a mesma família
+_cache_stats: Dict[str, Callable[[], Tuple[int, int]]] = {}
+_pools: Dict[str, Callable[[], QueuePool]] = {}
+
+def register_cache(name: str, stats: Callable[[], Tuple[int, int]]) -> None:
+    """
+    stats devolve (acertos, falhas) acumulados desde o início do processo.
+    """
+    _cache_stats[name] = stats
+
+def register_pool(name: str, pool: Callable[[], QueuePool]) -> None:
+    _pools[name] = pool
+
+def _collect_caches() -> Iterable[MetricFamily]:
+    stats = {name: get_stats() for name, get_stats in _cache_stats.items()}
+    yield MetricFamily("nba_cache_hits_total", "counter", "Acertos por cache.",
+                       [("nba_cache_hits_total", {"cache": name}, hits) for name, (hits, _) in stats.items()])
+    yield MetricFamily("nba_cache_misses_total", "counter", "Falhas por cache.",
+                       [("nba_cache_misses_total", {"cache": name}, misses) for name, (_, misses) in stats.items()])
+    yield MetricFamily("nba_cache_hit_ratio", "gauge", "Acertos / (acertos + falhas) desde o início do processo.",
+                       [("nba_cache_hit_ratio", {"cache": name}, hits / (hits + misses) if hits + misses else 0.0)
+                        for name, (hits, misses) in stats.items()])
+
+def _collect_pools() -> Iterable[MetricFamily]:
+    samples = []
+    for name, get_pool in _pools.items():
+        pool = get_pool()
+        if not isinstance(pool, QueuePool):
+            continue
+        checked_out = pool.checkedout()
+        samples.append(("nba_db_pool_connections", {"pool": name, "state": "checked_out"}, checked_out))
+        samples.append(("nba_db_pool_connections", {"pool": name, "state": "idle"}, pool.checkedin()))
+        samples.append(("nba_db_pool_connections", {"pool": name, "state": "overflow"}, max(0, pool.overflow())))
+        samples.append(("nba_db_pool_connections", {"pool": name, "state": "size"}, pool.size()))
+    yield MetricFamily("nba_db_pool_connections", "gauge", "Conexões do pool por estado.", samples)
+
+registry.add_collector(_collect_caches)
+registry.add_collector(_collect_pools)
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return registry.register(Counter(name, documentation, labelnames))
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return registry.register(Gauge(name, documentation, labelnames))
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return registry.register(Histogram(name, documentation, labelnames, buckets))
+
+# --- API ---
+HTTP_REQUESTS_IN_FLIGHT = gauge("nba_http_requests_in_flight", "Requisições HTTP em andamento.")
+HTTP_REQUEST_DURATION = histogram(
+    "nba_http_request_duration_seconds",
+    "Latência das requisições HTTP por rota (template do caminho), método e status.",
+    ("method", "route", "status"),
+)
+
+# --- Banco de dados ---
+DB_POOL_CHECKOUT_WAIT = histogram(
+    "nba_db_pool_checkout_wait_seconds",
+    "Tempo para obter uma conexão do pool (inclui abrir uma conexão nova).",
+    ("pool",),
+    POOL_WAIT_BUCKETS,
+)
+
+# --- Ingestão ---
+INGESTION_ROWS = counter("nba_ingestion_rows", "Linhas gravadas pela ingestão, por tabela de origem.", ("source",))
+INGESTION_SECONDS = counter("nba_ingestion_seconds", "Tempo gasto nas gravações da ingestão, por tabela de origem.", ("source",))
+INGESTION_ROWS_PER_SECOND = gauge("nba_ingestion_rows_per_second", "Vazão da última gravação da ingestão, por tabela de origem.", ("source",))
+API_CLIENT_REQUESTS = counter(
+    "nba_api_client_requests",
+    "Chamadas HTTP à API de basquete por endpoint e resultado (success, empty, error).",
+    ("endpoint", "outcome"),
+)
+API_CLIENT_DURATION = histogram("nba_api_client_request_duration_seconds", "Latência das chamadas à API de basquete.", ("endpoint",))
+
+def record_ingestion(source: str, rows: int, seconds: float) -> None:
+    INGESTION_ROWS.labels(source).inc(rows)
+    INGESTION_SECONDS.labels(source).inc(seconds)
+    if seconds > 0:
+        INGESTION_ROWS_PER_SECOND.labels(source).set(rows / seconds)
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mede a espera no checkout. O nome do pool (pool_logging_name do create_engine)
+    vira o label; por ser subclasse, a medição continua após engine.dispose() recriar o pool.
+    """
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.logging_name or "default").observe(time.perf_counter() - start)
+
+# --- Middleware ---
+UNMATCHED_ROUTE = "(unmatched)"
+CACHED_ROUTE = "(cache)"
+
+def route_template(path: str, route_path: str) -> str:
+    """
+    Template completo da rota. Em routers incluídos com prefixo, scope["route"].path traz só o
+    trecho do router (/{game_id}); o prefixo é o caminho real sem os segmentos desse trecho.
+    """
+    segments = route_path.count("/")
+    prefix = path.rsplit("/", segments)[0] if segments else path
+    return prefix + route_path
+
+class RequestMetrics:
+    """
+    Requisições em andamento e histograma de latência por rota. O label usa o template da rota
+    (/games/{game_id}), não o caminho, para manter a cardinalidade fixa. Quem grava é o middleware que
+    já envolve cada requisição (QueryStatsMiddleware), sem uma camada ASGI a mais só para medir.
+    """
+    def __init__(self):
+        # Sem lock: quem grava roda sempre na thread do event loop
+        self.in_flight = HTTP_REQUESTS_IN_FLIGHT.labels()
+        # Filhos do histograma por rota e, dentro dela, por (método, status): o caminho comum é um lookup
+        # pela identidade da rota e outro pelo par; o template e os labels só são montados na primeira vez
+        self._durations: Dict[int, Dict[Tuple[str, int], object]] = {}
+
+    def observe(self, scope, response_start, elapsed: float) -> None:
+        status_code = response_start["status"] if response_start is not None else 500
+        key = (scope["method"], status_code)
+        # APIRoute define __eq__ sem __hash__: a chave é a identidade do objeto (as rotas vivem com a aplicação)
+        children = self._durations.get(id(scope.get("route")))
+        duration = children.get(key) if children is not None else None
+        if duration is None:
+            duration = self._duration(scope, response_start, key)
+        duration.observe_unlocked(elapsed)
+
+    def _duration(self, scope, response_start, key: Tuple[str, int]):
+        route = scope.get("route")
+        if route is None:
+            # Acertos do cache de respostas não chegam ao roteador; sem rota, nada é guardado aqui
+            headers = response_start.get("headers", ()) if response_start is not None else ()
+            route_path = CACHED_ROUTE if (b"x-cache", b"HIT") in headers else UNMATCHED_ROUTE
+            return HTTP_REQUEST_DURATION.labels(key[0], route_path, str(key[1]))
+        duration = HTTP_REQUEST_DURATION.labels(key[0], route_template(scope["path"], route.path), str(key[1]))
+        self._durations.setdefault(id(route), {})[key] = duration
+        return duration
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI só com as métricas de requisição, para aplicações sem o QueryStatsMiddleware.
+    """
+    def __init__(self, app):
+        self.app = app
+        self.metrics = RequestMetrics()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        metrics.in_flight.value += 1
+        start = time.perf_counter()
+        response_start = None
+
+        async def send_with_status(message):
+            nonlocal response_start
+            # A primeira mensagem é sempre o http.response.start
+            if response_start is None:
+                response_start = message
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight.value -= 1
+            metrics.observe(scope, response_start, time.perf_counter() - start)
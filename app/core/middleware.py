@@ -0,0 +1,47 @@
+import logging
+from typing import Optional
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.core.config import get_settings
+from app.core.metrics import RequestMetrics
+from app.core.query_stats import QueryStatsMiddleware, QUERY_COUNT_HEADER, QUERY_TIME_HEADER, QUERY_ROWS_HEADER
+from app.core.response_cache import ResponseCacheMiddleware, CACHE_STATUS_HEADER
+
+logger = logging.getLogger(__name__)
+
+def install_middleware(app: FastAPI, metrics: Optional[bool] = None) -> None:
+    """
+    Registra os middlewares da API. O último registrado é o mais externo: de fora para dentro,
+    CORS, contagem de consultas (com as métricas de requisição) e cache de respostas.
+    metrics=None segue METRICS_ENABLED.
+    """
+    settings = get_settings()
+    metrics = settings.metrics_enabled if metrics is None else metrics
+
+    # Cache das respostas da API pública de leitura (ETag/If-None-Match); fica dentro da contagem
+    # de consultas para que um acerto apareça com X-DB-Query-Count igual a zero
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        prefixes=[f"{settings.api_v1_str}/{resource}" for resource in ("games", "teams", "players", "standings", "leaderboards")],
+    )
+
+    # Contagem de consultas, tempo de banco e linhas por requisição (headers X-DB-*) e, com as métricas
+    # ligadas, requisições em andamento e latência por rota: o mesmo middleware mede, sem mais uma camada
+    # por requisição. Fica fora do cache, então os acertos do cache também entram no histograma.
+    app.add_middleware(QueryStatsMiddleware, metrics=RequestMetrics() if metrics else None)
+
+    # CORS fica fora do cache de respostas: os headers Access-Control-* dependem da Origin de cada
+    # requisição, que não faz parte da chave do cache
+    if settings.backend_cors_origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=[str(origin).strip("/") for origin in settings.backend_cors_origins],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+            expose_headers=[QUERY_COUNT_HEADER, QUERY_TIME_HEADER, QUERY_ROWS_HEADER, CACHE_STATUS_HEADER, "ETag"],
+        )
+        logger.info(f"CORS habilitado para as origens: {settings.backend_cors_origins}")
+    else:
+        logger.info("CORS não configurado (nenhuma origem definida em BACKEND_CORS_ORIGINS).")
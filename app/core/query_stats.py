@@ -0,0 +1,193 @@
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.core.metrics import RequestMetrics
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+QUERY_ROWS_HEADER = "X-DB-Rows"
+
+class NPlusOneError(AssertionError):
+    pass
+
+@dataclass
+class QueryStats:
+    label: str
+    statements: int = 0
+    db_time_ms: float = 0.0
+    rows: int = 0
+    slow_statements: int = 0
+    select_counts: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, statement: str, duration_ms: float, rows: int, slow: bool) -> None:
+        self.statements += 1
+        self.db_time_ms += duration_ms
+        self.rows += max(rows, 0)
+        self.slow_statements += int(slow)
+        if statement.lstrip()[:6].upper() == "SELECT":
+            self.select_counts[statement] = self.select_counts.get(statement, 0) + 1
+
+    def merge(self, other: "QueryStats") -> None:
+        self.statements += other.statements
+        self.db_time_ms += other.db_time_ms
+        self.rows += other.rows
+        self.slow_statements += other.slow_statements
+        for statement, count in other.select_counts.items():
+            self.select_counts[statement] = self.select_counts.get(statement, 0) + count
+
+    def repeated_selects(self, threshold: int) -> List[str]:
+        """
+        SELECTs idênticos (mesmo SQL parametrizado) executados 'threshold' vezes ou mais: padrão N+1.
+        """
+        return [statement for statement, count in self.select_counts.items() if count >= threshold]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "statements": self.statements,
+            "db_time_ms": round(self.db_time_ms, 2),
+            "rows": self.rows,
+            "slow_statements": self.slow_statements,
+        }
+
+    def as_headers(self) -> Dict[str, str]:
+        return {
+            QUERY_COUNT_HEADER: str(self.statements),
+            QUERY_TIME_HEADER: f"{self.db_time_ms:.2f}",
+            QUERY_ROWS_HEADER: str(self.rows),
+        }
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+def check_n_plus_one(stats: QueryStats, threshold: Optional[int] = None) -> None:
+    threshold = threshold or settings.query_n_plus_one_threshold
+    repeated = stats.repeated_selects(threshold)
+    if repeated:
+        raise NPlusOneError(
+            f"Padrão N+1 detectado em '{stats.label}': {len(repeated)} consulta(s) repetida(s) "
+            f"{threshold}+ vezes. Primeira: {repeated[0][:300]}"
+        )
+
+@contextmanager
+def track_queries(label: str, assert_no_n_plus_one: Optional[bool] = None) -> Iterator[QueryStats]:
+    """
+    Conta as consultas executadas dentro do bloco (na thread/tarefa atual e nas que herdam o contexto).
+    Blocos aninhados somam suas contagens no bloco externo.
+    """
+    stats = QueryStats(label=label)
+    parent = _current_stats.get()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        if parent is not None:
+            parent.merge(stats)
+
+    if assert_no_n_plus_one if assert_no_n_plus_one is not None else settings.query_assert_n_plus_one:
+        check_n_plus_one(stats)
+
+def tracked_task(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """
+    Decorator das tasks: acrescenta ao resumo retornado a chave 'queries' com as contagens da execução.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with track_queries(func.__name__) as stats:
+            summary = func(*args, **kwargs)
+        if isinstance(summary, dict):
+            summary["queries"] = stats.as_dict()
+            logger.info(f"Consultas da task '{summary.get('task', func.__name__)}': {summary['queries']}")
+        return summary
+    return wrapper
+
+def _redact_parameters(parameters: Any) -> Any:
+    # Só os nomes/posições dos parâmetros vão para o log; os valores podem conter dados pessoais
+    if isinstance(parameters, dict):
+        return {key: "?" for key in parameters}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} conjuntos de parâmetros>"
+        return ["?"] * len(parameters)
+    return parameters
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    slow = duration_ms >= settings.slow_query_threshold_ms
+
+    if slow:
+        logger.warning(
+            f"Consulta lenta ({duration_ms:.1f} ms): {statement[:1000]} | parâmetros: {_redact_parameters(parameters)}"
+        )
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ms, cursor.rowcount, slow)
+
+def _handle_error(exception_context):
+    # Consulta que falhou não passa pelo after_cursor_execute: descarta o início registrado
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI que abre um track_queries por requisição e devolve as contagens nos headers da resposta.
+    Com metrics, também grava as requisições em andamento e a latência por rota (ver RequestMetrics).
+    """
+    def __init__(self, app, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.in_flight.value += 1
+            start = time.perf_counter()
+        response_start = None
+
+        label = f"{scope['method']} {scope['path']}"
+        with track_queries(label, assert_no_n_plus_one=False) as stats:
+            async def send_with_stats(message):
+                nonlocal response_start
+                if message["type"] == "http.response.start":
+                    if settings.query_assert_n_plus_one:
+                        check_n_plus_one(stats)
+                    headers = list(message.get("headers", []))
+                    headers.extend((name.lower().encode(), value.encode()) for name, value in stats.as_headers().items())
+                    message["headers"] = headers
+                    response_start = message
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                if metrics is not None:
+                    metrics.in_flight.value -= 1
+                    metrics.observe(scope, response_start, time.perf_counter() - start)
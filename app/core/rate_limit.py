@@ -0,0 +1,229 @@
+import importlib
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import get_settings
+from app.core.metrics import MetricFamily, registry
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Janela deslizante aproximada (sliding window counter): cada chave guarda só o contador da janela
+# fixa atual e o da anterior; o da anterior entra ponderado pela fração da janela que ainda se sobrepõe.
+# Custo O(1) em tempo e memória por chave, sem guardar o horário de cada tentativa.
+
+def _window_state(entry: Optional[List[float]], window: int, now: float) -> Tuple[int, float, float]:
+    index = int(now // window)
+    if entry is None or entry[0] < index - 1:
+        return index, 0.0, 0.0
+    if entry[0] == index - 1:
+        return index, entry[2], 0.0
+    return index, entry[1], entry[2]
+
+def _sliding_hit(entry: Optional[List[float]], limit: int, window: int, now: float) -> Tuple[bool, float, List[float]]:
+    """
+    Registra uma tentativa se ela couber no limite. Devolve (permitida, segundos até liberar, novo estado).
+    Tentativas recusadas não contam: o bloqueio dura no máximo uma janela.
+    """
+    index, previous, current = _window_state(entry, window, now)
+    elapsed = now - index * window
+    weighted = previous * (1 - elapsed / window) + current
+    if weighted + 1 > limit:
+        if current + 1 > limit:
+            retry_after = window - elapsed
+        else:
+            # Espera até o peso da janela anterior cair o suficiente
+            retry_after = max(0.0, (1 - (limit - 1 - current) / previous) * window - elapsed) if previous else 0.0
+        return False, retry_after, [index, previous, current]
+    return True, 0.0, [index, previous, current + 1]
+
+class RateLimitBackend(ABC):
+    """
+    Interface do contador compartilhado entre processos/réplicas (Redis, Memcached...).
+    """
+    @abstractmethod
+    def hit(self, key: str, limit: int, window_seconds: int) -> Tuple[bool, float]:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Backend compartilhado local (fake): mesmo contrato de um backend externo, sem rede.
+    Útil em testes; protegido por lock porque pode ser chamado de várias threads.
+    """
+    def __init__(self):
+        self._entries: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window_seconds: int) -> Tuple[bool, float]:
+        with self._lock:
+            allowed, retry_after, state = _sliding_hit(self._entries.get(key), limit, window_seconds, time.time())
+            self._entries[key] = state
+        return allowed, retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class LocalRateLimitStore:
+    """
+    Contadores em processo, sem locks: só é usado pelas dependências async, que rodam todas na
+    thread do event loop, então não há escrita concorrente. Chaves de janelas vencidas são
+    descartadas numa varredura quando o número de chaves passa de max_keys.
+    """
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._entries: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit(self, key: str, limit: int, window_seconds: int, now: Optional[float] = None) -> Tuple[bool, float]:
+        now = now if now is not None else time.time()
+        allowed, retry_after, state = _sliding_hit(self._entries.get(key), limit, window_seconds, now)
+        self._entries[key] = state
+        if len(self._entries) > self.max_keys:
+            self._sweep(window_seconds, now)
+        return allowed, retry_after
+
+    def _sweep(self, window_seconds: int, now: float) -> None:
+        oldest = int(now // window_seconds) - 1
+        self._entries = {key: entry for key, entry in self._entries.items() if entry[0] >= oldest}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+class RateLimiter:
+    """
+    Consulta primeiro o contador local: se este processo sozinho já estourou o limite, o total
+    compartilhado também estourou e a tentativa é recusada sem ida ao backend.
+    """
+    def __init__(self, max_keys: int, shared: Optional[RateLimitBackend] = None):
+        self.local = LocalRateLimitStore(max_keys)
+        self.shared = shared
+        self.allowed = 0
+        self.rejected: Dict[str, int] = {}
+
+    def hit(self, scope: str, key: str, limit: int, window_seconds: int) -> Tuple[bool, float]:
+        full_key = f"rl:{scope}:{key}"
+        allowed, retry_after = self.local.hit(full_key, limit, window_seconds)
+        if allowed and self.shared is not None:
+            try:
+                allowed, retry_after = self.shared.hit(full_key, limit, window_seconds)
+            except Exception as e:
+                # Backend fora do ar: o limite local continua valendo
+                logger.warning(f"Falha no backend de rate limit ({e}); usando apenas o contador local.")
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected[scope] = self.rejected.get(scope, 0) + 1
+        return allowed, retry_after
+
+    def clear(self) -> None:
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+def load_backend(path: Optional[str]) -> Optional[RateLimitBackend]:
+    """
+    Carrega o backend compartilhado a partir de 'pacote.modulo:fabrica' (classe ou função sem argumentos).
+    """
+    if not path:
+        return None
+    module_name, _, attribute = path.partition(":")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    return factory()
+
+rate_limiter = RateLimiter(
+    max_keys=settings.rate_limit_max_keys,
+    shared=load_backend(settings.rate_limit_backend),
+)
+
+def _collect_rate_limits():
+    yield MetricFamily("nba_rate_limit_rejected_total", "counter", "Tentativas recusadas pelo rate limit, por escopo.",
+                       [("nba_rate_limit_rejected_total", {"scope": scope}, count) for scope, count in list(rate_limiter.rejected.items())])
+
+registry.add_collector(_collect_rate_limits)
+
+def client_ip(request: Request) -> str:
+    if settings.rate_limit_trust_forwarded:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+async def _account_from_body(request: Request, field: str) -> Optional[str]:
+    # O FastAPI já leu o corpo antes das dependências; form()/json() reaproveitam o que está em memória
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith(("application/x-www-form-urlencoded", "multipart/form-data")):
+            value: Any = (await request.form()).get(field)
+        elif content_type.startswith("application/json"):
+            body = await request.json()
+            value = body.get(field) if isinstance(body, dict) else None
+        else:
+            return None
+    except ValueError:
+        return None
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return value.strip().lower()
+
+class RateLimit:
+    """
+    Dependência de rota: janela deslizante por IP e, opcionalmente, por conta (campo do corpo).
+    Roda antes do corpo da rota, então uma tentativa recusada não chega ao banco nem ao bcrypt.
+    """
+    def __init__(self, scope: str, per_ip: int, per_account: int = 0, account_field: Optional[str] = None):
+        self.scope = scope
+        self.per_ip = per_ip
+        self.per_account = per_account
+        self.account_field = account_field
+
+    def _reject(self, retry_after: float, kind: str) -> HTTPException:
+        logger.warning(f"Rate limit excedido em '{self.scope}' ({kind}).")
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas. Tente novamente em instantes.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.rate_limit_enabled:
+            return
+        window = settings.rate_limit_window_seconds
+
+        if self.per_ip:
+            allowed, retry_after = rate_limiter.hit(self.scope, f"ip:{client_ip(request)}", self.per_ip, window)
+            if not allowed:
+                raise self._reject(retry_after, "ip")
+
+        if self.per_account and self.account_field:
+            account = await _account_from_body(request, self.account_field)
+            if account:
+                allowed, retry_after = rate_limiter.hit(self.scope, f"account:{account}", self.per_account, window)
+                if not allowed:
+                    raise self._reject(retry_after, "conta")
+
+login_rate_limit = RateLimit(
+    "login",
+    per_ip=settings.rate_limit_login_per_ip,
+    per_account=settings.rate_limit_login_per_account,
+    account_field="username",
+)
+sign_up_rate_limit = RateLimit("sign-up", per_ip=settings.rate_limit_sign_up_per_ip)
+password_recovery_rate_limit = RateLimit(
+    "password-rec",
+    per_ip=settings.rate_limit_password_recovery_per_ip,
+    per_account=settings.rate_limit_password_recovery_per_account,
+    account_field="email",
+)
+reset_password_rate_limit = RateLimit("reset-password", per_ip=settings.rate_limit_password_recovery_per_ip)
@@ -0,0 +1,398 @@
+import hashlib
+import importlib
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from app.core.config import get_settings
+from app.core.metrics import register_cache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = "X-Cache"
+MAX_CACHED_BODY_BYTES = 2 * 1024 * 1024
+
+@dataclass
+class CacheEntry:
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+    tags: Tuple[str, ...]
+    expires_at: float
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at <= (now if now is not None else time.time())
+
+class CacheBackend(ABC):
+    """
+    Interface da camada compartilhada (Redis, Memcached...). As entradas são registradas por tag
+    para que a ingestão invalide apenas os recursos que tocou.
+    """
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry, ttl_seconds: float) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Backend compartilhado local (fake): mesmo contrato de um backend externo, sem rede.
+    Útil em testes e em implantações com um único processo.
+    """
+    def __init__(self):
+        self._entries: Dict[str, CacheEntry] = {}
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.is_expired():
+            return None
+        return entry
+
+    def set(self, key: str, entry: CacheEntry, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, ()):
+                    if self._entries.pop(key, None) is not None:
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+class LRUTTLCache:
+    """
+    Camada em processo: LRU limitado por número de entradas, com expiração por TTL.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.is_expired():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    removed += int(self._remove(key))
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+        return True
+
+class ResponseCache:
+    """
+    Cache de respostas em duas camadas: LRU+TTL local e, opcionalmente, um backend compartilhado.
+    Com backend compartilhado a camada local usa um TTL curto, pois outros processos só
+    enxergam as invalidações feitas no backend.
+    """
+    def __init__(self, max_entries: int, shared: Optional[CacheBackend] = None, local_ttl_seconds: Optional[float] = None):
+        self.local = LRUTTLCache(max_entries)
+        self.shared = shared
+        self.local_ttl_seconds = local_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            try:
+                entry = self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"Falha ao ler o cache compartilhado: {e}")
+                entry = None
+            if entry is not None:
+                self.local.set(key, self._local_copy(entry))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: CacheEntry, ttl_seconds: float) -> None:
+        self.local.set(key, self._local_copy(entry))
+        if self.shared is not None:
+            try:
+                self.shared.set(key, entry, ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Falha ao gravar no cache compartilhado: {e}")
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return 0
+        removed = self.local.invalidate_tags(tags)
+        if self.shared is not None:
+            try:
+                removed += self.shared.invalidate_tags(tags)
+            except Exception as e:
+                logger.warning(f"Falha ao invalidar o cache compartilhado: {e}")
+        logger.info(f"Cache de respostas invalidado para {len(tags)} tag(s): {removed} entrada(s) removida(s).")
+        return removed
+
+    def clear(self) -> None:
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def _local_copy(self, entry: CacheEntry) -> CacheEntry:
+        if self.shared is None or self.local_ttl_seconds is None:
+            return entry
+        expires_at = min(entry.expires_at, time.time() + self.local_ttl_seconds)
+        return CacheEntry(entry.status, entry.headers, entry.body, entry.etag, entry.tags, expires_at)
+
+def load_backend(path: Optional[str]) -> Optional[CacheBackend]:
+    """
+    Carrega o backend compartilhado a partir de 'pacote.modulo:fabrica' (classe ou função sem argumentos).
+    """
+    if not path:
+        return None
+    module_name, _, attribute = path.partition(":")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    return factory()
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    shared=load_backend(settings.response_cache_backend),
+    local_ttl_seconds=settings.response_cache_local_ttl_seconds,
+)
+
+register_cache("response", lambda: (response_cache.hits, response_cache.misses))
+
+def invalidate_cache(tags: Iterable[str]) -> int:
+    return response_cache.invalidate(tags)
+
+# --- Tags por recurso ---
+def game_tag(game_id: Any) -> str:
+    return f"game:{game_id}"
+
+def team_tag(team_id: Any) -> str:
+    return f"team:{team_id}"
+
+def player_tag(player_id: Any) -> str:
+    return f"player:{player_id}"
+
+def season_tag(season: Any) -> str:
+    return f"season:{season}"
+
+def standings_tag(season: Any) -> str:
+    return f"standings:{season}"
+
+def collection_tag(name: str) -> str:
+    return f"collection:{name}"
+
+def resource_tags(
+    games: Iterable[Any] = (),
+    teams: Iterable[Any] = (),
+    players: Iterable[Any] = (),
+    seasons: Iterable[Any] = (),
+    collections: Iterable[str] = (),
+) -> List[str]:
+    tags = [game_tag(game_id) for game_id in games if game_id is not None]
+    tags += [team_tag(team_id) for team_id in teams if team_id is not None]
+    tags += [player_tag(player_id) for player_id in players if player_id is not None]
+    tags += [season_tag(season) for season in seasons if season is not None]
+    tags += [collection_tag(name) for name in collections]
+    return list(dict.fromkeys(tags))
+
+def current_season_year(today: Optional[date] = None) -> int:
+    # A temporada da NBA começa em outubro e é identificada pelo ano de início
+    today = today or date.today()
+    return today.year if today.month >= 10 else today.year - 1
+
+# --- ETags ---
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def rows_etag(resource: str, rows: Sequence[Mapping[str, Any]], version_fields: Sequence[str], strip: Sequence[str] = ()) -> str:
+    """
+    ETag forte a partir das colunas de versão (payload_hash/updated_at) das linhas devolvidas.
+    As colunas em 'strip' foram projetadas só para isso e saem das linhas após o cálculo.
+    """
+    parts = [resource]
+    for row in rows:
+        parts.extend(row.get(name) for name in version_fields)
+        for name in strip:
+            row.pop(name, None)
+    return make_etag(*parts)
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+def cache_response(request, tags: Iterable[str], etag: Optional[str] = None, immutable: bool = False) -> None:
+    """
+    Marca a resposta da rota como cacheável. Rotas que não chamam esta função nunca são cacheadas.
+    Dados imutáveis (jogos finalizados, temporadas passadas) usam o TTL longo.
+    """
+    request.state.cache_policy = {
+        "tags": tuple(dict.fromkeys(tags)),
+        # A mesma versão dos dados em outra representação (fields, filtros) tem outro ETag
+        "etag": make_etag(cache_key(request.scope), etag) if etag else None,
+        "ttl": settings.response_cache_immutable_ttl_seconds if immutable else settings.response_cache_ttl_seconds,
+    }
+
+def cache_key(scope) -> str:
+    query = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+    return f"{scope['method']} {scope['path']}?{urlencode(query)}"
+
+class ResponseCacheMiddleware:
+    """
+    Middleware ASGI do cache de respostas: serve GETs cacheados (com If-None-Match -> 304) e grava
+    as respostas 200 das rotas que chamaram cache_response.
+    """
+    def __init__(self, app, prefixes: Sequence[str] = ()):
+        self.app = app
+        self.prefixes = tuple(prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not settings.response_cache_enabled
+            or not scope["path"].startswith(self.prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope)
+        if_none_match = _header(scope, b"if-none-match")
+        entry = response_cache.get(key)
+        if entry is not None:
+            await _send_entry(send, entry, if_none_match, "HIT")
+            return
+
+        state = scope.setdefault("state", {})
+        start_message: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_with_cache(message):
+            nonlocal passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                policy = state.get("cache_policy")
+                if message["status"] != 200 or policy is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message.update(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                if sum(len(chunk) for chunk in chunks) > MAX_CACHED_BODY_BYTES:
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+                return
+
+            policy = state["cache_policy"]
+            body = b"".join(chunks)
+            # Headers que variam por requisição (CORS) não são reaproveitados entre clientes
+            headers = [
+                (name, value) for name, value in start_message.get("headers", [])
+                if name.lower() not in (b"etag", b"content-length", b"vary") and not name.lower().startswith(b"access-control-")
+            ]
+            new_entry = CacheEntry(
+                status=200,
+                headers=headers,
+                body=body,
+                etag=policy["etag"] or make_etag(hashlib.sha256(body).hexdigest()),
+                tags=policy["tags"],
+                expires_at=time.time() + policy["ttl"],
+            )
+            if len(body) <= MAX_CACHED_BODY_BYTES:
+                response_cache.set(key, new_entry, policy["ttl"])
+            await _send_entry(send, new_entry, if_none_match, "MISS")
+
+        await self.app(scope, receive, send_with_cache)
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for header_name, value in scope.get("headers", []):
+        if header_name == name:
+            return value.decode("latin-1")
+    return None
+
+async def _send_entry(send, entry: CacheEntry, if_none_match: Optional[str], cache_status: str) -> None:
+    extra = [(b"etag", entry.etag.encode()), (CACHE_STATUS_HEADER.lower().encode(), cache_status.encode())]
+    if etag_matches(if_none_match, entry.etag):
+        headers = [(name, value) for name, value in entry.headers if name.lower() not in (b"content-type",)]
+        await send({"type": "http.response.start", "status": 304, "headers": headers + extra})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    headers = entry.headers + [(b"content-length", str(len(entry.body)).encode())] + extra
+    await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+    await send({"type": "http.response.body", "body": entry.body})
@@ -0,0 +1,34 @@
+import enum
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _default(value: Any) -> Any:
+    # orjson já serializa datetime/date/UUID; o restante segue o critério do jsonable_encoder
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+class FastJSONResponse(JSONResponse):
+    """
+    Resposta JSON serializada com orjson (Decimal, datetime e arrays NumPy inclusos).
+    Rotas que devolvem projeções já confiáveis retornam esta resposta diretamente, sem a
+    validação do response_model nem o jsonable_encoder do FastAPI.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
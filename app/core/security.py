@@ -1,21 +1,121 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.core.metrics import MetricFamily, registry
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+# Hashes gravados com outro custo ficam marcados por needs_update e são refeitos no próximo login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 ALGORITHM = settings.algorithm
 PASSWORD_RESET_TOKEN_EXPIRE_MINUTES = 180
 
-def get_password_hash(password: str) -> str:    
-    return pwd_context.hash(password)
+class PasswordHashingBusy(Exception):
+    """
+    Fila do pool de hash de senhas cheia: a requisição é recusada (503) em vez de esperar.
+    """
+
+class PasswordHasher:
+    """
+    Pool dedicado e limitado para o bcrypt. O bcrypt libera o GIL durante o cálculo, então
+    threads escalam com os núcleos sem bloquear o event loop nem o threadpool das rotas síncronas.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        # Tarefas aguardando uma thread livre (as que já estão calculando não contam)
+        return max(0, self.in_flight - self.workers)
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            logger.warning(f"Fila de hash de senhas cheia (limite de {self.max_queue} aguardando); requisição recusada.")
+            raise PasswordHashingBusy()
+        with self._lock:
+            self.in_flight += 1
+        future = self._get_executor().submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_max_queue)
+
+def _collect_password_hasher():
+    stats = password_hasher.stats()
+    yield MetricFamily("nba_password_hash_queue_depth", "gauge", "Hashes de senha aguardando uma thread do pool.",
+                       [("nba_password_hash_queue_depth", {}, stats["queue_depth"])])
+    yield MetricFamily("nba_password_hash_in_flight", "gauge", "Hashes de senha em cálculo ou na fila.",
+                       [("nba_password_hash_in_flight", {}, stats["in_flight"])])
+    yield MetricFamily("nba_password_hash_rejected_total", "counter", "Hashes recusados por fila cheia (503).",
+                       [("nba_password_hash_rejected_total", {}, stats["rejected"])])
+
+registry.add_collector(_collect_password_hasher)
+
+def get_password_hash(password: str) -> str:
+    return password_hasher.run(pwd_context.hash, password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash estiver desatualizado (custo ou esquema), devolve o novo hash
+    calculado na mesma passagem pelo pool.
+    """
+    return password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run_async(pwd_context.hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await password_hasher.run_async(pwd_context.verify_and_update, plain_password, hashed_password)
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     if expires_delta:
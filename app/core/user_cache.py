@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from app.core.config import get_settings
+from app.core.metrics import register_cache
+from app.models.user_models import User, UserRole
+
+settings = get_settings()
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    Retrato do usuário autenticado com os campos usados na autorização. As rotas que precisam
+    da linha completa (perfil, atualização) carregam o usuário pelo id.
+    """
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+    is_verified: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(id=user.id, email=user.email, role=user.role, is_active=user.is_active, is_verified=user.is_verified)
+
+class UserSnapshotCache:
+    """
+    Cache token -> CurrentUser com TTL curto e tamanho limitado (LRU). Evita decodificar o JWT e
+    consultar o banco a cada requisição autenticada. A invalidação é por processo: nos demais
+    workers a mudança aparece quando o TTL expira.
+    """
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[CurrentUser, float]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        # Guarda o hash, não o token
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[CurrentUser]:
+        key = self._key(token)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            snapshot, expires_at = item
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return snapshot
+
+    def set(self, token: str, snapshot: CurrentUser, token_expires_at: Optional[float] = None) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        ttl = self.ttl_seconds
+        if token_expires_at is not None:
+            # Nunca além da expiração do próprio token (exp do JWT, em epoch)
+            ttl = min(ttl, token_expires_at - time.time())
+            if ttl <= 0:
+                return
+        key = self._key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (snapshot, time.monotonic() + ttl)
+            self._keys_by_user.setdefault(snapshot.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: Optional[int] = None, email: Optional[str] = None) -> int:
+        with self._lock:
+            keys: Set[str] = set(self._keys_by_user.get(user_id, ())) if user_id is not None else set()
+            if email is not None:
+                keys.update(key for key, (snapshot, _) in self._entries.items() if snapshot.email == email)
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        keys = self._keys_by_user.get(item[0].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[item[0].id]
+
+user_snapshot_cache = UserSnapshotCache(settings.auth_user_cache_ttl_seconds, settings.auth_user_cache_max_entries)
+register_cache("user_snapshot", lambda: (user_snapshot_cache.hits, user_snapshot_cache.misses))
@@ -1,10 +1,13 @@
 import logging
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, Request, Response, status
 
 from app.core.config import get_settings
 from app.api.v1.api import api_router
 from app.core.database import Base, engine
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from app.core.middleware import install_middleware
+from app.core.responses import FastJSONResponse
+from app.core.security import PasswordHashingBusy
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -25,23 +28,23 @@ settings = get_settings()
 app = FastAPI(
     title=settings.project_name,
     openapi_url=f"{settings.api_v1_str}/openapi.json",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=FastJSONResponse,
 )
 
-if settings.backend_cors_origins:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[str(origin).strip("/") for origin in settings.backend_cors_origins],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-    logger.info(f"CORS habilitado para as origens: {settings.backend_cors_origins}")
-else:
-    logger.info("CORS não configurado (nenhuma origem definida em BACKEND_CORS_ORIGINS).")
+install_middleware(app)
 
 app.include_router(api_router, prefix=settings.api_v1_str)
 
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    # Pico de logins/cadastros acima da capacidade do pool de hash: o cliente tenta de novo
+    return FastJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Serviço de autenticação sobrecarregado. Tente novamente em instantes."},
+        headers={"Retry-After": "1"},
+    )
+
 @app.get("/", summary="Endpoint raiz para verificação de status")
 def read_root():
     """
@@ -49,6 +52,14 @@ def read_root():
     """
     return {"status": "ok", "project_name": settings.project_name}
 
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """
+        Métricas no formato de texto do Prometheus (API, pool do banco, ingestão e caches).
+        """
+        return Response(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 logger.info(f"Aplicação FastAPI '{settings.project_name}' inicializada.")
 
 if __name__ == "__main__":
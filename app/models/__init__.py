@@ -2,12 +2,13 @@ from app.core.database import Base
 from .mixins import TimestampMixin
 
 from .user_models import User, UserRole
-from .season_models import Season
+from .season_models import Season, AnalyticsRefresh
 from .league_models import League
-from .team_models import Team, TeamLeague, TeamSeasonStatistics
-from .player_models import Player, PlayerLeague, PlayerStatistics
-from .game_models import Game, TeamStatistics
-from .standing_models import Standing
+from .team_models import Team, TeamLeague, TeamSeasonStatistics, TeamSeasonAggregate, TeamGameRating, TeamEloRating
+from .player_models import Player, PlayerLeague, PlayerStatistics, PlayerSeasonStatistics, PlayerGameAdvanced, PlayerSeasonAdvanced, PlayerGameForm
+from .game_models import Game, TeamStatistics, GameEloRating
+from .standing_models import Standing, ComputedStanding, PlayoffOdds
+from .email_models import EmailOutbox, EmailStatus
 
 __all__ = [
     "Base",
@@ -15,14 +16,27 @@ __all__ = [
     "User",
     "UserRole",
     "Season",
+    "AnalyticsRefresh",
     "League",
     "Team",
     "TeamLeague",
     "TeamSeasonStatistics",
+    "TeamSeasonAggregate",
+    "TeamGameRating",
+    "TeamEloRating",
     "Player",
     "PlayerLeague",
     "PlayerStatistics",
+    "PlayerSeasonStatistics",
+    "PlayerGameAdvanced",
+    "PlayerSeasonAdvanced",
+    "PlayerGameForm",
     "Game",
     "TeamStatistics",
+    "GameEloRating",
     "Standing",
+    "ComputedStanding",
+    "PlayoffOdds",
+    "EmailOutbox",
+    "EmailStatus",
 ]
\ No newline at end of file
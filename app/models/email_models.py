@@ -0,0 +1,37 @@
+import enum
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.mixins import TimestampMixin
+
+class EmailStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+class EmailOutbox(Base, TimestampMixin):
+    """
+    Fila de saída de e-mails: a requisição só grava a linha; o worker (app.services.email_worker)
+    renderiza o template e envia em lotes pelo pool de conexões SMTP.
+    """
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    recipient: Mapped[str] = mapped_column(String(255))
+    template: Mapped[str] = mapped_column(String(50))
+    context: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
+    status: Mapped[str] = mapped_column(String(16), default=EmailStatus.PENDING.value)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    __table_args__ = (Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),)
+
+    def __repr__(self) -> str:
+        return f"<EmailOutbox(id={self.id}, template='{self.template}', status='{self.status}')>"
@@ -1,6 +1,6 @@
-from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint, Numeric, JSON
+from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint, Numeric, Float, JSON, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from typing import List, TYPE_CHECKING, Dict, Any
+from typing import List, TYPE_CHECKING
 from datetime import datetime
 import decimal
 
@@ -11,6 +11,10 @@ if TYPE_CHECKING:
     from .league_models import League
     from .season_models import Season
     from .team_models import Team
+    from .player_models import PlayerStatistics
+
+# Status que a API usa para jogos encerrados
+FINISHED_GAME_STATUSES = ("Finished", "Completed", "FT")
 
 class Game(Base, TimestampMixin):
     __tablename__ = "games"
@@ -19,7 +23,7 @@ class Game(Base, TimestampMixin):
     
     source_id: Mapped[int] = mapped_column(unique=True, index=True)
     league_id: Mapped[int] = mapped_column(ForeignKey("leagues.source_id"), index=True)
-    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), index=True)
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"))
     game_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), index=True)
     status: Mapped[str | None] = mapped_column(String(100))
     stage: Mapped[int | None]
@@ -27,8 +31,9 @@ class Game(Base, TimestampMixin):
     visitor_team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"), index=True)
     home_score: Mapped[int | None]
     visitor_score: Mapped[int | None]
-    home_linescore: Mapped[Dict[str, Any] | None] = mapped_column(JSON)
-    visitor_linescore: Mapped[Dict[str, Any] | None] = mapped_column(JSON)
+    # Pontos por período: [1º, 2º, 3º, 4º quarto, prorrogações...]
+    home_linescore: Mapped[List[int] | None] = mapped_column(JSON)
+    visitor_linescore: Mapped[List[int] | None] = mapped_column(JSON)
     arena_name: Mapped[str | None] = mapped_column(String(255))
     arena_city: Mapped[str | None] = mapped_column(String(255))
     arena_country: Mapped[str | None] = mapped_column(String(255))
@@ -38,6 +43,24 @@ class Game(Base, TimestampMixin):
     home_team: Mapped["Team"] = relationship(foreign_keys=[home_team_id], back_populates="home_games")
     visitor_team: Mapped["Team"] = relationship(foreign_keys=[visitor_team_id], back_populates="visitor_games")
     team_statistics: Mapped[List["TeamStatistics"]] = relationship(back_populates="game")
+    player_statistics: Mapped[List["PlayerStatistics"]] = relationship(back_populates="game")
+
+    # Índices justificados pela auditoria de planos (python -m app.services.query_audit)
+    __table_args__ = (
+        Index(
+            "ix_games_season_home_team_date", "season", "home_team_id", "game_date",
+            postgresql_include=["source_id", "visitor_team_id", "status", "home_score", "visitor_score"],
+        ),
+        Index(
+            "ix_games_season_visitor_team_date", "season", "visitor_team_id", "game_date",
+            postgresql_include=["source_id", "home_team_id", "status", "home_score", "visitor_score"],
+        ),
+        Index(
+            "ix_games_finished_season_date", "season", "game_date",
+            postgresql_include=["source_id", "home_team_id", "visitor_team_id", "home_score", "visitor_score"],
+            postgresql_where=text("status IN ({})".format(", ".join(f"'{status}'" for status in FINISHED_GAME_STATUSES))),
+        ),
+    )
 
     def __repr__(self) -> str:
         return f"<Game(id={self.id}, date='{self.game_date}')>"
@@ -45,7 +68,8 @@ class Game(Base, TimestampMixin):
 class TeamStatistics(Base, TimestampMixin):
     __tablename__ = "team_statistics"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), primary_key=True, comment="Chave de partição (LIST por temporada)")
     
     game_id: Mapped[int] = mapped_column(ForeignKey("games.source_id"), index=True)
     team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"), index=True)
@@ -80,7 +104,32 @@ class TeamStatistics(Base, TimestampMixin):
     game: Mapped["Game"] = relationship(back_populates="team_statistics")
     team: Mapped["Team"] = relationship(back_populates="game_statistics")
 
-    __table_args__ = (UniqueConstraint('game_id', 'team_id', name='_game_team_uc'),)
+    __table_args__ = (
+        UniqueConstraint('game_id', 'team_id', 'season', name='_game_team_uc'),
+        {"postgresql_partition_by": "LIST (season)"},
+    )
 
     def __repr__(self) -> str:
         return f"<TeamStatistics(game_id={self.game_id}, team_id={self.team_id})>"
+
+class GameEloRating(Base, TimestampMixin):
+    """
+    Elo dos dois times antes e depois de cada jogo encerrado, na ordem em que o analytics.elo_ratings
+    aplicou os jogos (data, source_id). O estado atual de cada time fica em team_elo_ratings.
+    """
+    __tablename__ = "game_elo_ratings"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.source_id"), unique=True)
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), index=True)
+    sequence: Mapped[int] = mapped_column(unique=True, comment="Ordem de aplicação do jogo no histórico completo")
+    home_team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"), index=True)
+    visitor_team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"), index=True)
+    home_elo_pre: Mapped[float] = mapped_column(Float)
+    visitor_elo_pre: Mapped[float] = mapped_column(Float)
+    home_win_prob: Mapped[float] = mapped_column(Float, comment="Probabilidade de vitória do mandante antes do jogo (com mando de quadra)")
+    home_elo_post: Mapped[float] = mapped_column(Float)
+    visitor_elo_post: Mapped[float] = mapped_column(Float)
+
+    def __repr__(self) -> str:
+        return f"<Elo do Jogo(game_id={self.game_id})>"
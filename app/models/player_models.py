@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, ForeignKey, UniqueConstraint, Numeric, Date
+from sqlalchemy import String, Text, ForeignKey, UniqueConstraint, Numeric, Date, Index, Float
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import List, TYPE_CHECKING
 import decimal
@@ -10,6 +10,7 @@ from app.models.mixins import TimestampMixin
 if TYPE_CHECKING:
     from .game_models import Game
     from .team_models import Team
+    from .season_models import Season
 
 class Player(Base, TimestampMixin):
     __tablename__ = "players"
@@ -30,6 +31,7 @@ class Player(Base, TimestampMixin):
 
     game_statistics: Mapped[List["PlayerStatistics"]] = relationship(back_populates="player", cascade="all, delete-orphan")
     league_affiliations: Mapped[List["PlayerLeague"]] = relationship(back_populates="player", cascade="all, delete-orphan")
+    season_statistics: Mapped[List["PlayerSeasonStatistics"]] = relationship(back_populates="player", viewonly=True)
 
     def __repr__(self) -> str:
         return f"<Jogador(id={self.id}, nome='{self.first_name} {self.last_name}')>"
@@ -54,9 +56,10 @@ class PlayerLeague(Base, TimestampMixin):
 class PlayerStatistics(Base, TimestampMixin):
     __tablename__ = "player_statistics"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), primary_key=True, comment="Chave de partição (LIST por temporada)")
     
-    player_id: Mapped[int] = mapped_column(ForeignKey("players.source_id"), index=True)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.source_id"))
     team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"), index=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.source_id"), index=True)
     
@@ -82,12 +85,161 @@ class PlayerStatistics(Base, TimestampMixin):
     blocks: Mapped[int | None]
     plus_minus: Mapped[str | None] = mapped_column(String(10))
     comment: Mapped[str | None] = mapped_column(Text)
+    payload_hash: Mapped[str | None] = mapped_column(String(64), comment="Hash SHA-256 do payload da API; o upsert só reescreve a linha quando ele muda")
 
     player: Mapped["Player"] = relationship(back_populates="game_statistics")
     team: Mapped["Team"] = relationship(back_populates="player_statistics")
     game: Mapped["Game"] = relationship(back_populates="player_statistics")
 
-    __table_args__ = (UniqueConstraint("player_id", "game_id", name="_player_game_uc"),)
+    __table_args__ = (
+        UniqueConstraint("player_id", "game_id", "season", name="_player_game_uc"),
+        # Histórico do jogador atendido só pelo índice (index-only scan)
+        Index(
+            "ix_player_statistics_player_game_log", "player_id", "game_id",
+            postgresql_include=["team_id", "min_played", "points", "tot_reb", "assists", "steals", "blocks", "turnovers"],
+        ),
+        {"postgresql_partition_by": "LIST (season)"},
+    )
+
+    def __repr__(self) -> str:
+        return f"<Estatistícas do Jogador(game_id={self.game_id}, player_id={self.player_id})>"
+
+class PlayerSeasonStatistics(Base, TimestampMixin):
+    """
+    Agregado por jogador e temporada, mantido pelo banco (função refresh_player_season_statistics).
+    Somente leitura para a aplicação: é recalculado por temporada após cada ingestão.
+    """
+    __tablename__ = "player_season_statistics"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.source_id"))
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), index=True)
+
+    games_played: Mapped[int] = mapped_column(server_default="0")
+    minutes: Mapped[decimal.Decimal] = mapped_column(Numeric(8, 2), server_default="0")
+    points: Mapped[int] = mapped_column(server_default="0")
+    fgm: Mapped[int] = mapped_column(server_default="0")
+    fga: Mapped[int] = mapped_column(server_default="0")
+    ftm: Mapped[int] = mapped_column(server_default="0")
+    fta: Mapped[int] = mapped_column(server_default="0")
+    tpm: Mapped[int] = mapped_column(server_default="0")
+    tpa: Mapped[int] = mapped_column(server_default="0")
+    off_reb: Mapped[int] = mapped_column(server_default="0")
+    def_reb: Mapped[int] = mapped_column(server_default="0")
+    tot_reb: Mapped[int] = mapped_column(server_default="0")
+    assists: Mapped[int] = mapped_column(server_default="0")
+    steals: Mapped[int] = mapped_column(server_default="0")
+    blocks: Mapped[int] = mapped_column(server_default="0")
+    turnovers: Mapped[int] = mapped_column(server_default="0")
+    p_fouls: Mapped[int] = mapped_column(server_default="0")
+    minutes_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    points_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    rebounds_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    assists_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    steals_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    blocks_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    turnovers_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    fgp: Mapped[decimal.Decimal | None] = mapped_column(Numeric(5, 2))
+    ftp: Mapped[decimal.Decimal | None] = mapped_column(Numeric(5, 2))
+    tpp: Mapped[decimal.Decimal | None] = mapped_column(Numeric(5, 2))
+
+    player: Mapped["Player"] = relationship(back_populates="season_statistics")
+    season_info: Mapped["Season"] = relationship(back_populates="player_season_statistics")
+
+    __table_args__ = (UniqueConstraint("player_id", "season", name="_player_season_uc"),)
+
+    def __repr__(self) -> str:
+        return f"<Agregado do Jogador na Temporada(season={self.season}, player_id={self.player_id})>"
+
+class PlayerGameAdvanced(Base, TimestampMixin):
+    """
+    Métricas avançadas por jogador e jogo (somente jogos com minutos), derivadas de player_statistics
+    com o contexto de time/liga de team_statistics. Recalculada por temporada (analytics.advanced_metrics).
+    """
+    __tablename__ = "player_game_advanced"
+
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), primary_key=True, comment="Chave de partição (LIST por temporada)")
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.source_id"), primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.source_id"), primary_key=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"))
+
+    minutes: Mapped[float] = mapped_column(Float)
+    ts_pct: Mapped[float | None] = mapped_column(Float, comment="True shooting %: PTS / (2 * (FGA + 0.44 * FTA))")
+    efg_pct: Mapped[float | None] = mapped_column(Float, comment="Effective FG %: (FGM + 0.5 * 3PM) / FGA")
+    usg_pct: Mapped[float | None] = mapped_column(Float, comment="Usage rate: posses usadas pelo jogador / posses do time em quadra")
+    ast_to_ratio: Mapped[float | None] = mapped_column(Float)
+    ast_ratio: Mapped[float | None] = mapped_column(Float, comment="Assistências a cada 100 posses usadas")
+    tov_pct: Mapped[float | None] = mapped_column(Float, comment="Turnovers a cada 100 posses usadas")
+    per: Mapped[float | None] = mapped_column(Float, comment="PER (Hollinger) ajustado pelo ritmo; média da liga = 15")
+
+    __table_args__ = (
+        {"postgresql_partition_by": "LIST (season)"},
+    )
+
+    def __repr__(self) -> str:
+        return f"<Métricas Avançadas do Jogador no Jogo(game_id={self.game_id}, player_id={self.player_id})>"
+
+class PlayerGameForm(Base, TimestampMixin):
+    """
+    Somas de prefixo do jogador na temporada: a linha do n-ésimo jogo com minutos traz os totais
+    acumulados até ele (jogos em ordem de games.game_date). A média dos últimos N jogos é
+    (acumulado[n] - acumulado[n - N]) / N, lendo só duas linhas (analytics.player_form).
+    """
+    __tablename__ = "player_game_form"
+
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), primary_key=True, comment="Chave de partição (LIST por temporada)")
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.source_id"), primary_key=True)
+    game_number: Mapped[int] = mapped_column(primary_key=True, comment="Ordem do jogo com minutos na temporada do jogador (1 = primeiro)")
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.source_id"))
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"))
+
+    cum_minutes: Mapped[float] = mapped_column(Float)
+    cum_points: Mapped[int]
+    cum_fgm: Mapped[int]
+    cum_fga: Mapped[int]
+    cum_ftm: Mapped[int]
+    cum_fta: Mapped[int]
+    cum_tpm: Mapped[int]
+    cum_tpa: Mapped[int]
+    cum_off_reb: Mapped[int]
+    cum_def_reb: Mapped[int]
+    cum_tot_reb: Mapped[int]
+    cum_assists: Mapped[int]
+    cum_steals: Mapped[int]
+    cum_blocks: Mapped[int]
+    cum_turnovers: Mapped[int]
+    cum_p_fouls: Mapped[int]
+
+    __table_args__ = (
+        {"postgresql_partition_by": "LIST (season)"},
+    )
+
+    def __repr__(self) -> str:
+        return f"<Forma do Jogador(season={self.season}, player_id={self.player_id}, game_number={self.game_number})>"
+
+class PlayerSeasonAdvanced(Base, TimestampMixin):
+    """
+    Métricas avançadas por jogador e temporada, calculadas dos totais da temporada (PER e usage
+    ponderados pelos minutos de cada jogo). Somente leitura para a API.
+    """
+    __tablename__ = "player_season_advanced"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.source_id"))
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), index=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"), comment="Time do último jogo na temporada")
+
+    games_played: Mapped[int] = mapped_column(server_default="0")
+    minutes: Mapped[float] = mapped_column(Float, server_default="0")
+    ts_pct: Mapped[float | None] = mapped_column(Float)
+    efg_pct: Mapped[float | None] = mapped_column(Float)
+    usg_pct: Mapped[float | None] = mapped_column(Float)
+    ast_to_ratio: Mapped[float | None] = mapped_column(Float)
+    ast_ratio: Mapped[float | None] = mapped_column(Float)
+    tov_pct: Mapped[float | None] = mapped_column(Float)
+    per: Mapped[float | None] = mapped_column(Float)
+
+    __table_args__ = (UniqueConstraint("player_id", "season", name="_player_season_advanced_uc"),)
 
     def __repr__(self) -> str:
-        return f"<Estatistícas do Jogador(game_id={self.game_id}, player_id={self.player_id})>"
\ No newline at end of file
+        return f"<Métricas Avançadas do Jogador na Temporada(season={self.season}, player_id={self.player_id})>"
@@ -1,5 +1,6 @@
+from sqlalchemy import JSON, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from typing import List, TYPE_CHECKING
+from typing import Any, Dict, List, TYPE_CHECKING
 
 from app.core.database import Base
 from app.models.mixins import TimestampMixin
@@ -7,7 +8,7 @@ from app.models.mixins import TimestampMixin
 if TYPE_CHECKING:
     from .game_models import Game
     from .standing_models import Standing
-    from .team_models import TeamSeasonStatistics
+    from .team_models import TeamSeasonStatistics, TeamSeasonAggregate
     from .player_models import PlayerSeasonStatistics
 
 class Season(Base, TimestampMixin):
@@ -17,7 +18,22 @@ class Season(Base, TimestampMixin):
     games: Mapped[List["Game"]] = relationship(back_populates="season_info")
     standings: Mapped[List["Standing"]] = relationship(back_populates="season_info")
     team_season_statistics: Mapped[List["TeamSeasonStatistics"]] = relationship(back_populates="season_info")
-    player_season_statistics: Mapped[List["PlayerSeasonStatistics"]] = relationship(back_populates="season_info")
+    player_season_statistics: Mapped[List["PlayerSeasonStatistics"]] = relationship(back_populates="season_info", viewonly=True)
+    team_season_aggregates: Mapped[List["TeamSeasonAggregate"]] = relationship(back_populates="season_info", viewonly=True)
 
     def __repr__(self) -> str:
         return f"<Temporada(season={self.season})>"
+
+class AnalyticsRefresh(Base, TimestampMixin):
+    """
+    Versão das tabelas de origem (max(updated_at) e número de linhas por tabela) usada na última
+    gravação de um derivado por temporada. Sem mudança de versão, a regravação é pulada.
+    """
+    __tablename__ = "analytics_refreshes"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True, comment="Derivado (ex.: advanced_metrics)")
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), primary_key=True)
+    source_version: Mapped[Dict[str, Any]] = mapped_column(JSON)
+
+    def __repr__(self) -> str:
+        return f"<Atualização de Analytics(name={self.name}, season={self.season})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, JSON, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -31,3 +31,78 @@ class Standing(Base, TimestampMixin, IngestionControlMixin):
 
     def __repr__(self):
         return f"<Standing(season={self.season}, team_id={self.team_id}, rank={self.conference_rank})>"
+
+class ComputedStanding(Base, TimestampMixin):
+    """
+    Classificação calculada localmente a partir dos jogos encerrados (analytics.standings), atualizada
+    a cada ingestão de jogos sem gastar cota da API. A última leitura da API (standings) é conferida
+    contra ela: divergências ficam em drift_fields.
+    """
+    __tablename__ = "computed_standings"
+
+    id = Column(Integer, primary_key=True)
+
+    league_id = Column(Integer, ForeignKey("leagues.source_id"), nullable=False)
+    season = Column(Integer, ForeignKey("seasons.season"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.source_id"), nullable=False)
+
+    conference_name = Column(String(100))
+    conference_rank = Column(Integer)
+    division_name = Column(String(100))
+    division_rank = Column(Integer)
+    win = Column(Integer, nullable=False, server_default="0")
+    loss = Column(Integer, nullable=False, server_default="0")
+    home_win = Column(Integer, nullable=False, server_default="0")
+    home_loss = Column(Integer, nullable=False, server_default="0")
+    away_win = Column(Integer, nullable=False, server_default="0")
+    away_loss = Column(Integer, nullable=False, server_default="0")
+    win_pct = Column(Float)
+    games_behind = Column(Float, comment="Jogos atrás do líder da conferência")
+    streak = Column(Integer)
+    win_streak = Column(Boolean)
+    last_game_id = Column(Integer, ForeignKey("games.source_id"), comment="Último jogo aplicado ao time")
+    last_game_date = Column(DateTime(timezone=True))
+
+    api_payload_hash = Column(String(64), comment="payload_hash da linha de standings (API) conferida")
+    drift_fields = Column(JSON, comment="Campos em que a API diverge do cálculo local (vazio = em dia)")
+    reconciled_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (UniqueConstraint('league_id', 'season', 'team_id', name='_computed_standing_uc'),)
+
+    def __repr__(self):
+        return f"<ComputedStanding(season={self.season}, team_id={self.team_id}, rank={self.conference_rank})>"
+
+class PlayoffOdds(Base, TimestampMixin):
+    """
+    Probabilidades de playoff, play-in e de cada colocação na conferência, estimadas por simulação do
+    restante da temporada (analytics.playoff_simulator) a partir de computed_standings e do Elo dos times.
+    """
+    __tablename__ = "playoff_odds"
+
+    id = Column(Integer, primary_key=True)
+
+    league_id = Column(Integer, ForeignKey("leagues.source_id"), nullable=False)
+    season = Column(Integer, ForeignKey("seasons.season"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.source_id"), nullable=False)
+
+    conference_name = Column(String(100))
+    win = Column(Integer, nullable=False, server_default="0")
+    loss = Column(Integer, nullable=False, server_default="0")
+    remaining_games = Column(Integer, nullable=False, server_default="0")
+    elo = Column(Float, comment="Elo usado na simulação")
+    projected_win = Column(Float, comment="Média de vitórias ao fim da temporada")
+    projected_loss = Column(Float)
+    top6_prob = Column(Float, comment="Classificação direta (1º a 6º)")
+    play_in_prob = Column(Float, comment="Vaga no play-in (7º a 10º)")
+    playoff_prob = Column(Float, comment="Classificação direta ou pelo play-in")
+    seed_probs = Column(JSON, comment="Probabilidade de cada colocação na conferência (posição 0 = 1º)")
+
+    simulations = Column(Integer, nullable=False)
+    random_seed = Column(Integer, nullable=False)
+    inputs_hash = Column(String(64), nullable=False, comment="Hash da classificação, calendário e Elo simulados")
+    simulated_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (UniqueConstraint('league_id', 'season', 'team_id', name='_playoff_odds_uc'),)
+
+    def __repr__(self):
+        return f"<PlayoffOdds(season={self.season}, team_id={self.team_id}, playoff={self.playoff_prob})>"
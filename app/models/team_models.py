@@ -1,7 +1,8 @@
-from sqlalchemy import String, Text, ForeignKey, UniqueConstraint, Numeric
+from sqlalchemy import String, Text, ForeignKey, UniqueConstraint, Numeric, Float, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import List, TYPE_CHECKING
 import decimal
+from datetime import datetime
 
 from app.core.database import Base
 from app.models.mixins import TimestampMixin
@@ -32,6 +33,7 @@ class Team(Base, TimestampMixin):
     season_statistics: Mapped[List["TeamSeasonStatistics"]] = relationship(back_populates="team", cascade="all, delete-orphan")
     player_statistics: Mapped[List["PlayerStatistics"]] = relationship(back_populates="team")
     league_affiliations: Mapped[List["TeamLeague"]] = relationship(back_populates="team", cascade="all, delete-orphan")
+    season_aggregates: Mapped[List["TeamSeasonAggregate"]] = relationship(back_populates="team", viewonly=True)
 
     def __repr__(self) -> str:
         return f"<Equipe(id={self.id}, nome='{self.name}')>"
@@ -93,3 +95,104 @@ class TeamSeasonStatistics(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Estatísticas da Equipe na Temporada(season={self.season}, team_id={self.team_id})>"
+
+class TeamSeasonAggregate(Base, TimestampMixin):
+    """
+    Agregado por equipe e temporada calculado a partir de team_statistics e mantido pelo banco
+    (função refresh_team_season_aggregates). Difere de TeamSeasonStatistics, que vem pronto da API.
+    """
+    __tablename__ = "team_season_aggregates"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"))
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), index=True)
+
+    games_played: Mapped[int] = mapped_column(server_default="0")
+    minutes: Mapped[decimal.Decimal] = mapped_column(Numeric(8, 2), server_default="0")
+    points: Mapped[int] = mapped_column(server_default="0")
+    fgm: Mapped[int] = mapped_column(server_default="0")
+    fga: Mapped[int] = mapped_column(server_default="0")
+    ftm: Mapped[int] = mapped_column(server_default="0")
+    fta: Mapped[int] = mapped_column(server_default="0")
+    tpm: Mapped[int] = mapped_column(server_default="0")
+    tpa: Mapped[int] = mapped_column(server_default="0")
+    off_reb: Mapped[int] = mapped_column(server_default="0")
+    def_reb: Mapped[int] = mapped_column(server_default="0")
+    tot_reb: Mapped[int] = mapped_column(server_default="0")
+    assists: Mapped[int] = mapped_column(server_default="0")
+    steals: Mapped[int] = mapped_column(server_default="0")
+    blocks: Mapped[int] = mapped_column(server_default="0")
+    turnovers: Mapped[int] = mapped_column(server_default="0")
+    p_fouls: Mapped[int] = mapped_column(server_default="0")
+    minutes_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    points_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    rebounds_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    assists_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    steals_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    blocks_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    turnovers_per_game: Mapped[decimal.Decimal | None] = mapped_column(Numeric(6, 2))
+    fgp: Mapped[decimal.Decimal | None] = mapped_column(Numeric(5, 2))
+    ftp: Mapped[decimal.Decimal | None] = mapped_column(Numeric(5, 2))
+    tpp: Mapped[decimal.Decimal | None] = mapped_column(Numeric(5, 2))
+
+    team: Mapped["Team"] = relationship(back_populates="season_aggregates")
+    season_info: Mapped["Season"] = relationship(back_populates="team_season_aggregates")
+
+    __table_args__ = (UniqueConstraint("team_id", "season", name="_team_season_aggregate_uc"),)
+
+    def __repr__(self) -> str:
+        return f"<Agregado da Equipe na Temporada(season={self.season}, team_id={self.team_id})>"
+
+class TeamGameRating(Base, TimestampMixin):
+    """
+    Ritmo e ratings (ORtg, DRtg, net) do time em cada jogo e na janela móvel dos últimos jogos,
+    derivados de team_statistics pelo analytics.team_analytics. Novos jogos são acrescentados
+    sem recalcular a temporada.
+    """
+    __tablename__ = "team_game_ratings"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"))
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), index=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.source_id"))
+    opponent_id: Mapped[int | None] = mapped_column(ForeignKey("teams.source_id"))
+    game_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    is_home: Mapped[bool | None]
+    game_number: Mapped[int] = mapped_column(comment="Ordem do jogo na temporada do time (1 = primeiro)")
+
+    minutes: Mapped[float] = mapped_column(Float)
+    possessions: Mapped[float | None] = mapped_column(Float, comment="Média das posses estimadas dos dois times")
+    pace: Mapped[float | None] = mapped_column(Float, comment="Posses por 48 minutos")
+    off_rating: Mapped[float | None] = mapped_column(Float, comment="Pontos feitos por 100 posses")
+    def_rating: Mapped[float | None] = mapped_column(Float, comment="Pontos sofridos por 100 posses")
+    net_rating: Mapped[float | None] = mapped_column(Float)
+    rolling_pace: Mapped[float | None] = mapped_column(Float)
+    rolling_off_rating: Mapped[float | None] = mapped_column(Float)
+    rolling_def_rating: Mapped[float | None] = mapped_column(Float)
+    rolling_net_rating: Mapped[float | None] = mapped_column(Float)
+
+    __table_args__ = (
+        UniqueConstraint("team_id", "game_id", name="_team_game_rating_uc"),
+        # Jogos do time na temporada em ordem, direto do índice
+        Index("ix_team_game_ratings_team_season_number", "team_id", "season", "game_number"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Ratings da Equipe no Jogo(game_id={self.game_id}, team_id={self.team_id})>"
+
+class TeamEloRating(Base, TimestampMixin):
+    """
+    Estado atual do Elo de cada time (após o último jogo aplicado). A ingestão diária continua daqui,
+    aplicando só os jogos encerrados que ainda não estão em game_elo_ratings.
+    """
+    __tablename__ = "team_elo_ratings"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.source_id"), unique=True)
+    elo: Mapped[float] = mapped_column(Float)
+    season: Mapped[int] = mapped_column(ForeignKey("seasons.season"), comment="Temporada do último jogo aplicado (reversão à média na virada)")
+    games_played: Mapped[int] = mapped_column(server_default="0")
+    last_game_id: Mapped[int | None] = mapped_column(ForeignKey("games.source_id"))
+
+    def __repr__(self) -> str:
+        return f"<Elo da Equipe(team_id={self.team_id}, elo={self.elo:.1f})>"
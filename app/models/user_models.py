@@ -8,6 +8,7 @@ from app.models.mixins import TimestampMixin
 
 class UserRole(str, enum.Enum):
     ADMIN = "admin"
+    ANALYST = "analyst"
     USER = "user"
 
 class User(Base, TimestampMixin):
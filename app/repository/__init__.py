@@ -1,4 +1,7 @@
 from .user_repository import user, UserRepository
 from .base_repository import BaseRepository
-from .ingestion_repository import upsert_bulk
+from .ingestion_repository import upsert_bulk, group_by_season
+from .partition_repository import ensure_season_partitions, detach_season_partition
 from .season_repository import create_season
+from .aggregate_repository import refresh_season_aggregates, get_player_season, get_team_season
+from .read_repository import keyset_page
@@ -0,0 +1,36 @@
+import logging
+from typing import Iterable, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.player_models import PlayerSeasonStatistics
+from app.models.team_models import TeamSeasonAggregate
+
+logger = logging.getLogger(__name__)
+
+# Funções criadas pela migração 153498b0b3b7; cada uma recalcula os agregados de uma única temporada
+SEASON_AGGREGATE_FUNCTIONS = {
+    "player_season_statistics": "refresh_player_season_statistics",
+    "team_season_aggregates": "refresh_team_season_aggregates",
+}
+
+def refresh_season_aggregates(db: Session, seasons: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """
+    Recalcula os agregados somente das temporadas informadas (as tocadas pela ingestão).
+    Cada temporada é confirmada separadamente para manter as transações curtas.
+    """
+    refreshed: Dict[int, Dict[str, int]] = {}
+    for season in sorted(set(seasons)):
+        refreshed[season] = {}
+        for table, function in SEASON_AGGREGATE_FUNCTIONS.items():
+            affected = db.execute(text(f"SELECT {function}(:season)"), {"season": season}).scalar_one()
+            refreshed[season][table] = affected
+        db.commit()
+        logger.info(f"Agregados da temporada {season} atualizados: {refreshed[season]}")
+    return refreshed
+
+def get_player_season(db: Session, player_id: int, season: int) -> Optional[PlayerSeasonStatistics]:
+    return db.query(PlayerSeasonStatistics).filter_by(player_id=player_id, season=season).first()
+
+def get_team_season(db: Session, team_id: int, season: int) -> Optional[TeamSeasonAggregate]:
+    return db.query(TeamSeasonAggregate).filter_by(team_id=team_id, season=season).first()
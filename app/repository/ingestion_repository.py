@@ -1,8 +1,10 @@
 import logging
-from typing import Type, List, Dict, Any
+import time
+from typing import Type, List, Dict, Any, Union
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 from app.core.database import Base
+from app.core.metrics import record_ingestion
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -11,20 +13,41 @@ def upsert_bulk(
     db: Session,
     model: Type[Base], # type: ignore
     payloads: List[Dict[str, Any]],
-    unique_key: str = "source_id"
-):
+    unique_key: Union[str, List[str]] = "source_id",
+    skip_unchanged: bool = False
+) -> int:
+    """
+    Com skip_unchanged=True, linhas cujo payload_hash não mudou não são reescritas (nem o updated_at):
+    o retorno passa a ser o número de linhas inseridas ou de fato alteradas.
+    """
     if not payloads:
-        return
+        return 0
 
+    index_elements = [unique_key] if isinstance(unique_key, str) else list(unique_key)
     stmt = insert(model).values(payloads)
-    
+
     update_columns = {
         col.name: col
         for col in stmt.excluded
-        if col.name not in ["id", unique_key, "created_at"]
+        if col.name not in ["id", "created_at", *index_elements]
     }
 
-    stmt = stmt.on_conflict_do_update(index_elements=[unique_key], set_=update_columns)
-    
+    where = None
+    if skip_unchanged:
+        where = model.__table__.c.payload_hash.is_distinct_from(stmt.excluded.payload_hash)
+    stmt = stmt.on_conflict_do_update(index_elements=index_elements, set_=update_columns, where=where)
+
+    start = time.perf_counter()
     result = db.execute(stmt)
+    record_ingestion(model.__tablename__, result.rowcount, time.perf_counter() - start)
     logger.info(f"Upsert para '{model.__tablename__}' concluído. {result.rowcount} linhas afetadas.")
+    return result.rowcount
+
+def group_by_season(payloads: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Agrupa os payloads pela coluna 'season' para que cada carga atinja uma única partição.
+    """
+    grouped: Dict[int, List[Dict[str, Any]]] = {}
+    for payload in payloads:
+        grouped.setdefault(payload["season"], []).append(payload)
+    return grouped
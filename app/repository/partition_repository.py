@@ -0,0 +1,51 @@
+import logging
+from typing import Iterable, List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Tabelas particionadas por LIST (season); a função create_season_partition é criada pela migração 26f2a83e27b4
+SEASON_PARTITIONED_TABLES = ("player_statistics", "team_statistics", "player_game_advanced", "player_game_form")
+
+def season_partition_name(table: str, season: int) -> str:
+    return f"{table}_{season}"
+
+def ensure_season_partition(db: Session, table: str, season: int) -> str:
+    if table not in SEASON_PARTITIONED_TABLES:
+        raise ValueError(f"A tabela '{table}' não é particionada por temporada.")
+    return db.execute(
+        text("SELECT create_season_partition(:table, :season)"),
+        {"table": table, "season": season},
+    ).scalar_one()
+
+def ensure_season_partitions(db: Session, seasons: Iterable[int]) -> List[str]:
+    """
+    Garante (de forma idempotente) as partições de todas as tabelas particionadas para as temporadas informadas.
+    """
+    created = []
+    for season in sorted(set(seasons)):
+        for table in SEASON_PARTITIONED_TABLES:
+            created.append(ensure_season_partition(db, table, season))
+    return created
+
+def detach_season_partition(table: str, season: int, concurrently: bool = True) -> str:
+    """
+    Desanexa a partição de uma temporada antiga. A tabela continua existindo de forma
+    independente e pode ser arquivada (pg_dump) ou removida com DROP TABLE.
+    O modo CONCURRENTLY não pode rodar dentro de uma transação, por isso usa uma conexão em autocommit.
+    """
+    if table not in SEASON_PARTITIONED_TABLES:
+        raise ValueError(f"A tabela '{table}' não é particionada por temporada.")
+
+    partition = season_partition_name(table, season)
+    mode = " CONCURRENTLY" if concurrently else ""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        exists = connection.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": partition}).scalar_one()
+        if not exists:
+            raise ValueError(f"A partição '{partition}' não existe.")
+        connection.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}"{mode}'))
+    logger.info(f"Partição '{partition}' desanexada de '{table}'.")
+    return partition
@@ -0,0 +1,330 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import Column, Table, case, func, select, tuple_, or_, and_
+from sqlalchemy.orm import Session
+
+from app.models.game_models import Game, GameEloRating, TeamStatistics
+from app.models.player_models import Player, PlayerGameAdvanced, PlayerGameForm, PlayerSeasonAdvanced, PlayerStatistics
+from app.models.standing_models import ComputedStanding, PlayoffOdds, Standing
+from app.models.team_models import Team, TeamEloRating, TeamGameRating, TeamSeasonStatistics
+from app.utils.pagination import encode_cursor, escape_like
+
+# Consultas da API pública de leitura: projeções Core sobre as tabelas (sem hidratar objetos ORM
+# nem carregar relacionamentos), devolvendo dicionários prontos para serialização.
+
+games_table: Table = Game.__table__
+team_statistics_table: Table = TeamStatistics.__table__
+player_statistics_table: Table = PlayerStatistics.__table__
+teams_table: Table = Team.__table__
+team_season_statistics_table: Table = TeamSeasonStatistics.__table__
+team_game_ratings_table: Table = TeamGameRating.__table__
+game_elo_ratings_table: Table = GameEloRating.__table__
+team_elo_ratings_table: Table = TeamEloRating.__table__
+players_table: Table = Player.__table__
+player_game_advanced_table: Table = PlayerGameAdvanced.__table__
+player_season_advanced_table: Table = PlayerSeasonAdvanced.__table__
+player_game_form_table: Table = PlayerGameForm.__table__
+standings_table: Table = Standing.__table__
+computed_standings_table: Table = ComputedStanding.__table__
+playoff_odds_table: Table = PlayoffOdds.__table__
+
+def _columns(table: Table, names: Sequence[str]) -> List[Column]:
+    return [table.c[name] for name in names]
+
+def _as_dicts(result) -> List[Dict[str, Any]]:
+    # Monta os dicionários direto das tuplas do cursor, sem o RowMapping por linha
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def table_fields(table: Table, exclude: Sequence[str] = ()) -> List[str]:
+    return [column.name for column in table.columns if column.name not in exclude]
+
+def keyset_page(
+    db: Session,
+    table: Table,
+    fields: Sequence[str],
+    filters: Sequence[Any],
+    sort_keys: Sequence[str],
+    cursor_values: Optional[List[Any]],
+    limit: int,
+    descending: bool = False,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Paginação keyset: WHERE (chaves) > (valores da última linha) ORDER BY chaves LIMIT n+1.
+    O custo de cada página independe da profundidade, ao contrário de OFFSET.
+    """
+    keys = _columns(table, sort_keys)
+    stmt = select(*_columns(table, fields)).where(*filters)
+    if cursor_values is not None:
+        position = tuple_(*keys)
+        stmt = stmt.where(position < tuple_(*cursor_values) if descending else position > tuple_(*cursor_values))
+    stmt = stmt.order_by(*(key.desc() if descending else key.asc() for key in keys)).limit(limit + 1)
+
+    items = _as_dicts(db.execute(stmt))
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([items[-1][key] for key in sort_keys])
+    return items, next_cursor
+
+def get_row(db: Session, table: Table, fields: Sequence[str], *filters: Any) -> Optional[Dict[str, Any]]:
+    rows = _as_dicts(db.execute(select(*_columns(table, fields)).where(*filters).limit(1)))
+    return rows[0] if rows else None
+
+# --- Jogos ---
+GAME_SORT_KEYS = ["game_date", "source_id"]
+GAME_SORT_TYPES = (datetime, int)
+
+def list_games(
+    db: Session,
+    fields: Sequence[str],
+    cursor_values: Optional[List[Any]],
+    limit: int,
+    season: Optional[int] = None,
+    team_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    status: Optional[str] = None,
+    descending: bool = False,
+):
+    # Jogos sem data (a definir) ficam fora da listagem: a data é a chave da paginação
+    filters = [games_table.c.game_date.is_not(None)]
+    if season is not None:
+        filters.append(games_table.c.season == season)
+    if team_id is not None:
+        filters.append(or_(games_table.c.home_team_id == team_id, games_table.c.visitor_team_id == team_id))
+    if date_from is not None:
+        filters.append(games_table.c.game_date >= date_from)
+    if date_to is not None:
+        filters.append(games_table.c.game_date < date_to)
+    if status is not None:
+        filters.append(games_table.c.status == status)
+    return keyset_page(db, games_table, fields, filters, GAME_SORT_KEYS, cursor_values, limit, descending)
+
+def get_game(db: Session, game_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+    return get_row(db, games_table, fields, games_table.c.source_id == game_id)
+
+def get_box_score(db: Session, game_id: int) -> Optional[Dict[str, Any]]:
+    game = db.execute(
+        select(games_table.c.season, games_table.c.status, games_table.c.updated_at).where(games_table.c.source_id == game_id)
+    ).first()
+    if game is None:
+        return None
+
+    # O filtro por temporada restringe a leitura à partição do jogo
+    team_fields = table_fields(team_statistics_table, exclude=("id", "created_at"))
+    player_fields = table_fields(player_statistics_table, exclude=("id", "created_at"))
+    teams = _as_dicts(db.execute(
+        select(*_columns(team_statistics_table, team_fields))
+        .where(team_statistics_table.c.season == game.season, team_statistics_table.c.game_id == game_id)
+        .order_by(team_statistics_table.c.team_id)
+    ))
+    players = _as_dicts(db.execute(
+        select(*_columns(player_statistics_table, player_fields))
+        .where(player_statistics_table.c.season == game.season, player_statistics_table.c.game_id == game_id)
+        .order_by(player_statistics_table.c.team_id, player_statistics_table.c.player_id)
+    ))
+
+    # Última atualização entre o jogo e as estatísticas: versão do box score (base do ETag)
+    updated_at = max([game.updated_at, *(row.pop("updated_at") for row in teams + players)])
+    return {
+        "game_id": game_id,
+        "season": game.season,
+        "status": game.status,
+        "updated_at": updated_at,
+        "teams": teams,
+        "players": players,
+    }
+
+# --- Times ---
+TEAM_SORT_KEYS = ["source_id"]
+TEAM_SORT_TYPES = (int,)
+
+def list_teams(
+    db: Session,
+    fields: Sequence[str],
+    cursor_values: Optional[List[Any]],
+    limit: int,
+    is_nba_franchise: Optional[bool] = None,
+    code: Optional[str] = None,
+):
+    filters = []
+    if is_nba_franchise is not None:
+        filters.append(teams_table.c.is_nba_franchise == is_nba_franchise)
+    if code is not None:
+        filters.append(teams_table.c.code == code.upper())
+    return keyset_page(db, teams_table, fields, filters, TEAM_SORT_KEYS, cursor_values, limit)
+
+def get_team(db: Session, team_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+    return get_row(db, teams_table, fields, teams_table.c.source_id == team_id)
+
+def list_team_season_statistics(db: Session, team_id: int, season: Optional[int] = None) -> List[Dict[str, Any]]:
+    fields = table_fields(team_season_statistics_table, exclude=("id", "created_at"))
+    stmt = select(*_columns(team_season_statistics_table, fields)).where(team_season_statistics_table.c.team_id == team_id)
+    if season is not None:
+        stmt = stmt.where(team_season_statistics_table.c.season == season)
+    return _as_dicts(db.execute(stmt.order_by(team_season_statistics_table.c.season)))
+
+def list_team_game_ratings(db: Session, team_id: int, season: int) -> List[Dict[str, Any]]:
+    table = team_game_ratings_table
+    fields = table_fields(table, exclude=("id", "created_at"))
+    stmt = select(*_columns(table, fields)).where(table.c.team_id == team_id, table.c.season == season)
+    return _as_dicts(db.execute(stmt.order_by(table.c.game_number)))
+
+def get_team_elo(db: Session, team_id: int) -> Optional[Dict[str, Any]]:
+    table = team_elo_ratings_table
+    fields = table_fields(table, exclude=("id", "created_at"))
+    rows = _as_dicts(db.execute(select(*_columns(table, fields)).where(table.c.team_id == team_id)))
+    return rows[0] if rows else None
+
+def list_team_elo_history(db: Session, team_id: int, season: int) -> List[Dict[str, Any]]:
+    """
+    Elo do time antes e depois de cada jogo da temporada, do ponto de vista do time.
+    """
+    table = game_elo_ratings_table
+    is_home = table.c.home_team_id == team_id
+    stmt = select(
+        table.c.game_id,
+        games_table.c.game_date,
+        is_home.label("is_home"),
+        case((is_home, table.c.visitor_team_id), else_=table.c.home_team_id).label("opponent_id"),
+        case((is_home, table.c.home_elo_pre), else_=table.c.visitor_elo_pre).label("elo_pre"),
+        case((is_home, table.c.visitor_elo_pre), else_=table.c.home_elo_pre).label("opponent_elo_pre"),
+        case((is_home, table.c.home_win_prob), else_=1 - table.c.home_win_prob).label("win_prob"),
+        case((is_home, table.c.home_elo_post), else_=table.c.visitor_elo_post).label("elo_post"),
+        table.c.updated_at,
+    ).select_from(table.join(games_table, games_table.c.source_id == table.c.game_id)).where(
+        table.c.season == season,
+        or_(is_home, table.c.visitor_team_id == team_id),
+    )
+    return _as_dicts(db.execute(stmt.order_by(table.c.sequence)))
+
+# --- Jogadores ---
+PLAYER_SORT_KEYS = ["source_id"]
+PLAYER_SORT_TYPES = (int,)
+PLAYER_GAME_SORT_KEYS = ["game_id"]
+PLAYER_GAME_SORT_TYPES = (int,)
+
+def list_players(
+    db: Session,
+    fields: Sequence[str],
+    cursor_values: Optional[List[Any]],
+    limit: int,
+    name: Optional[str] = None,
+    team_id: Optional[int] = None,
+    season: Optional[int] = None,
+):
+    filters = []
+    if name:
+        filters.append(players_table.c.last_name.ilike(f"{escape_like(name)}%", escape="\\"))
+    if team_id is not None or season is not None:
+        # Jogadores com ao menos uma partida pelo time/temporada (EXISTS evita o DISTINCT sobre as estatísticas)
+        conditions = [player_statistics_table.c.player_id == players_table.c.source_id]
+        if team_id is not None:
+            conditions.append(player_statistics_table.c.team_id == team_id)
+        if season is not None:
+            conditions.append(player_statistics_table.c.season == season)
+        filters.append(select(player_statistics_table.c.id).where(and_(*conditions)).exists())
+    return keyset_page(db, players_table, fields, filters, PLAYER_SORT_KEYS, cursor_values, limit)
+
+def get_player(db: Session, player_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+    return get_row(db, players_table, fields, players_table.c.source_id == player_id)
+
+def list_player_games(
+    db: Session,
+    player_id: int,
+    season: int,
+    fields: Sequence[str],
+    cursor_values: Optional[List[Any]],
+    limit: int,
+):
+    filters = [player_statistics_table.c.season == season, player_statistics_table.c.player_id == player_id]
+    return keyset_page(db, player_statistics_table, fields, filters, PLAYER_GAME_SORT_KEYS, cursor_values, limit)
+
+def get_player_season_advanced(db: Session, player_id: int, season: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+    table = player_season_advanced_table
+    return get_row(db, table, fields, table.c.player_id == player_id, table.c.season == season)
+
+def list_player_game_advanced(
+    db: Session,
+    player_id: int,
+    season: int,
+    fields: Sequence[str],
+    cursor_values: Optional[List[Any]],
+    limit: int,
+):
+    # Filtro pelo prefixo da PK (season, player_id, game_id): só a partição da temporada é lida
+    filters = [player_game_advanced_table.c.season == season, player_game_advanced_table.c.player_id == player_id]
+    return keyset_page(db, player_game_advanced_table, fields, filters, PLAYER_GAME_SORT_KEYS, cursor_values, limit)
+
+def get_player_form_latest(db: Session, player_id: int, season: int) -> Optional[int]:
+    # max() sobre o prefixo da PK (season, player_id, game_number): uma descida no índice
+    table = player_game_form_table
+    return db.execute(
+        select(func.max(table.c.game_number)).where(table.c.season == season, table.c.player_id == player_id)
+    ).scalar()
+
+def get_player_form_rows(db: Session, player_id: int, season: int, game_numbers: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+    table = player_game_form_table
+    fields = table_fields(table, exclude=("season", "player_id", "created_at"))
+    stmt = select(*_columns(table, fields)).where(
+        table.c.season == season, table.c.player_id == player_id, table.c.game_number.in_(list(game_numbers))
+    )
+    return {row["game_number"]: row for row in _as_dicts(db.execute(stmt))}
+
+# --- Classificação ---
+def list_standings(
+    db: Session,
+    season: int,
+    fields: Sequence[str],
+    league_id: Optional[int] = None,
+    conference: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    # Uma temporada tem poucas dezenas de linhas por liga: devolvida inteira, sem paginação
+    stmt = select(*_columns(standings_table, fields)).where(
+        standings_table.c.season == season, standings_table.c.is_active == 1
+    )
+    if league_id is not None:
+        stmt = stmt.where(standings_table.c.league_id == league_id)
+    if conference is not None:
+        stmt = stmt.where(standings_table.c.conference_name == conference)
+    stmt = stmt.order_by(
+        standings_table.c.league_id,
+        standings_table.c.conference_name,
+        standings_table.c.conference_rank.nulls_last(),
+        standings_table.c.team_id,
+    )
+    return _as_dicts(db.execute(stmt))
+
+def list_computed_standings(
+    db: Session,
+    season: int,
+    fields: Sequence[str],
+    league_id: Optional[int] = None,
+    conference: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    table = computed_standings_table
+    stmt = select(*_columns(table, fields)).where(table.c.season == season)
+    if league_id is not None:
+        stmt = stmt.where(table.c.league_id == league_id)
+    if conference is not None:
+        stmt = stmt.where(table.c.conference_name == conference)
+    stmt = stmt.order_by(table.c.league_id, table.c.conference_name, table.c.conference_rank.nulls_last(), table.c.team_id)
+    return _as_dicts(db.execute(stmt))
+
+def list_playoff_odds(
+    db: Session,
+    season: int,
+    fields: Sequence[str],
+    league_id: Optional[int] = None,
+    conference: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    table = playoff_odds_table
+    stmt = select(*_columns(table, fields)).where(table.c.season == season)
+    if league_id is not None:
+        stmt = stmt.where(table.c.league_id == league_id)
+    if conference is not None:
+        stmt = stmt.where(table.c.conference_name == conference)
+    stmt = stmt.order_by(table.c.league_id, table.c.conference_name, table.c.playoff_prob.desc().nulls_last(),
+                         table.c.projected_win.desc(), table.c.team_id)
+    return _as_dicts(db.execute(stmt))
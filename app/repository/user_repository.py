@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core import security
+from app.core.user_cache import user_snapshot_cache
 from app.models.user_models import User
 from app.repository.base_repository import BaseRepository
 from app.schemas.user_schemas import UserCreate, UserUpdate
@@ -14,13 +16,14 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
     def get_by_cpf(self, db: Session, *, cpf: str) -> Optional[User]:
         return db.query(User).filter(User.cpf == cpf).first()
 
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+    def create(self, db: Session, *, obj_in: UserCreate, password_hash: Optional[str] = None) -> User:
+        # Rotas assíncronas calculam o hash no pool (get_password_hash_async) e o repassam prontos
         db_obj = User(
             email=obj_in.email,
             full_name=obj_in.full_name,
             date_of_birth=obj_in.date_of_birth,
             cpf=obj_in.cpf,
-            password_hash=security.get_password_hash(obj_in.password),
+            password_hash=password_hash or security.get_password_hash(obj_in.password),
             is_active=True,
             is_verified=False,
         )
@@ -36,17 +39,44 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
             db.add(user)
             db.commit()
             db.refresh(user)
+            user_snapshot_cache.invalidate_user(user.id, email)
         return user
     
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not security.verify_password(password, user.password_hash):
+        valid, new_hash = security.verify_and_update_password(password, user.password_hash)
+        if not valid:
             return None
+        if new_hash:
+            self.store_rehashed_password(db, user=user, password_hash=new_hash)
+        return user
+
+    async def authenticate_async(self, db: Session, *, email: str, password: str) -> Optional[User]:
+        """
+        Versão para rotas assíncronas: o bcrypt roda no pool de hash e o acesso ao banco no
+        threadpool, sem bloquear o event loop.
+        """
+        user = await run_in_threadpool(self.get_by_email, db, email=email)
+        if not user:
+            return None
+        valid, new_hash = await security.verify_and_update_password_async(password, user.password_hash)
+        if not valid:
+            return None
+        if new_hash:
+            await run_in_threadpool(self.store_rehashed_password, db, user=user, password_hash=new_hash)
+        return user
+
+    def store_rehashed_password(self, db: Session, *, user: User, password_hash: str) -> User:
+        # Hash refeito com o custo atual; a senha não muda, então o cache de autenticação continua válido
+        user.password_hash = password_hash
+        db.add(user)
+        db.commit()
+        db.refresh(user)
         return user
     
-    def update(db: Session, *, db_obj: User, obj_in: UserUpdate | dict) -> User:
+    def update(self, db: Session, *, db_obj: User, obj_in: UserUpdate | dict) -> User:
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
@@ -55,9 +85,19 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         if "password" in update_data and update_data["password"]:
             hashed_password = security.get_password_hash(update_data["password"])
             del update_data["password"]
-            update_data["hashed_password"] = hashed_password
+            update_data["password_hash"] = hashed_password
         
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        # E-mail antigo: o cache de autenticação é indexado pelo token emitido para ele
+        previous_email = db_obj.email
+        updated = super().update(db, db_obj=db_obj, obj_in=update_data)
+        user_snapshot_cache.invalidate_user(updated.id, previous_email)
+        return updated
+
+    def remove(self, db: Session, *, id: int) -> Optional[User]:
+        removed = super().remove(db, id=id)
+        if removed:
+            user_snapshot_cache.invalidate_user(removed.id, removed.email)
+        return removed
     
     def set_password_reset_token(self, db: Session, *, user: User, token: str) -> User:
         expires_time = datetime.now(timezone.utc) + timedelta(minutes=security.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES)
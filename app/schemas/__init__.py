@@ -6,18 +6,21 @@ from .league_schemas import League, LeagueCreate
 from .team_schemas import (
     Team, TeamCreate,
     TeamLeague, TeamLeagueCreate,
-    TeamSeasonStatistics, TeamSeasonStatisticsCreate
+    TeamSeasonStatistics, TeamSeasonStatisticsCreate,
+    TeamSeasonAggregate
 )
 from .player_schemas import (
     Player, PlayerCreate,
     PlayerLeague, PlayerLeagueCreate,
-    PlayerStatistics, PlayerStatisticsCreate
+    PlayerStatistics, PlayerStatisticsCreate,
+    PlayerSeasonStatistics
 )
 from .game_schemas import (
     Game, GameCreate,
     TeamStatistics, TeamStatisticsCreate
 )
 from .standing_schemas import Standing, StandingCreate
+from .pagination_schemas import Page
 
 __all__ = [
     "User",
@@ -37,12 +40,14 @@ __all__ = [
     "TeamLeagueCreate",
     "TeamSeasonStatistics",
     "TeamSeasonStatisticsCreate",
+    "TeamSeasonAggregate",
     "Player",
     "PlayerCreate",
     "PlayerLeague",
     "PlayerLeagueCreate",
     "PlayerStatistics",
     "PlayerStatisticsCreate",
+    "PlayerSeasonStatistics",
     "Game",
     "GameCreate",
     "TeamStatistics",
@@ -51,4 +56,5 @@ __all__ = [
     "PlayerStatisticsCreate",
     "Standing",
     "StandingCreate",
+    "Page",
 ]
\ No newline at end of file
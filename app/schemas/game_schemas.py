@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import decimal
 
 class GameBase(BaseModel):
@@ -13,6 +13,8 @@ class GameBase(BaseModel):
     visitor_team_id: int
     home_score: Optional[int] = None
     visitor_score: Optional[int] = None
+    home_linescore: Optional[List[int]] = None
+    visitor_linescore: Optional[List[int]] = None
     arena_name: Optional[str] = None
     arena_city: Optional[str] = None
 
@@ -31,6 +33,7 @@ class Game(GameBase):
 class TeamStatisticsBase(BaseModel):
     team_id: int
     game_id: int
+    season: int
     points: Optional[int] = None
     fast_break_points: Optional[int] = None,
     points_in_paint: Optional[int] = None,
@@ -56,6 +59,7 @@ class TeamStatisticsBase(BaseModel):
     turnovers: Optional[int] = None
     blocks: Optional[int] = None
     plus_minus: Optional[str] = None
+    min_played: Optional[str] = None
 
 class TeamStatisticsCreate(TeamStatisticsBase):
     pass
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+class Page(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+    limit: int
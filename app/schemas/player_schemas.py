@@ -49,6 +49,7 @@ class PlayerStatisticsBase(BaseModel):
     player_id: int
     team_id: int
     game_id: int
+    season: int
     points: Optional[int] = None
     position: Optional[str] = None
     min_played: Optional[str] = None
@@ -72,7 +73,7 @@ class PlayerStatisticsBase(BaseModel):
     plus_minus: Optional[str] = None
 
 class PlayerStatisticsCreate(PlayerStatisticsBase):
-    pass
+    payload_hash: Optional[str] = None
 
 class PlayerStatistics(PlayerStatisticsBase):
     id: int
@@ -83,3 +84,43 @@ class PlayerStatistics(PlayerStatisticsBase):
         "from_attributes": True
     }
         
+
+class PlayerSeasonStatisticsBase(BaseModel):
+    player_id: int
+    season: int
+    games_played: int
+    minutes: decimal.Decimal
+    points: int
+    fgm: int
+    fga: int
+    ftm: int
+    fta: int
+    tpm: int
+    tpa: int
+    off_reb: int
+    def_reb: int
+    tot_reb: int
+    assists: int
+    steals: int
+    blocks: int
+    turnovers: int
+    p_fouls: int
+    minutes_per_game: Optional[decimal.Decimal] = None
+    points_per_game: Optional[decimal.Decimal] = None
+    rebounds_per_game: Optional[decimal.Decimal] = None
+    assists_per_game: Optional[decimal.Decimal] = None
+    steals_per_game: Optional[decimal.Decimal] = None
+    blocks_per_game: Optional[decimal.Decimal] = None
+    turnovers_per_game: Optional[decimal.Decimal] = None
+    fgp: Optional[decimal.Decimal] = None
+    ftp: Optional[decimal.Decimal] = None
+    tpp: Optional[decimal.Decimal] = None
+
+class PlayerSeasonStatistics(PlayerSeasonStatisticsBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {
+        "from_attributes": True
+    }
\ No newline at end of file
@@ -17,7 +17,8 @@ class StandingBase(BaseModel):
     win_streak: Optional[bool] = None
 
 class StandingCreate(StandingBase):
-    pass
+    source_id: int
+    payload_hash: str
 
 class Standing(StandingBase):
     id: int
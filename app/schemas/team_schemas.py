@@ -71,6 +71,46 @@ class TeamSeasonStatistics(TeamSeasonStatisticsBase):
     created_at: datetime
     updated_at: datetime
 
+    model_config = {
+        "from_attributes": True
+    }
+
+class TeamSeasonAggregateBase(BaseModel):
+    team_id: int
+    season: int
+    games_played: int
+    minutes: decimal.Decimal
+    points: int
+    fgm: int
+    fga: int
+    ftm: int
+    fta: int
+    tpm: int
+    tpa: int
+    off_reb: int
+    def_reb: int
+    tot_reb: int
+    assists: int
+    steals: int
+    blocks: int
+    turnovers: int
+    p_fouls: int
+    minutes_per_game: Optional[decimal.Decimal] = None
+    points_per_game: Optional[decimal.Decimal] = None
+    rebounds_per_game: Optional[decimal.Decimal] = None
+    assists_per_game: Optional[decimal.Decimal] = None
+    steals_per_game: Optional[decimal.Decimal] = None
+    blocks_per_game: Optional[decimal.Decimal] = None
+    turnovers_per_game: Optional[decimal.Decimal] = None
+    fgp: Optional[decimal.Decimal] = None
+    ftp: Optional[decimal.Decimal] = None
+    tpp: Optional[decimal.Decimal] = None
+
+class TeamSeasonAggregate(TeamSeasonAggregateBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
     model_config = {
         "from_attributes": True
     }
\ No newline at end of file
@@ -0,0 +1,272 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.response_cache import invalidate_cache, season_tag
+from app.models.game_models import TeamStatistics
+from app.models.player_models import PlayerGameAdvanced, PlayerSeasonAdvanced, PlayerStatistics
+from app.models.season_models import AnalyticsRefresh
+from app.repository.ingestion_repository import upsert_bulk
+from app.repository.partition_repository import ensure_season_partition
+from app.services.snapshot_service import season_versions
+from app.services.analytics.columnar import group_starts, ratio, replace_season_rows
+from app.services.analytics.player_analytics import STAT_COLUMNS, STAT_INDEX, load_season_matrix
+from app.services.analytics.team_analytics import TEAM_STATS, load_team_matrix, opponent_rows
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Métricas avançadas (TS%, eFG%, USG%, AST/TO, AST ratio, TOV%, PER) por jogador-jogo e por
+# jogador-temporada, calculadas em NumPy sobre as matrizes da temporada e gravadas em tabelas
+# derivadas (player_game_advanced, player_season_advanced); a API só lê o resultado.
+# Contexto de time/adversário vem de team_statistics; o da liga, dos totais da temporada.
+# Temporadas cuja versão de player_statistics/team_statistics não mudou desde a última gravação
+# (analytics_refreshes) são puladas: regravar tocaria o updated_at e invalidaria os caches derivados.
+# Uso: python -m app.services.analytics.advanced_metrics --season 2024 [--season 2023] [--force]
+
+METRICS = ("ts_pct", "efg_pct", "usg_pct", "ast_to_ratio", "ast_ratio", "tov_pct", "per")
+GAME_COLUMNS = ("season", "player_id", "game_id", "team_id", "minutes", *METRICS)
+SEASON_COLUMNS = ("season", "player_id", "team_id", "games_played", "minutes", *METRICS)
+LEAGUE_AVERAGE_PER = 15.0
+REFRESH_NAME = "advanced_metrics"
+# Muda quando o cálculo muda: força a regravação de todas as temporadas
+METRICS_FORMAT = 1
+
+# Colunas das matrizes de jogador (player_analytics): player_id, team_id, game_id, minutos e STAT_COLUMNS.
+# A matriz de time é a de team_analytics (game_id e team_id nas duas primeiras colunas).
+PLAYER, TEAM, GAME, MINUTES = 0, 1, 2, 3
+PLAYER_STATS = 4
+
+def _col(matrix: np.ndarray, name: str, offset: int = PLAYER_STATS) -> np.ndarray:
+    return matrix[:, offset + STAT_INDEX[name]]
+
+@dataclass
+class LeagueContext:
+    pace: float
+    vop: float  # valor de uma posse
+    factor: float
+    drb_pct: float
+    ft_per_pf: float
+    fta_per_pf: float
+
+def _team_keys(games: np.ndarray, teams: np.ndarray) -> np.ndarray:
+    return games.astype(np.int64) * (1 << 24) + teams.astype(np.int64)
+
+def _possessions(fga: np.ndarray, fta: np.ndarray, off_reb: np.ndarray, turnovers: np.ndarray) -> np.ndarray:
+    return fga + 0.44 * fta - off_reb + turnovers
+
+def league_context(team: np.ndarray, team_minutes: np.ndarray) -> LeagueContext:
+    totals = {name: float(_col(team, name, TEAM_STATS).sum()) for name in STAT_COLUMNS}
+    possessions = totals["fga"] + 0.44 * totals["fta"] - totals["off_reb"] + totals["turnovers"]
+    return LeagueContext(
+        pace=48.0 * possessions / (team_minutes.sum() / 5.0) if team_minutes.sum() else 0.0,
+        vop=totals["points"] / possessions if possessions else 0.0,
+        factor=(2 / 3) - (0.5 * totals["assists"] / totals["fgm"]) / (2 * totals["fgm"] / totals["ftm"]) if totals["fgm"] and totals["ftm"] else 0.0,
+        drb_pct=(totals["tot_reb"] - totals["off_reb"]) / totals["tot_reb"] if totals["tot_reb"] else 0.0,
+        ft_per_pf=totals["ftm"] / totals["p_fouls"] if totals["p_fouls"] else 0.0,
+        fta_per_pf=totals["fta"] / totals["p_fouls"] if totals["p_fouls"] else 0.0,
+    )
+
+def compute_game_metrics(player: np.ndarray, team: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Métricas por linha de player (mesma ordem), mais minutos e contexto usados no agregado da temporada.
+    """
+    points, fgm, fga = _col(player, "points"), _col(player, "fgm"), _col(player, "fga")
+    ftm, fta, tpm = _col(player, "ftm"), _col(player, "fta"), _col(player, "tpm")
+    off_reb, tot_reb = _col(player, "off_reb"), _col(player, "tot_reb")
+    assists, steals, blocks = _col(player, "assists"), _col(player, "steals"), _col(player, "blocks")
+    turnovers, fouls = _col(player, "turnovers"), _col(player, "p_fouls")
+    minutes = player[:, MINUTES]
+
+    # Linha do time de cada jogador (busca binária nas chaves ordenadas) e do adversário no mesmo jogo
+    team_keys = _team_keys(team[:, 0], team[:, 1])
+    player_keys = _team_keys(player[:, GAME], player[:, TEAM])
+    position = np.minimum(np.searchsorted(team_keys, player_keys), max(len(team_keys) - 1, 0))
+    has_team = (team_keys[position] == player_keys) if len(team_keys) else np.zeros(len(player), dtype=bool)
+    opponent = opponent_rows(team)
+
+    # Minutos do time = soma dos minutos dos seus jogadores no jogo (≈ 240, mais prorrogações)
+    team_minutes = np.bincount(position[has_team], weights=minutes[has_team], minlength=len(team))
+
+    def team_col(name: str) -> np.ndarray:
+        return _col(team, name, TEAM_STATS)
+
+    team_possessions = _possessions(team_col("fga"), team_col("fta"), team_col("off_reb"), team_col("turnovers"))
+    opponent_possessions = np.where(opponent >= 0, team_possessions[opponent], team_possessions)
+    team_pace = ratio(48.0 * (team_possessions + opponent_possessions) / 2.0, team_minutes / 5.0, fill=np.nan)
+    team_used = team_col("fga") + 0.44 * team_col("fta") + team_col("turnovers")
+    team_assist_share = ratio(team_col("assists"), team_col("fgm"))
+    league = league_context(team, team_minutes)
+
+    def team_value(values: np.ndarray) -> np.ndarray:
+        return np.where(has_team, values[position], np.nan) if len(team) else np.full(len(player), np.nan)
+
+    shooting_attempts = fga + 0.44 * fta
+    used = shooting_attempts + turnovers
+    metrics = {
+        "ts_pct": ratio(100.0 * points, 2.0 * shooting_attempts, fill=np.nan),
+        "efg_pct": ratio(100.0 * (fgm + 0.5 * tpm), fga, fill=np.nan),
+        "ast_to_ratio": ratio(assists, turnovers, fill=np.nan),
+        "ast_ratio": ratio(100.0 * assists, used + assists, fill=np.nan),
+        "tov_pct": ratio(100.0 * turnovers, used, fill=np.nan),
+    }
+
+    played = minutes > 0
+    usage_numerator = used * team_value(team_minutes) / 5.0
+    usage_denominator = minutes * team_value(team_used)
+    metrics["usg_pct"] = np.where(played, ratio(100.0 * usage_numerator, np.nan_to_num(usage_denominator), fill=np.nan), np.nan)
+
+    # PER de Hollinger: uPER por minuto, ajustado pelo ritmo do time (aPER) e normalizado para a
+    # média da liga (ponderada por minutos) valer 15
+    assist_share = team_value(team_assist_share)
+    vop, drb = league.vop, league.drb_pct
+    contribution = (
+        tpm
+        + (2 / 3) * assists
+        + (2 - league.factor * assist_share) * fgm
+        + ftm * 0.5 * (1 + (1 - assist_share) + (2 / 3) * assist_share)
+        - vop * turnovers
+        - vop * drb * (fga - fgm)
+        - vop * 0.44 * (0.44 + 0.56 * drb) * (fta - ftm)
+        + vop * (1 - drb) * (tot_reb - off_reb)
+        + vop * drb * off_reb
+        + vop * steals
+        + vop * drb * blocks
+        - fouls * (league.ft_per_pf - 0.44 * league.fta_per_pf * vop)
+    )
+    unadjusted = ratio(contribution, minutes, fill=np.nan)
+    adjusted = unadjusted * ratio(np.full(len(player), league.pace), np.nan_to_num(team_value(team_pace)), fill=np.nan)
+    weighted = played & ~np.isnan(adjusted)
+    league_adjusted = float(np.average(adjusted[weighted], weights=minutes[weighted])) if weighted.any() else 0.0
+    scale = LEAGUE_AVERAGE_PER / league_adjusted if league_adjusted > 0 else np.nan
+    metrics["per"] = adjusted * scale
+
+    metrics["_usage_numerator"] = np.where(played, usage_numerator, np.nan)
+    metrics["_usage_denominator"] = np.where(played, usage_denominator, np.nan)
+    metrics["_adjusted_per"] = adjusted
+    metrics["_per_scale"] = np.full(len(player), scale)
+    return metrics
+
+def compute_season_metrics(player: np.ndarray, game_metrics: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Agregado por jogador (ordenado por player_id): razões dos totais da temporada; USG% e PER
+    ponderados pelos minutos de cada jogo, com o contexto de time daquele jogo.
+    """
+    order = np.lexsort((player[:, GAME], player[:, PLAYER]))
+    sorted_player = player[order]
+    starts = group_starts(sorted_player[:, PLAYER].astype(np.int64))
+    ends = np.append(starts[1:], len(order)) if len(starts) else starts
+    if not len(starts):
+        return {name: np.empty(0) for name in ("player_id", "team_id", "games_played", "minutes", *METRICS)}
+
+    def total(values: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(np.nan_to_num(values[order]), starts)
+
+    minutes = player[:, MINUTES]
+    played = minutes > 0
+    totals = {name: total(_col(player, name)) for name in STAT_COLUMNS}
+    shooting_attempts = totals["fga"] + 0.44 * totals["fta"]
+    used = shooting_attempts + totals["turnovers"]
+    valid_per = played & ~np.isnan(game_metrics["_adjusted_per"])
+    per_minutes = total(np.where(valid_per, minutes, 0.0))
+    scale = game_metrics["_per_scale"][0] if len(minutes) else np.nan
+
+    return {
+        "player_id": sorted_player[starts, PLAYER],
+        "team_id": sorted_player[ends - 1, TEAM],
+        "games_played": total(played.astype(np.float64)),
+        "minutes": total(minutes),
+        "ts_pct": ratio(100.0 * totals["points"], 2.0 * shooting_attempts, fill=np.nan),
+        "efg_pct": ratio(100.0 * (totals["fgm"] + 0.5 * totals["tpm"]), totals["fga"], fill=np.nan),
+        "usg_pct": ratio(100.0 * total(game_metrics["_usage_numerator"]), total(game_metrics["_usage_denominator"]), fill=np.nan),
+        "ast_to_ratio": ratio(totals["assists"], totals["turnovers"], fill=np.nan),
+        "ast_ratio": ratio(100.0 * totals["assists"], used + totals["assists"], fill=np.nan),
+        "tov_pct": ratio(100.0 * totals["turnovers"], used, fill=np.nan),
+        "per": ratio(total(np.where(valid_per, game_metrics["_adjusted_per"] * minutes, 0.0)), per_minutes, fill=np.nan) * scale,
+    }
+
+def source_version(db: Session, season: int) -> Dict[str, Any]:
+    return {
+        "format": METRICS_FORMAT,
+        **{table.name: season_versions(db, table, [season]).get(season, {}) for table in (PlayerStatistics.__table__, TeamStatistics.__table__)},
+    }
+
+def _stored_version(db: Session, season: int) -> Optional[Dict[str, Any]]:
+    table = AnalyticsRefresh.__table__
+    return db.execute(
+        select(table.c.source_version).where(table.c.name == REFRESH_NAME, table.c.season == season)
+    ).scalar_one_or_none()
+
+def refresh_advanced_metrics(db: Session, seasons: Iterable[int], force: bool = False) -> Dict[int, Dict[str, int]]:
+    """
+    Recalcula e regrava as métricas avançadas das temporadas informadas (uma transação por temporada).
+    Temporadas sem mudança nas tabelas de origem desde a última gravação ficam como estão.
+    """
+    refreshed: Dict[int, Dict[str, int]] = {}
+    for season in sorted(set(seasons)):
+        start = time.perf_counter()
+        version = source_version(db, season)
+        if not force and _stored_version(db, season) == version:
+            refreshed[season] = {"player_game_advanced": 0, "player_season_advanced": 0}
+            logger.info(f"Métricas avançadas da temporada {season} sem mudança nas tabelas de origem.")
+            continue
+        player = load_season_matrix(db, season)
+        team = load_team_matrix(db, season)
+        game_metrics = compute_game_metrics(player, team)
+        season_metrics = compute_season_metrics(player, game_metrics)
+
+        played = player[:, MINUTES] > 0
+        game_rows = np.column_stack([
+            np.full(int(played.sum()), season),
+            player[played][:, [PLAYER, GAME, TEAM, MINUTES]],
+            *(game_metrics[name][played] for name in METRICS),
+        ])
+        # Jogadores só com jogos sem minutos (DNP) não entram no agregado
+        active = season_metrics["games_played"] > 0
+        season_rows = np.column_stack([
+            np.full(int(active.sum()), season),
+            *(season_metrics[name][active] for name in SEASON_COLUMNS[1:]),
+        ])
+
+        ensure_season_partition(db, PlayerGameAdvanced.__tablename__, season)
+        games_written = replace_season_rows(
+            db, PlayerGameAdvanced.__table__, season, GAME_COLUMNS, game_rows,
+            integer_columns=("season", "player_id", "game_id", "team_id"),
+        )
+        players_written = replace_season_rows(
+            db, PlayerSeasonAdvanced.__table__, season, SEASON_COLUMNS, season_rows,
+            integer_columns=("season", "player_id", "team_id", "games_played"),
+        )
+        upsert_bulk(db=db, model=AnalyticsRefresh, payloads=[{"name": REFRESH_NAME, "season": season, "source_version": version}],
+                    unique_key=["name", "season"])
+        db.commit()
+        # As respostas da API com estas métricas foram invalidadas na ingestão, antes do recálculo
+        invalidate_cache([season_tag(season)])
+        refreshed[season] = {"player_game_advanced": games_written, "player_season_advanced": players_written}
+        logger.info(f"Métricas avançadas da temporada {season} gravadas em {time.perf_counter() - start:.2f}s: {refreshed[season]}")
+    return refreshed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recalcula as métricas avançadas de jogadores (TS%, eFG%, USG%, PER...).")
+    parser.add_argument("--season", type=int, action="append", required=True, help="Temporada (pode repetir).")
+    parser.add_argument("--force", action="store_true", help="Regrava mesmo sem mudança nas tabelas de origem.")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        refreshed = refresh_advanced_metrics(db, args.season, force=args.force)
+    finally:
+        db.close()
+    print(json.dumps(refreshed, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
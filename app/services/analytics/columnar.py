@@ -0,0 +1,81 @@
+import io
+from typing import Sequence
+import numpy as np
+from sqlalchemy import Select, Table, delete
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+# Entrada e saída em lote dos analytics via COPY: o texto do PostgreSQL vai direto para/de matrizes
+# NumPy, sem montar uma tupla Python por linha (na leitura, ~6x mais rápido que db.execute().all()).
+
+def load_matrix(db: Session, stmt: Select) -> np.ndarray:
+    """
+    Executa a consulta (só colunas numéricas e sem nulos) e devolve uma matriz float64.
+    """
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    buffer = io.StringIO()
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY ({sql}) TO STDOUT", buffer)
+    finally:
+        cursor.close()
+    if not buffer.tell():
+        return np.empty((0, len(stmt.selected_columns)), dtype=np.float64)
+    buffer.seek(0)
+    return np.loadtxt(buffer, dtype=np.float64, delimiter="\t", ndmin=2)
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    """
+    Índice da primeira linha de cada grupo em keys já ordenado (para np.add.reduceat).
+    """
+    if not len(keys):
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(np.diff(keys, prepend=keys[:1] - 1))
+
+def group_first_row(starts: np.ndarray, length: int) -> np.ndarray:
+    """
+    Para cada linha, o índice da primeira linha do seu grupo (inverso de group_starts).
+    """
+    return np.repeat(starts, np.diff(np.append(starts, length)))
+
+def ratio(numerator: np.ndarray, denominator: np.ndarray, fill: float = 0.0) -> np.ndarray:
+    out = np.full(np.broadcast(numerator, denominator).shape, fill, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+def replace_season_rows(db: Session, table: Table, season: int, columns: Sequence[str], matrix: np.ndarray, integer_columns: Sequence[str] = ()) -> int:
+    """
+    Substitui as linhas da temporada numa tabela derivada: DELETE + COPY FROM STDIN na transação
+    do chamador. Leitores continuam vendo a versão anterior até o commit (MVCC); NaN vira NULL.
+    """
+    db.execute(delete(table).where(table.c.season == season))
+    return copy_rows(db, table, columns, matrix, integer_columns)
+
+def copy_rows(db: Session, table: Table, columns: Sequence[str], matrix: np.ndarray, integer_columns: Sequence[str] = ()) -> int:
+    """
+    Insere as linhas da matriz com COPY FROM STDIN na transação do chamador; NaN vira NULL.
+    """
+    if not len(matrix):
+        return 0
+    formats = ["%d" if name in integer_columns else "%.4f" for name in columns]
+    buffer = io.StringIO()
+    np.savetxt(buffer, matrix, fmt=formats, delimiter="\t")
+    buffer = io.StringIO(buffer.getvalue().replace("nan", "\\N"))
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+    return len(matrix)
+
+def rolling_sum(values: np.ndarray, starts: np.ndarray, window: int) -> np.ndarray:
+    """
+    Soma móvel das últimas `window` linhas (inclusive) dentro de cada grupo, com linhas já ordenadas
+    por grupo: diferença de somas de prefixo, sem laço por grupo. values pode ter várias colunas.
+    """
+    if not len(values):
+        return np.zeros_like(values, dtype=np.float64)
+    prefix = np.concatenate([np.zeros((1, *values.shape[1:])), np.cumsum(values, axis=0, dtype=np.float64)])
+    rows = np.arange(len(values))
+    first = np.maximum(rows - window + 1, group_first_row(starts, len(values)))
+    return prefix[rows + 1] - prefix[first]
@@ -0,0 +1,275 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import delete, exists, extract, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.response_cache import invalidate_cache, season_tag
+from app.models.game_models import FINISHED_GAME_STATUSES, Game, GameEloRating
+from app.models.team_models import TeamEloRating
+from app.repository.ingestion_repository import upsert_bulk
+from app.services.analytics.columnar import copy_rows, load_matrix
+
+logging.basicConfig(level=logging.INFO)
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Elo dos times a partir de games.home_score/visitor_score, na ordem (data, source_id) dos jogos.
+# Expectativa com vantagem de mando de quadra, multiplicador de margem de vitória (cresce com a margem
+# e diminui quando o favorito vence, para não inflar os ratings) e regressão à média na virada de temporada.
+# O estado de cada time fica num vetor indexado pela posição do teams.source_id no array ordenado de times;
+# a ingestão diária aplica só os jogos encerrados que ainda não estão em game_elo_ratings, e --full refaz
+# o histórico inteiro de uma vez (uma consulta COPY, um laço sobre arrays e um COPY de volta).
+# Uso: python -m app.services.analytics.elo_ratings [--full] [--top 10]
+
+# Colunas da matriz de jogos
+GAME, SEASON, DATE, HOME, VISITOR, HOME_SCORE, VISITOR_SCORE = range(7)
+
+HISTORY_COLUMNS = (
+    "game_id", "season", "sequence", "home_team_id", "visitor_team_id",
+    "home_elo_pre", "visitor_elo_pre", "home_win_prob", "home_elo_post", "visitor_elo_post",
+)
+HISTORY_INTEGER_COLUMNS = HISTORY_COLUMNS[:5]
+
+@dataclass
+class EloState:
+    """
+    Estado por time, alinhado com team_ids (ordenado): Elo atual, temporada e último jogo aplicado.
+    """
+    team_ids: np.ndarray
+    elo: np.ndarray
+    seasons: np.ndarray
+    games_played: np.ndarray
+    last_game_ids: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "EloState":
+        return cls(*(np.empty(0, dtype=dtype) for dtype in (np.int64, np.float64, np.int64, np.int64, np.int64)))
+
+    def with_teams(self, team_ids: np.ndarray) -> "EloState":
+        """
+        Estado ampliado com os times ainda sem jogos aplicados (Elo inicial).
+        """
+        merged = np.union1d(self.team_ids, team_ids).astype(np.int64)
+        positions = np.searchsorted(merged, self.team_ids)
+        state = EloState(
+            team_ids=merged,
+            elo=np.full(len(merged), settings.elo_initial),
+            seasons=np.zeros(len(merged), dtype=np.int64),
+            games_played=np.zeros(len(merged), dtype=np.int64),
+            last_game_ids=np.zeros(len(merged), dtype=np.int64),
+        )
+        state.elo[positions] = self.elo
+        state.seasons[positions] = self.seasons
+        state.games_played[positions] = self.games_played
+        state.last_game_ids[positions] = self.last_game_ids
+        return state
+
+def win_probability(home_elo: np.ndarray, visitor_elo: np.ndarray) -> np.ndarray:
+    """
+    Probabilidade de vitória do mandante, já com a vantagem de mando de quadra.
+    """
+    return 1.0 / (1.0 + 10.0 ** (-(home_elo + settings.elo_home_advantage - visitor_elo) / 400.0))
+
+def load_games(db: Session, only_new: bool = False) -> np.ndarray:
+    """
+    Jogos encerrados com placar, ordenados por (data, source_id). only_new deixa de fora os já aplicados.
+    """
+    games = Game.__table__
+    history = GameEloRating.__table__
+    stmt = select(
+        games.c.source_id,
+        games.c.season,
+        func.coalesce(extract("epoch", games.c.game_date), 0),
+        games.c.home_team_id,
+        games.c.visitor_team_id,
+        games.c.home_score,
+        games.c.visitor_score,
+    ).where(
+        games.c.status.in_(FINISHED_GAME_STATUSES),
+        games.c.home_score.is_not(None),
+        games.c.visitor_score.is_not(None),
+    )
+    if only_new:
+        stmt = stmt.where(~exists().where(history.c.game_id == games.c.source_id))
+    matrix = load_matrix(db, stmt)
+    return matrix[np.lexsort((matrix[:, GAME], matrix[:, DATE]))]
+
+def load_state(db: Session) -> EloState:
+    table = TeamEloRating.__table__
+    rows = db.execute(select(
+        table.c.team_id, table.c.elo, table.c.season, table.c.games_played, func.coalesce(table.c.last_game_id, 0),
+    ).order_by(table.c.team_id)).all()
+    if not rows:
+        return EloState.empty()
+    columns = list(zip(*rows))
+    return EloState(
+        team_ids=np.array(columns[0], dtype=np.int64),
+        elo=np.array(columns[1], dtype=np.float64),
+        seasons=np.array(columns[2], dtype=np.int64),
+        games_played=np.array(columns[3], dtype=np.int64),
+        last_game_ids=np.array(columns[4], dtype=np.int64),
+    )
+
+def replay(games: np.ndarray, state: EloState, first_sequence: int = 1) -> Tuple[np.ndarray, EloState]:
+    """
+    Aplica os jogos (já ordenados) sobre o estado e devolve o histórico (colunas de HISTORY_COLUMNS)
+    e o novo estado. Cada jogo depende do Elo deixado pelo anterior, então o laço é sequencial; ele roda
+    sobre listas Python de floats indexadas pela posição do time, sem consulta nem objeto por jogo.
+    """
+    state = state.with_teams(np.concatenate([games[:, HOME], games[:, VISITOR]]))
+    home = np.searchsorted(state.team_ids, games[:, HOME].astype(np.int64)).tolist()
+    visitor = np.searchsorted(state.team_ids, games[:, VISITOR].astype(np.int64)).tolist()
+    seasons = games[:, SEASON].astype(np.int64).tolist()
+    margins = (games[:, HOME_SCORE] - games[:, VISITOR_SCORE]).tolist()
+
+    elo = state.elo.tolist()
+    team_seasons = state.seasons.tolist()
+    mean = settings.elo_initial
+    carryover = settings.elo_season_carryover
+    k_factor = settings.elo_k_factor
+    home_advantage = settings.elo_home_advantage
+
+    output: List[Tuple[float, ...]] = []
+    for index in range(len(games)):
+        h, v, season = home[index], visitor[index], seasons[index]
+        # Virada de temporada: o time regride parte da distância até a média
+        if team_seasons[h] != season:
+            if team_seasons[h]:
+                elo[h] = mean + carryover * (elo[h] - mean)
+            team_seasons[h] = season
+        if team_seasons[v] != season:
+            if team_seasons[v]:
+                elo[v] = mean + carryover * (elo[v] - mean)
+            team_seasons[v] = season
+
+        home_elo, visitor_elo = elo[h], elo[v]
+        difference = home_elo + home_advantage - visitor_elo
+        expected = 1.0 / (1.0 + 10.0 ** (-difference / 400.0))
+        margin = margins[index]
+        if margin > 0:
+            result, winner_difference = 1.0, difference
+        elif margin < 0:
+            result, winner_difference = 0.0, -difference
+        else:
+            result, winner_difference = 0.5, 0.0
+        # Multiplicador de margem de vitória (FiveThirtyEight): cresce com a margem e é amortecido pela vantagem do vencedor
+        multiplier = (abs(margin) + 3.0) ** 0.8 / (7.5 + 0.006 * winner_difference)
+        shift = k_factor * multiplier * (result - expected)
+        elo[h] = home_elo + shift
+        elo[v] = visitor_elo - shift
+        output.append((home_elo, visitor_elo, expected, elo[h], elo[v]))
+
+    history = np.empty((len(games), len(HISTORY_COLUMNS)), dtype=np.float64)
+    if len(games):
+        history[:, 0] = games[:, GAME]
+        history[:, 1] = games[:, SEASON]
+        history[:, 2] = np.arange(first_sequence, first_sequence + len(games))
+        history[:, 3] = games[:, HOME]
+        history[:, 4] = games[:, VISITOR]
+        history[:, 5:] = np.array(output)
+
+        played = np.bincount(home + visitor, minlength=len(state.team_ids))
+        state.games_played += played
+        # Último jogo aplicado de cada time: a última ocorrência dele como mandante ou visitante
+        last = np.full(len(state.team_ids), -1)
+        rows = np.arange(len(games))
+        np.maximum.at(last, home, rows)
+        np.maximum.at(last, visitor, rows)
+        touched = last >= 0
+        state.last_game_ids[touched] = games[last[touched], GAME].astype(np.int64)
+    state.elo = np.array(elo, dtype=np.float64)
+    state.seasons = np.array(team_seasons, dtype=np.int64)
+    return history, state
+
+def _needs_rebuild(db: Session, games: np.ndarray) -> bool:
+    # Um jogo novo anterior ao último aplicado (carga histórica atrasada) muda todo o Elo dali em diante
+    if not len(games):
+        return False
+    history = GameEloRating.__table__
+    table = Game.__table__
+    last_date = db.execute(
+        select(func.coalesce(extract("epoch", table.c.game_date), 0))
+        .select_from(history.join(table, table.c.source_id == history.c.game_id))
+        .order_by(history.c.sequence.desc())
+        .limit(1)
+    ).scalar()
+    return last_date is not None and games[0, DATE] < float(last_date)
+
+def refresh_elo_ratings(db: Session, full: bool = False) -> Dict[str, Any]:
+    """
+    Aplica os jogos encerrados ainda fora de game_elo_ratings a partir do estado salvo em team_elo_ratings.
+    full=True (ou um jogo novo anterior ao último aplicado) refaz o histórico inteiro.
+    """
+    start = time.perf_counter()
+    history_table = GameEloRating.__table__
+    if not full:
+        games = load_games(db, only_new=True)
+        if _needs_rebuild(db, games):
+            logger.info("Jogo novo anterior ao último aplicado no Elo; refazendo o histórico completo.")
+            full = True
+
+    if full:
+        games = load_games(db)
+        state, first_sequence = EloState.empty(), 1
+        db.execute(delete(history_table))
+        db.execute(delete(TeamEloRating.__table__))
+    else:
+        state = load_state(db)
+        first_sequence = (db.execute(select(func.max(history_table.c.sequence))).scalar() or 0) + 1
+
+    loaded = time.perf_counter()
+    history, state = replay(games, state, first_sequence)
+    computed = time.perf_counter()
+
+    copy_rows(db, history_table, HISTORY_COLUMNS, history, HISTORY_INTEGER_COLUMNS)
+    touched = np.isin(state.team_ids, history[:, 3:5]) if not full else np.ones(len(state.team_ids), dtype=bool)
+    payloads = [
+        {
+            "team_id": int(state.team_ids[index]),
+            "elo": float(state.elo[index]),
+            "season": int(state.seasons[index]),
+            "games_played": int(state.games_played[index]),
+            "last_game_id": int(state.last_game_ids[index]) or None,
+        }
+        for index in np.flatnonzero(touched)
+    ]
+    upsert_bulk(db=db, model=TeamEloRating, payloads=payloads, unique_key="team_id")
+    db.commit()
+
+    seasons = sorted({int(season) for season in np.unique(history[:, 1])})
+    if seasons:
+        invalidate_cache([season_tag(season) for season in seasons])
+    logger.info(
+        f"Elo: {len(history)} jogos aplicados ({'histórico completo' if full else 'incremental'}), {len(payloads)} times; "
+        f"consulta {loaded - start:.2f}s, cálculo {computed - loaded:.2f}s, total {time.perf_counter() - start:.2f}s."
+    )
+    return {"full": full, "games": len(history), "teams": len(payloads), "seasons": seasons}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Atualiza o Elo dos times com os jogos encerrados.")
+    parser.add_argument("--full", action="store_true", help="Refaz o histórico inteiro em vez de aplicar só os jogos novos.")
+    parser.add_argument("--top", type=int, default=10, help="Times exibidos, por Elo atual.")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        result = refresh_elo_ratings(db, full=args.full)
+        state = load_state(db)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+    for index in np.argsort(-state.elo, kind="stable")[:args.top]:
+        print(f"  time {state.team_ids[index]:>6}  Elo {state.elo[index]:7.1f}  temporada {state.seasons[index]}  "
+              f"{state.games_played[index]:>5} jogos")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.player_models import Player, PlayerLeague, PlayerSeasonAdvanced, PlayerStatistics
+from app.services.analytics.player_analytics import STAT_COLUMNS, get_season_table
+from app.services.analytics.season_cache import expire_analytics, season_cache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Quadros de líderes por (temporada, estatística, filtro) servidos da memória. Na construção da temporada
+# cada estatística é ordenada uma única vez (argsort decrescente); o top-N de um filtro (posição e mínimo
+# de jogos) é o prefixo dessa ordem que passa na máscara do filtro, e as linhas prontas ficam guardadas.
+# Os mínimos de jogos de leaderboard_min_games são montados na construção; outros, no primeiro pedido.
+# A temporada é reconstruída só quando a ingestão muda os dados dela (ver season_cache).
+# Benchmark da reconstrução a frio: python -m app.benchmarks.leaderboards --season 2024
+
+# Posição cadastrada na liga principal; "G-F" conta como G e como F
+POSITION_LEAGUE = "standard"
+POSITIONS = {"G": 1, "F": 2, "C": 4}
+
+ADVANCED_STATS = ("ts_pct", "efg_pct", "usg_pct", "per", "ast_to_ratio")
+SHOOTING_STATS = ("fgp", "tpp", "ftp")
+# Estatísticas por jogo (mesmos nomes de STAT_COLUMNS), aproveitamentos e métricas avançadas da temporada
+LEADERBOARD_STATS = ("minutes", *STAT_COLUMNS, *SHOOTING_STATS, *ADVANCED_STATS)
+
+BoardKey = Tuple[str, Optional[str], int]
+
+@dataclass
+class SeasonLeaderboards:
+    season: int
+    version: int
+    player_ids: np.ndarray
+    team_ids: np.ndarray
+    games_played: np.ndarray
+    positions: np.ndarray
+    names: List[str]
+    values: Dict[str, np.ndarray]
+    # Ordem decrescente de cada estatística (NaN no fim)
+    orders: Dict[str, np.ndarray]
+    boards: Dict[BoardKey, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    def board(self, stat: str, position: Optional[str] = None, min_games: int = 1) -> List[Dict[str, Any]]:
+        """
+        Top-N do filtro; depois da primeira montagem é uma consulta ao dicionário.
+        """
+        key = (stat, position, min_games)
+        rows = self.boards.get(key)
+        if rows is None:
+            rows = self.boards.setdefault(key, self._build_board(stat, position, min_games))
+        return rows
+
+    def _build_board(self, stat: str, position: Optional[str], min_games: int) -> List[Dict[str, Any]]:
+        values = self.values[stat]
+        mask = (self.games_played >= max(min_games, 1)) & ~np.isnan(values)
+        if position is not None:
+            mask &= (self.positions & POSITIONS[position]) > 0
+        order = self.orders[stat]
+        selected = order[mask[order]][:settings.leaderboard_size]
+
+        rows: List[Dict[str, Any]] = []
+        previous, rank = None, 0
+        for place, index in enumerate(selected.tolist(), start=1):
+            value = round(float(values[index]), 2)
+            # Empates dividem a posição (1, 2, 2, 4)
+            if value != previous:
+                rank, previous = place, value
+            rows.append({
+                "rank": rank,
+                "player_id": int(self.player_ids[index]),
+                "name": self.names[index],
+                "team_id": int(self.team_ids[index]),
+                "games_played": int(self.games_played[index]),
+                "value": value,
+            })
+        return rows
+
+def _align(player_ids: np.ndarray, keys: np.ndarray, values: np.ndarray, fill: Any) -> np.ndarray:
+    # Valores de (keys, values) na ordem de player_ids; jogadores ausentes recebem fill
+    out = np.full(len(player_ids), fill, dtype=values.dtype if len(values) else np.float64)
+    if len(keys):
+        order = np.argsort(keys)
+        positions = np.clip(np.searchsorted(keys[order], player_ids), 0, len(keys) - 1)
+        found = keys[order][positions] == player_ids
+        out[found] = values[order][positions[found]]
+    return out
+
+def _load_advanced(db: Session, season: int, player_ids: np.ndarray) -> Dict[str, np.ndarray]:
+    table = PlayerSeasonAdvanced.__table__
+    rows = db.execute(select(table.c.player_id, *(table.c[name] for name in ADVANCED_STATS)).where(table.c.season == season)).all()
+    matrix = np.array([[np.nan if value is None else value for value in row] for row in rows], dtype=np.float64).reshape(-1, len(ADVANCED_STATS) + 1)
+    keys = matrix[:, 0].astype(np.int64)
+    return {name: _align(player_ids, keys, matrix[:, position + 1], np.nan) for position, name in enumerate(ADVANCED_STATS)}
+
+def _load_positions(db: Session, player_ids: np.ndarray) -> np.ndarray:
+    table = PlayerLeague.__table__
+    ids: List[int] = []
+    masks: List[int] = []
+    for player_id, position in db.execute(select(table.c.player_id, table.c.position).where(table.c.league_name == POSITION_LEAGUE)):
+        ids.append(player_id)
+        masks.append(sum(POSITIONS.get(part.strip().upper()[:1], 0) for part in set((position or "").split("-"))))
+    return _align(player_ids, np.array(ids, dtype=np.int64), np.array(masks, dtype=np.int64), 0)
+
+def _load_names(db: Session, player_ids: np.ndarray) -> List[str]:
+    table = Player.__table__
+    names = {
+        source_id: f"{first_name} {last_name}".strip()
+        for source_id, first_name, last_name in db.execute(
+            select(table.c.source_id, table.c.first_name, table.c.last_name).where(table.c.source_id.in_(player_ids.tolist()))
+        )
+    }
+    return [names.get(player_id, "") for player_id in player_ids.tolist()]
+
+def build_leaderboards(db: Session, season: int) -> SeasonLeaderboards:
+    table = get_season_table(db, season)
+    active = table.games_played > 0
+    player_ids = table.player_ids[active]
+
+    values: Dict[str, np.ndarray] = {"minutes": (table.minutes / np.maximum(table.games_played, 1))[active]}
+    values.update({name: table.stat(name, "per_game")[active] for name in STAT_COLUMNS})
+    values.update({name: table.stat(name)[active] for name in SHOOTING_STATS})
+    values.update(_load_advanced(db, season, player_ids))
+
+    orders = {}
+    for name, column in values.items():
+        # Decrescente, desempate por player_id; NaN vai para o fim
+        orders[name] = np.lexsort((player_ids, -np.nan_to_num(column, nan=-np.inf)))
+
+    leaderboards = SeasonLeaderboards(
+        season=season,
+        version=time.time_ns(),
+        player_ids=player_ids,
+        team_ids=table.team_ids[active],
+        games_played=table.games_played[active],
+        positions=_load_positions(db, player_ids),
+        names=_load_names(db, player_ids),
+        values=values,
+        orders=orders,
+    )
+    for stat in LEADERBOARD_STATS:
+        for position in (None, *POSITIONS):
+            for min_games in settings.leaderboard_min_games:
+                leaderboards.board(stat, position, min_games)
+    return leaderboards
+
+# As posições (player_league) não têm temporada: mudam junto com a próxima reconstrução da temporada
+season_leaderboards = season_cache(
+    "leaderboards", [PlayerStatistics.__table__, PlayerSeasonAdvanced.__table__], build_leaderboards
+)
+
+def get_leaderboards(db: Session, season: int) -> SeasonLeaderboards:
+    return season_leaderboards.get(db, season)
+
+def warm_leaderboards(db: Session, seasons: Iterable[int]) -> None:
+    """
+    Reconstrói as temporadas recém-atualizadas para que o primeiro pedido já encontre os quadros prontos.
+    A reconstrução é da temporada inteira e só acontece se as tabelas de origem mudaram.
+    """
+    seasons = sorted(set(seasons))
+    # Também vale para a tabela da temporada (player_season_tables) da qual os quadros são montados
+    expire_analytics(seasons)
+    for season in seasons:
+        get_leaderboards(db, season)
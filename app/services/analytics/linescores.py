@@ -0,0 +1,233 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import create_read_session
+from app.models.game_models import FINISHED_GAME_STATUSES, Game
+from app.services.analytics.columnar import group_starts, load_matrix, ratio
+from app.services.analytics.season_cache import season_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Analytics por período a partir de games.home_linescore/visitor_linescore. Os pontos de cada período
+# saem do JSON já no SELECT (->> por posição), numa matriz densa (jogos x MAX_PERIODS) completada com
+# zeros; cada jogo entra duas vezes, uma na perspectiva de cada time, e todos os contadores (pontos por
+# quarto, viradas, vantagens perdidas, jogos equilibrados, prorrogações) somam-se por time num único
+# np.add.reduceat. O resultado fica no cache por temporada, reconstruído quando os jogos mudam.
+# Jogo equilibrado ("clutch") é aproximado pelo placar ao fim do 3º quarto: sem play-by-play, não há
+# como medir os últimos 5 minutos.
+# Uso: python -m app.services.analytics.linescores --season 2024 [--team 1]
+
+# 4 quartos + até 6 prorrogações
+REGULATION_PERIODS = 4
+MAX_PERIODS = 10
+# Diferença máxima ao fim do 3º quarto para o jogo contar como equilibrado
+CLUTCH_MARGIN = 5
+
+# Colunas da matriz lida
+GAME, HOME, VISITOR, PERIODS = range(4)
+HOME_POINTS = 4
+VISITOR_POINTS = HOME_POINTS + MAX_PERIODS
+
+# Contadores somados por time (perspectiva do time em cada jogo)
+COUNTERS = (
+    "games", "wins",
+    *(f"q{period}_points" for period in range(1, REGULATION_PERIODS + 1)),
+    *(f"q{period}_allowed" for period in range(1, REGULATION_PERIODS + 1)),
+    "trailing_at_half", "wins_trailing_at_half",
+    "trailing_after_q3", "wins_trailing_after_q3",
+    "leading_after_q3", "losses_leading_after_q3",
+    "clutch_games", "clutch_wins",
+    "overtime_games", "overtime_wins", "overtime_periods", "overtime_points", "overtime_allowed",
+)
+COUNTER_INDEX = {name: position for position, name in enumerate(COUNTERS)}
+
+def load_linescore_matrix(db: Session, season: int) -> np.ndarray:
+    """
+    Jogos encerrados com os dois linescores completos (ao menos 4 períodos), ordenados por source_id.
+    """
+    games = Game.__table__
+    periods = func.least(func.json_array_length(games.c.home_linescore), func.json_array_length(games.c.visitor_linescore))
+    return load_matrix(db, select(
+        games.c.source_id,
+        games.c.home_team_id,
+        games.c.visitor_team_id,
+        func.least(periods, MAX_PERIODS),
+        *(func.coalesce(games.c.home_linescore[period].as_integer(), 0) for period in range(MAX_PERIODS)),
+        *(func.coalesce(games.c.visitor_linescore[period].as_integer(), 0) for period in range(MAX_PERIODS)),
+    ).where(
+        games.c.season == season,
+        games.c.status.in_(FINISHED_GAME_STATUSES),
+        # JSON null (não só NULL do SQL) fica de fora
+        func.json_typeof(games.c.home_linescore) == "array",
+        func.json_typeof(games.c.visitor_linescore) == "array",
+        periods >= REGULATION_PERIODS,
+    ).order_by(games.c.source_id)).astype(np.int64)
+
+def compute_counters(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    team_ids (ordenados) e a matriz (times x COUNTERS) de contadores somados.
+    """
+    home_points = matrix[:, HOME_POINTS:HOME_POINTS + MAX_PERIODS]
+    visitor_points = matrix[:, VISITOR_POINTS:VISITOR_POINTS + MAX_PERIODS]
+    # Cada jogo duas vezes: mandante contra visitante e visitante contra mandante
+    team_ids = np.concatenate([matrix[:, HOME], matrix[:, VISITOR]])
+    scored = np.vstack([home_points, visitor_points])
+    allowed = np.vstack([visitor_points, home_points])
+    periods = np.concatenate([matrix[:, PERIODS], matrix[:, PERIODS]])
+
+    # Vantagem acumulada ao fim de cada período (os zeros de preenchimento não mudam o placar)
+    margin = np.cumsum(scored - allowed, axis=1)
+    won = margin[:, -1] > 0
+    half, third = margin[:, 1], margin[:, 2]
+    overtime = periods > REGULATION_PERIODS
+    clutch = np.abs(third) <= CLUTCH_MARGIN
+
+    features = np.column_stack([
+        np.ones(len(team_ids), dtype=np.int64), won,
+        scored[:, :REGULATION_PERIODS], allowed[:, :REGULATION_PERIODS],
+        half < 0, (half < 0) & won,
+        third < 0, (third < 0) & won,
+        third > 0, (third > 0) & ~won,
+        clutch, clutch & won,
+        overtime, overtime & won, np.maximum(periods - REGULATION_PERIODS, 0),
+        scored[:, REGULATION_PERIODS:].sum(axis=1), allowed[:, REGULATION_PERIODS:].sum(axis=1),
+    ]).astype(np.int64)
+
+    order = np.argsort(team_ids, kind="stable")
+    starts = group_starts(team_ids[order])
+    if not len(starts):
+        return {"team_ids": np.empty(0, dtype=np.int64), "counters": np.empty((0, len(COUNTERS)), dtype=np.int64)}
+    return {"team_ids": team_ids[order][starts], "counters": np.add.reduceat(features[order], starts, axis=0)}
+
+def _rate(numerator: int, denominator: int) -> Optional[float]:
+    return round(numerator / denominator, 3) if denominator else None
+
+def team_summary(season: int, team_id: int, row: np.ndarray) -> Dict[str, Any]:
+    counts = {name: int(row[position]) for position, name in enumerate(COUNTERS)}
+    games = counts["games"]
+    quarters = []
+    for period in range(1, REGULATION_PERIODS + 1):
+        points, allowed = counts[f"q{period}_points"], counts[f"q{period}_allowed"]
+        quarters.append({
+            "period": period,
+            "points": round(points / games, 2),
+            "allowed": round(allowed / games, 2),
+            "differential": round((points - allowed) / games, 2),
+        })
+    return {
+        "team_id": team_id,
+        "season": season,
+        "games": games,
+        "wins": counts["wins"],
+        "losses": games - counts["wins"],
+        "quarters": quarters,
+        "comebacks": {
+            "trailing_at_half": counts["trailing_at_half"],
+            "wins_trailing_at_half": counts["wins_trailing_at_half"],
+            "rate_at_half": _rate(counts["wins_trailing_at_half"], counts["trailing_at_half"]),
+            "trailing_after_q3": counts["trailing_after_q3"],
+            "wins_trailing_after_q3": counts["wins_trailing_after_q3"],
+            "rate_after_q3": _rate(counts["wins_trailing_after_q3"], counts["trailing_after_q3"]),
+            "leading_after_q3": counts["leading_after_q3"],
+            "blown_leads": counts["losses_leading_after_q3"],
+            "blown_lead_rate": _rate(counts["losses_leading_after_q3"], counts["leading_after_q3"]),
+        },
+        "clutch": {
+            "margin": CLUTCH_MARGIN,
+            "games": counts["clutch_games"],
+            "wins": counts["clutch_wins"],
+            "losses": counts["clutch_games"] - counts["clutch_wins"],
+            "win_pct": _rate(counts["clutch_wins"], counts["clutch_games"]),
+        },
+        "overtime": {
+            "games": counts["overtime_games"],
+            "wins": counts["overtime_wins"],
+            "losses": counts["overtime_games"] - counts["overtime_wins"],
+            "rate": _rate(counts["overtime_games"], games),
+            "periods": counts["overtime_periods"],
+            "differential_per_period": round((counts["overtime_points"] - counts["overtime_allowed"]) / counts["overtime_periods"], 2)
+            if counts["overtime_periods"] else None,
+        },
+    }
+
+@dataclass
+class SeasonLinescores:
+    season: int
+    version: int
+    games: int
+    overtime_games: int
+    # Saldo do mandante somado por quarto (vantagem de jogar em casa em cada período)
+    home_differential: np.ndarray
+    team_ids: np.ndarray
+    counters: np.ndarray
+    teams: Dict[int, Dict[str, Any]]
+
+    def league(self) -> Dict[str, Any]:
+        totals = self.counters.sum(axis=0)
+        return {
+            "season": self.season,
+            "games": self.games,
+            "overtime_games": self.overtime_games,
+            "overtime_rate": _rate(self.overtime_games, self.games),
+            # Cada jogo com vantagem ao fim do 3º quarto tem exatamente um time atrás
+            "comeback_rate_after_q3": _rate(int(totals[COUNTER_INDEX["wins_trailing_after_q3"]]), int(totals[COUNTER_INDEX["trailing_after_q3"]])),
+            "home_quarter_differential": [round(float(value), 2) + 0.0 for value in ratio(self.home_differential, np.full(REGULATION_PERIODS, self.games))],
+        }
+
+def build_linescores(db: Session, season: int) -> SeasonLinescores:
+    matrix = load_linescore_matrix(db, season)
+    computed = compute_counters(matrix)
+    return SeasonLinescores(
+        season=season,
+        version=time.time_ns(),
+        games=len(matrix),
+        overtime_games=int(np.count_nonzero(matrix[:, PERIODS] > REGULATION_PERIODS)),
+        home_differential=(matrix[:, HOME_POINTS:HOME_POINTS + REGULATION_PERIODS]
+                           - matrix[:, VISITOR_POINTS:VISITOR_POINTS + REGULATION_PERIODS]).sum(axis=0),
+        team_ids=computed["team_ids"],
+        counters=computed["counters"],
+        teams={
+            int(team_id): team_summary(season, int(team_id), row)
+            for team_id, row in zip(computed["team_ids"].tolist(), computed["counters"])
+        },
+    )
+
+season_linescores = season_cache("linescores", [Game.__table__], build_linescores)
+
+def get_linescores(db: Session, season: int) -> SeasonLinescores:
+    return season_linescores.get(db, season)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analytics por período (linescores) de uma temporada.")
+    parser.add_argument("--season", type=int, required=True, help="Temporada.")
+    parser.add_argument("--team", type=int, help="Time (sem ele, o resumo da liga).")
+    args = parser.parse_args(argv)
+
+    db = create_read_session()
+    try:
+        start = time.perf_counter()
+        linescores = get_linescores(db, args.season)
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        db.close()
+    print(f"{linescores.games} jogos, {len(linescores.teams)} times em {elapsed:.1f} ms")
+    if args.team is not None:
+        if args.team not in linescores.teams:
+            print(f"time {args.team} sem linescores na temporada {args.season}")
+            return 1
+        print(json.dumps(linescores.teams[args.team], indent=2))
+    else:
+        print(json.dumps(linescores.league(), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import create_read_session
+from app.models.player_models import PlayerStatistics
+from app.services.analytics.columnar import group_starts, load_matrix, ratio
+from app.services.analytics.season_cache import season_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tabela da temporada por jogador calculada em NumPy: uma consulta (COPY) traz a partição da temporada
+# como matriz float64 (uma coluna por estatística) e totais, médias, por-36 e aproveitamentos saem
+# de reduções agrupadas (np.add.reduceat sobre as linhas ordenadas por jogador), sem laço por linha.
+# Uso: python -m app.services.analytics.player_analytics --season 2024 [--top 10] [--json]
+
+STAT_COLUMNS = (
+    "points", "fgm", "fga", "ftm", "fta", "tpm", "tpa", "off_reb", "def_reb", "tot_reb",
+    "assists", "steals", "blocks", "turnovers", "p_fouls",
+)
+# Nomes e colunas de made/attempted iguais aos de player_season_statistics
+SHOOTING_SPLITS = {"fgp": ("fgm", "fga"), "tpp": ("tpm", "tpa"), "ftp": ("ftm", "fta")}
+
+STAT_INDEX = {name: index for index, name in enumerate(STAT_COLUMNS)}
+
+@dataclass
+class SeasonTable:
+    """
+    Uma linha por jogador (ordenado por player_id). Matrizes com colunas na ordem de STAT_COLUMNS.
+    """
+    season: int
+    player_ids: np.ndarray
+    team_ids: np.ndarray
+    games_played: np.ndarray
+    minutes: np.ndarray
+    totals: np.ndarray
+    per_game: np.ndarray
+    per_36: np.ndarray
+    shooting: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def stat(self, name: str, kind: str = "totals") -> np.ndarray:
+        if name in self.shooting:
+            return self.shooting[name]
+        return getattr(self, kind)[:, STAT_INDEX[name]]
+
+    def row_index(self, player_id: int) -> Optional[int]:
+        index = int(np.searchsorted(self.player_ids, player_id))
+        if index < len(self.player_ids) and self.player_ids[index] == player_id:
+            return index
+        return None
+
+    def row(self, index: int) -> Dict[str, Any]:
+        row: Dict[str, Any] = {
+            "player_id": int(self.player_ids[index]),
+            "team_id": int(self.team_ids[index]),
+            "season": self.season,
+            "games_played": int(self.games_played[index]),
+            "minutes": round(float(self.minutes[index]), 2),
+        }
+        for position, name in enumerate(STAT_COLUMNS):
+            row[name] = int(self.totals[index, position])
+            row[f"{name}_per_game"] = round(float(self.per_game[index, position]), 2)
+            row[f"{name}_per_36"] = round(float(self.per_36[index, position]), 2)
+        for name, values in self.shooting.items():
+            row[name] = None if np.isnan(values[index]) else round(float(values[index]), 2)
+        return row
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        return [self.row(index) for index in range(len(self))]
+
+def load_season_matrix(db: Session, season: int) -> np.ndarray:
+    """
+    Colunas: player_id, team_id, game_id, minutos e STAT_COLUMNS (nulos viram 0).
+    O filtro por temporada lê somente a partição da temporada.
+    """
+    table = PlayerStatistics.__table__
+    return load_matrix(db, select(
+        table.c.player_id,
+        table.c.team_id,
+        table.c.game_id,
+        cast(func.parse_minutes(table.c.min_played), Float),
+        *(func.coalesce(table.c[name], 0) for name in STAT_COLUMNS),
+    ).where(table.c.season == season))
+
+def compute_season_table(season: int, matrix: np.ndarray) -> SeasonTable:
+    players = matrix[:, 0].astype(np.int64)
+    games = matrix[:, 2].astype(np.int64)
+    # Ordena por jogador e, dentro dele, por jogo: cada jogador vira um bloco contíguo
+    order = np.lexsort((games, players))
+    players = players[order]
+    teams = matrix[order, 1].astype(np.int64)
+    minutes = matrix[order, 3]
+    stats = matrix[order, 4:]
+
+    starts = group_starts(players)
+    ends = np.append(starts[1:], len(players)) if len(starts) else starts
+
+    if len(starts):
+        totals = np.add.reduceat(stats, starts, axis=0)
+        total_minutes = np.add.reduceat(minutes, starts)
+        # Mesmo critério dos agregados no banco: só conta o jogo em que o jogador entrou em quadra
+        games_played = np.add.reduceat((minutes > 0).astype(np.int64), starts)
+    else:
+        totals = np.empty((0, len(STAT_COLUMNS)), dtype=np.float64)
+        total_minutes = np.empty(0, dtype=np.float64)
+        games_played = np.empty(0, dtype=np.int64)
+
+    shooting = {
+        name: ratio(100.0 * totals[:, STAT_INDEX[made]], totals[:, STAT_INDEX[attempted]], fill=np.nan)
+        for name, (made, attempted) in SHOOTING_SPLITS.items()
+    }
+    return SeasonTable(
+        season=season,
+        player_ids=players[starts],
+        # Time do último jogo da temporada (jogadores trocados aparecem no time atual)
+        team_ids=teams[ends - 1],
+        games_played=games_played,
+        minutes=total_minutes,
+        totals=totals,
+        per_game=ratio(totals, games_played[:, None]),
+        per_36=ratio(36.0 * totals, total_minutes[:, None]),
+        shooting=shooting,
+    )
+
+def build_season_table(db: Session, season: int) -> SeasonTable:
+    return compute_season_table(season, load_season_matrix(db, season))
+
+season_tables = season_cache("player_season_tables", [PlayerStatistics.__table__], build_season_table)
+
+def get_season_table(db: Session, season: int) -> SeasonTable:
+    """
+    Tabela da temporada a partir do cache; recalculada quando a ingestão altera a temporada.
+    """
+    return season_tables.get(db, season)
+
+def get_player_season_row(db: Session, season: int, player_id: int) -> Optional[Dict[str, Any]]:
+    table = get_season_table(db, season)
+    index = table.row_index(player_id)
+    return table.row(index) if index is not None else None
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tabela de estatísticas de jogadores da temporada (NumPy).")
+    parser.add_argument("--season", type=int, required=True, help="Temporada (ex.: 2024).")
+    parser.add_argument("--top", type=int, default=10, help="Jogadores exibidos, por pontos por jogo.")
+    parser.add_argument("--json", action="store_true", help="Imprime a tabela completa em JSON.")
+    args = parser.parse_args(argv)
+
+    db = create_read_session()
+    try:
+        start = time.perf_counter()
+        matrix = load_season_matrix(db, args.season)
+        loaded = time.perf_counter()
+        table = compute_season_table(args.season, matrix)
+        computed = time.perf_counter()
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(table.to_rows(), indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"temporada {args.season}: {len(matrix)} linhas, {len(table)} jogadores")
+    print(f"consulta: {(loaded - start) * 1000:.1f} ms  cálculo: {(computed - loaded) * 1000:.2f} ms")
+    points = table.stat("points", "per_game")
+    for index in np.argsort(-points, kind="stable")[:args.top]:
+        row = table.row(int(index))
+        print(f"  jogador {row['player_id']:>6}  time {row['team_id']:>4}  {row['games_played']:>3} J  "
+              f"{row['points_per_game']:>5.1f} PPJ  {row['points_per_36']:>5.1f} P/36  FG% {row['fgp']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from sqlalchemy import Float, cast, delete, extract, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.response_cache import invalidate_cache, season_tag
+from app.models.game_models import Game
+from app.models.player_models import PlayerGameForm, PlayerStatistics
+from app.repository import read_repository
+from app.repository.ingestion_repository import upsert_bulk
+from app.repository.partition_repository import ensure_season_partition
+from app.services.analytics.columnar import group_first_row, group_starts, load_matrix, replace_season_rows
+from app.services.analytics.player_analytics import SHOOTING_SPLITS, STAT_COLUMNS
+
+logging.basicConfig(level=logging.INFO)
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Forma recente dos jogadores ("últimos 5/10/20 jogos") por somas de prefixo: para cada jogador, os jogos
+# com minutos da temporada em ordem de games.game_date recebem os totais acumulados até ali. Qualquer
+# janela sai de duas linhas, (acumulado[n] - acumulado[n - N]) / N, sem window function por requisição.
+# O cálculo da temporada é vetorizado (cumsum por bloco de jogador); a gravação compara com o que já está
+# em player_game_form e só reescreve as linhas novas ou alteradas (jogo novo no fim = uma linha por jogador).
+# Uso: python -m app.services.analytics.player_form --season 2024 [--full]
+
+# Colunas da matriz lida: jogador, time, jogo, data (epoch), minutos e STAT_COLUMNS
+PLAYER, TEAM, GAME, DATE, MINUTES = 0, 1, 2, 3, 4
+STATS = 5
+
+FORM_COLUMNS = ("season", "player_id", "game_number", "game_id", "team_id", "cum_minutes", *(f"cum_{name}" for name in STAT_COLUMNS))
+FORM_INTEGER_COLUMNS = tuple(name for name in FORM_COLUMNS if name != "cum_minutes")
+# Coluna do primeiro acumulado (cum_minutes) na matriz de FORM_COLUMNS
+CUMULATIVE = 5
+
+def load_form_matrix(db: Session, season: int) -> np.ndarray:
+    """
+    Linhas com minutos da temporada, ordenadas por (jogador, data do jogo, jogo).
+    """
+    table = PlayerStatistics.__table__
+    games = Game.__table__
+    minutes = cast(func.parse_minutes(table.c.min_played), Float)
+    matrix = load_matrix(db, select(
+        table.c.player_id,
+        table.c.team_id,
+        table.c.game_id,
+        func.coalesce(extract("epoch", games.c.game_date), 0),
+        minutes,
+        *(func.coalesce(table.c[name], 0) for name in STAT_COLUMNS),
+    ).select_from(table.join(games, games.c.source_id == table.c.game_id)).where(table.c.season == season, minutes > 0))
+    return matrix[np.lexsort((matrix[:, GAME], matrix[:, DATE], matrix[:, PLAYER]))]
+
+def compute_prefix_sums(season: int, matrix: np.ndarray) -> np.ndarray:
+    """
+    Matriz com as colunas de FORM_COLUMNS: número do jogo e acumulados por jogador.
+    """
+    players = matrix[:, PLAYER].astype(np.int64)
+    first = group_first_row(group_starts(players), len(players))
+    values = matrix[:, MINUTES:]
+    totals = np.cumsum(values, axis=0)
+    # Acumulado do bloco do jogador: total corrido menos o que veio antes da primeira linha dele
+    before = np.where((first > 0)[:, None], totals[np.maximum(first - 1, 0)], 0.0)
+    return np.column_stack([
+        np.full(len(players), season),
+        players,
+        np.arange(len(players)) - first + 1,
+        matrix[:, GAME],
+        matrix[:, TEAM],
+        totals - before,
+    ])
+
+def _keys(rows: np.ndarray) -> np.ndarray:
+    return rows[:, 1].astype(np.int64) * (1 << 20) + rows[:, 2].astype(np.int64)
+
+def load_stored_rows(db: Session, season: int) -> np.ndarray:
+    table = PlayerGameForm.__table__
+    rows = load_matrix(db, select(*(table.c[name] for name in FORM_COLUMNS)).where(table.c.season == season))
+    return rows[np.argsort(_keys(rows), kind="stable")]
+
+def _changed_rows(computed: np.ndarray, stored: np.ndarray) -> np.ndarray:
+    # Linhas sem correspondente gravado ou com algum valor diferente do gravado
+    keys = _keys(computed)
+    stored_keys = _keys(stored)
+    positions = np.minimum(np.searchsorted(stored_keys, keys), max(len(stored) - 1, 0))
+    if not len(stored):
+        return np.ones(len(computed), dtype=bool)
+    found = stored_keys[positions] == keys
+    differs = ~np.all(np.isclose(computed[:, 3:], stored[positions, 3:], atol=1e-4), axis=1)
+    return ~found | differs
+
+def refresh_player_form(db: Session, seasons: Iterable[int], full: bool = False) -> Dict[int, int]:
+    """
+    Atualiza player_game_form das temporadas informadas; devolve as linhas gravadas por temporada.
+    """
+    table = PlayerGameForm.__table__
+    written: Dict[int, int] = {}
+    for season in sorted(set(seasons)):
+        start = time.perf_counter()
+        computed = compute_prefix_sums(season, load_form_matrix(db, season))
+        ensure_season_partition(db, PlayerGameForm.__tablename__, season)
+        stored = np.empty((0, len(FORM_COLUMNS))) if full else load_stored_rows(db, season)
+
+        if not len(stored):
+            written[season] = replace_season_rows(db, table, season, FORM_COLUMNS, computed, integer_columns=FORM_INTEGER_COLUMNS)
+        else:
+            changed = computed[_changed_rows(computed, stored)]
+            stale = stored[~np.isin(_keys(stored), _keys(computed))]
+            if len(stale):
+                db.execute(delete(table).where(
+                    table.c.season == season,
+                    tuple_(table.c.player_id, table.c.game_number).in_([(int(row[1]), int(row[2])) for row in stale]),
+                ))
+            payloads = [
+                {name: (float(value) if name == "cum_minutes" else int(value)) for name, value in zip(FORM_COLUMNS, row)}
+                for row in changed
+            ]
+            upsert_bulk(db=db, model=PlayerGameForm, payloads=payloads, unique_key=["season", "player_id", "game_number"])
+            written[season] = len(payloads) + len(stale)
+        db.commit()
+        if written[season]:
+            invalidate_cache([season_tag(season)])
+        logger.info(f"Forma recente da temporada {season}: {written[season]} linhas gravadas em {time.perf_counter() - start:.2f}s.")
+    return written
+
+def form_windows(rows: Dict[int, Dict[str, Any]], latest: int, windows: Sequence[int]) -> Dict[str, Dict[str, Any]]:
+    """
+    Médias por jogo de cada janela a partir das linhas acumuladas (chave = número do jogo).
+    Com menos jogos que a janela, a média usa os jogos disponíveis.
+    """
+    current = rows[latest]
+    result: Dict[str, Dict[str, Any]] = {}
+    for window in windows:
+        games = min(window, latest)
+        base = rows.get(latest - window, {})
+        totals = {name: current[f"cum_{name}"] - base.get(f"cum_{name}", 0) for name in ("minutes", *STAT_COLUMNS)}
+        averages: Dict[str, Any] = {"games": games, "first_game_number": latest - games + 1}
+        averages.update({name: round(value / games, 2) for name, value in totals.items()})
+        for name, (made, attempted) in SHOOTING_SPLITS.items():
+            averages[name] = round(100.0 * totals[made] / totals[attempted], 2) if totals[attempted] else None
+        result[f"last_{window}"] = averages
+    return result
+
+def get_player_form(db: Session, player_id: int, season: int, windows: Sequence[int]) -> Optional[Dict[str, Any]]:
+    """
+    Forma recente do jogador na temporada: lê no máximo len(windows) + 1 linhas pela chave primária.
+    """
+    latest = read_repository.get_player_form_latest(db, player_id, season)
+    if latest is None:
+        return None
+    numbers = [latest, *(latest - window for window in windows if latest - window > 0)]
+    rows = read_repository.get_player_form_rows(db, player_id, season, numbers)
+    return {
+        "player_id": player_id,
+        "season": season,
+        "games_played": latest,
+        "last_game_id": rows[latest]["game_id"],
+        "team_id": rows[latest]["team_id"],
+        "windows": form_windows(rows, latest, windows),
+        "updated_at": max(row["updated_at"] for row in rows.values()),
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Atualiza as somas de prefixo da forma recente dos jogadores.")
+    parser.add_argument("--season", type=int, action="append", required=True, help="Temporada (pode repetir).")
+    parser.add_argument("--full", action="store_true", help="Regrava a temporada inteira sem comparar com o que está gravado.")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        written = refresh_player_form(db, args.season, full=args.full)
+    finally:
+        db.close()
+    print(json.dumps(written, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
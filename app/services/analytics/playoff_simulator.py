@@ -0,0 +1,288 @@
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.response_cache import invalidate_cache, standings_tag
+from app.models.game_models import FINISHED_GAME_STATUSES, Game
+from app.models.standing_models import ComputedStanding, PlayoffOdds
+from app.repository.ingestion_repository import upsert_bulk
+from app.services.analytics.elo_ratings import load_state as load_elo_state, win_probability
+from app.services.analytics.standings import load_team_groups
+
+logging.basicConfig(level=logging.INFO)
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Simulação de Monte Carlo do restante da temporada: parte do W-L de computed_standings, sorteia cada jogo
+# ainda não encerrado com a probabilidade do Elo (win_probability, com mando de quadra) e classifica as
+# conferências pelo aproveitamento final; 7º a 10º disputam o play-in (7x8, 9x10 e perdedor de 7x8 contra
+# vencedor de 9x10). O Elo fica fixo durante a simulação e os empates são decididos por sorteio (sem os
+# desempates oficiais). Cada lote de playoff_simulation_batch simulações é uma matriz (simulações x jogos)
+# resolvida de uma vez em NumPy; os lotes vão para um pool de processos, cada um com a sua semente filha de
+# SeedSequence([semente, temporada]): o resultado não depende do número de processos nem da ordem dos lotes.
+# As entradas (W-L, calendário restante, Elo) têm um hash gravado com o resultado; sem mudança, nada roda.
+# Uso: python -m app.services.analytics.playoff_simulator --season 2024 [--simulations 200000] [--workers 8] [--force]
+
+# Classificados direto e vagas do play-in por conferência
+DIRECT_SEEDS = 6
+PLAY_IN_SEEDS = 4
+CANCELED_GAME_STATUSES = ("Canceled", "Cancelled")
+
+@dataclass
+class SimulationInputs:
+    """
+    Times (league_id, team_id) em ordem, com W-L atual, conferência (índice em conferences, -1 = sem
+    conferência) e Elo; jogos restantes como posições de mandante e visitante em teams.
+    """
+    teams: List[Tuple[int, int]]
+    conferences: List[Tuple[int, str]]
+    wins: np.ndarray
+    losses: np.ndarray
+    conference_ids: np.ndarray
+    elo: np.ndarray
+    home: np.ndarray
+    visitor: np.ndarray
+
+    def inputs_hash(self, simulations: int, seed: int) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps([self.teams, self.conferences, simulations, seed, DIRECT_SEEDS, PLAY_IN_SEEDS,
+                                  settings.elo_home_advantage]).encode())
+        for array in (self.wins, self.losses, self.conference_ids, np.round(self.elo, 6), self.home, self.visitor):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+def load_remaining_games(db: Session, season: int) -> List[Tuple[int, int, int]]:
+    """
+    (league_id, mandante, visitante) dos jogos da temporada ainda não encerrados nem cancelados.
+    """
+    games = Game.__table__
+    return [tuple(row) for row in db.execute(
+        select(games.c.league_id, games.c.home_team_id, games.c.visitor_team_id).where(
+            games.c.season == season,
+            or_(games.c.status.is_(None), games.c.status.not_in((*FINISHED_GAME_STATUSES, *CANCELED_GAME_STATUSES))),
+        ).order_by(games.c.source_id)
+    )]
+
+def _season_elo(db: Session, team_ids: np.ndarray, season: int) -> np.ndarray:
+    # Elo atual; times vindos de temporada anterior regridem à média como no primeiro jogo da temporada
+    state = load_elo_state(db).with_teams(team_ids)
+    positions = np.searchsorted(state.team_ids, team_ids)
+    elo = state.elo[positions]
+    previous = (state.seasons[positions] > 0) & (state.seasons[positions] < season)
+    mean = settings.elo_initial
+    return np.where(previous, mean + settings.elo_season_carryover * (elo - mean), elo)
+
+def load_inputs(db: Session, season: int) -> SimulationInputs:
+    standings = ComputedStanding.__table__
+    records = {
+        (row.league_id, row.team_id): (row.win, row.loss, row.conference_name)
+        for row in db.execute(select(standings.c.league_id, standings.c.team_id, standings.c.win, standings.c.loss,
+                                     standings.c.conference_name).where(standings.c.season == season))
+    }
+    remaining = load_remaining_games(db, season)
+    # Times do calendário ainda sem jogo encerrado entram com 0-0
+    missing = {(league_id, team_id) for league_id, home, visitor in remaining for team_id in (home, visitor)} - set(records)
+    groups = load_team_groups(db, {team_id for _, team_id in missing}) if missing else {}
+    for key in missing:
+        records[key] = (0, 0, groups.get(key[1], (None, None))[0])
+
+    teams = sorted(records)
+    conferences = sorted({(league_id, records[(league_id, team_id)][2]) for league_id, team_id in teams
+                          if records[(league_id, team_id)][2] is not None})
+    conference_index = {conference: position for position, conference in enumerate(conferences)}
+    team_index = {team: position for position, team in enumerate(teams)}
+    team_ids = np.array([team_id for _, team_id in teams], dtype=np.int64)
+    return SimulationInputs(
+        teams=teams,
+        conferences=conferences,
+        wins=np.array([records[team][0] for team in teams], dtype=np.int64),
+        losses=np.array([records[team][1] for team in teams], dtype=np.int64),
+        conference_ids=np.array([conference_index.get((team[0], records[team][2]), -1) for team in teams], dtype=np.int64),
+        elo=_season_elo(db, team_ids, season) if len(teams) else np.empty(0),
+        home=np.array([team_index[(league_id, home)] for league_id, home, _ in remaining], dtype=np.int64),
+        visitor=np.array([team_index[(league_id, visitor)] for league_id, _, visitor in remaining], dtype=np.int64),
+    )
+
+def _bincount(values: np.ndarray, size: int) -> np.ndarray:
+    return np.bincount(values.ravel(), minlength=size)
+
+def simulate_batch(inputs: SimulationInputs, size: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """
+    Contagens de um lote de size simulações: vitórias somadas, colocações, top 6, play-in e playoffs.
+    """
+    rng = np.random.default_rng(seed)
+    teams = len(inputs.teams)
+    # Probabilidades do mandante: por jogo restante e, no play-in, entre quaisquer dois times (o mais bem colocado manda)
+    pairwise = win_probability(inputs.elo[:, None], inputs.elo[None, :])
+    home_wins = rng.random((size, len(inputs.home)), dtype=np.float32) < pairwise[inputs.home, inputs.visitor].astype(np.float32)
+    winners = np.where(home_wins, inputs.home, inputs.visitor)
+    offsets = np.arange(size, dtype=np.int64)[:, None] * teams
+    wins = inputs.wins + _bincount(winners + offsets, size * teams).reshape(size, teams)
+
+    largest = max((int(np.count_nonzero(inputs.conference_ids == conference)) for conference in range(len(inputs.conferences))), default=0)
+    counts = {
+        "wins": wins.sum(axis=0),
+        "seeds": np.zeros((teams, largest), dtype=np.int64),
+        "top6": np.zeros(teams, dtype=np.int64),
+        "play_in": np.zeros(teams, dtype=np.int64),
+        "playoff": np.zeros(teams, dtype=np.int64),
+    }
+    # Aproveitamento final: calendários de tamanhos diferentes (jogos adiados, cancelados) não pesam na colocação
+    played = np.maximum(inputs.wins + inputs.losses + _bincount(np.concatenate([inputs.home, inputs.visitor]), teams), 1)
+    for conference in range(len(inputs.conferences)):
+        members = np.flatnonzero(inputs.conference_ids == conference)
+        # Empate em aproveitamento: o sorteio (menor que a menor diferença possível) só reordena os empatados
+        keys = wins[:, members] / played[members] + rng.random((size, len(members))) * 1e-6
+        ranked = members[np.argsort(-keys, axis=1)]
+        for seed_position in range(len(members)):
+            counts["seeds"][:, seed_position] += _bincount(ranked[:, seed_position], teams)
+
+        direct = ranked[:, :DIRECT_SEEDS]
+        counts["top6"] += _bincount(direct, teams)
+        counts["playoff"] += _bincount(direct, teams)
+        if len(members) < DIRECT_SEEDS + PLAY_IN_SEEDS:
+            # Conferência pequena demais para o play-in: 7º e 8º entram direto
+            counts["playoff"] += _bincount(ranked[:, DIRECT_SEEDS:DIRECT_SEEDS + 2], teams)
+            continue
+        seventh, eighth, ninth, tenth = (ranked[:, DIRECT_SEEDS + offset] for offset in range(PLAY_IN_SEEDS))
+        counts["play_in"] += _bincount(ranked[:, DIRECT_SEEDS:DIRECT_SEEDS + PLAY_IN_SEEDS], teams)
+        draws = rng.random((size, 3))
+        first = draws[:, 0] < pairwise[seventh, eighth]
+        second = draws[:, 1] < pairwise[ninth, tenth]
+        loser_first = np.where(first, eighth, seventh)
+        winner_second = np.where(second, ninth, tenth)
+        last = draws[:, 2] < pairwise[loser_first, winner_second]
+        counts["playoff"] += _bincount(np.where(first, seventh, eighth), teams)
+        counts["playoff"] += _bincount(np.where(last, loser_first, winner_second), teams)
+    return counts
+
+def _pool_workers() -> int:
+    return settings.playoff_simulation_workers or os.cpu_count() or 1
+
+def run_simulations(inputs: SimulationInputs, simulations: int, seed: int, season: int, workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Distribui os lotes pelo pool de processos e soma as contagens. As sementes dos lotes saem de
+    SeedSequence([seed, season]).spawn: o total é o mesmo com qualquer número de processos.
+    """
+    batch = max(settings.playoff_simulation_batch, 1)
+    sizes = [min(batch, simulations - start) for start in range(0, simulations, batch)]
+    seeds = np.random.SeedSequence([seed, season]).spawn(len(sizes))
+    workers = min(workers or _pool_workers(), len(sizes))
+
+    if workers <= 1:
+        results = [simulate_batch(inputs, size, child) for size, child in zip(sizes, seeds)]
+    else:
+        # spawn: o processo da API pode ter threads (pool de conexões, executores) que não sobrevivem a um fork
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(simulate_batch, [inputs] * len(sizes), sizes, seeds))
+    return {name: sum(result[name] for result in results) for name in results[0]}
+
+def _odds_rows(inputs: SimulationInputs, counts: Dict[str, np.ndarray], season: int, simulations: int,
+               seed: int, inputs_hash: str) -> List[Dict[str, Any]]:
+    remaining = _bincount(np.concatenate([inputs.home, inputs.visitor]), len(inputs.teams))
+    now = datetime.now(timezone.utc)
+    rows: List[Dict[str, Any]] = []
+    for position, (league_id, team_id) in enumerate(inputs.teams):
+        conference_id = int(inputs.conference_ids[position])
+        size = int(np.count_nonzero(inputs.conference_ids == conference_id)) if conference_id >= 0 else 0
+        projected_win = float(counts["wins"][position]) / simulations
+        rows.append({
+            "league_id": league_id,
+            "season": season,
+            "team_id": team_id,
+            "conference_name": inputs.conferences[conference_id][1] if conference_id >= 0 else None,
+            "win": int(inputs.wins[position]),
+            "loss": int(inputs.losses[position]),
+            "remaining_games": int(remaining[position]),
+            "elo": round(float(inputs.elo[position]), 1),
+            "projected_win": round(projected_win, 2),
+            "projected_loss": round(float(inputs.wins[position] + inputs.losses[position] + remaining[position]) - projected_win, 2),
+            "top6_prob": round(float(counts["top6"][position]) / simulations, 4) if size else None,
+            "play_in_prob": round(float(counts["play_in"][position]) / simulations, 4) if size else None,
+            "playoff_prob": round(float(counts["playoff"][position]) / simulations, 4) if size else None,
+            "seed_probs": [round(float(value) / simulations, 4) for value in counts["seeds"][position, :size]] if size else None,
+            "simulations": simulations,
+            "random_seed": seed,
+            "inputs_hash": inputs_hash,
+            "simulated_at": now,
+        })
+    return rows
+
+def _stored_hash(db: Session, season: int) -> Optional[str]:
+    table = PlayoffOdds.__table__
+    hashes = {value for (value,) in db.execute(select(table.c.inputs_hash).where(table.c.season == season).distinct())}
+    return hashes.pop() if len(hashes) == 1 else None
+
+def refresh_playoff_odds(
+    db: Session,
+    seasons: Iterable[int],
+    simulations: Optional[int] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Simula as temporadas cujas entradas mudaram desde a última execução e grava playoff_odds. Sem jogos
+    restantes, só o play-in é sorteado sobre a classificação final.
+    """
+    simulations = simulations or settings.playoff_simulations
+    seed = settings.playoff_simulation_seed if seed is None else seed
+    table = PlayoffOdds.__table__
+    refreshed: Dict[int, Dict[str, Any]] = {}
+    for season in sorted(set(seasons)):
+        start = time.perf_counter()
+        inputs = load_inputs(db, season)
+        if not inputs.teams:
+            refreshed[season] = {"status": "no_teams"}
+            continue
+        inputs_hash = inputs.inputs_hash(simulations, seed)
+        if not force and _stored_hash(db, season) == inputs_hash:
+            refreshed[season] = {"status": "unchanged"}
+            continue
+
+        counts = run_simulations(inputs, simulations, seed, season, workers)
+        rows = _odds_rows(inputs, counts, season, simulations, seed, inputs_hash)
+        db.execute(delete(table).where(table.c.season == season))
+        upsert_bulk(db=db, model=PlayoffOdds, payloads=rows, unique_key=["league_id", "season", "team_id"])
+        db.commit()
+        invalidate_cache([standings_tag(season)])
+        refreshed[season] = {
+            "status": "simulated", "simulations": simulations, "remaining_games": len(inputs.home),
+            "teams": len(rows), "seconds": round(time.perf_counter() - start, 2),
+        }
+        logger.info(f"Probabilidades de playoff da temporada {season}: {refreshed[season]}")
+    return refreshed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simula o restante da temporada e grava as probabilidades de playoff.")
+    parser.add_argument("--season", type=int, action="append", required=True, help="Temporada (pode repetir).")
+    parser.add_argument("--simulations", type=int, help="Simulações (padrão: playoff_simulations).")
+    parser.add_argument("--workers", type=int, help="Processos (padrão: playoff_simulation_workers).")
+    parser.add_argument("--seed", type=int, help="Semente base (padrão: playoff_simulation_seed).")
+    parser.add_argument("--force", action="store_true", help="Simula mesmo sem mudança nas entradas.")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        refreshed = refresh_playoff_odds(db, args.season, args.simulations, args.seed, args.workers, force=args.force)
+    finally:
+        db.close()
+    print(json.dumps(refreshed, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Iterable, Optional, Sequence, Tuple, TypeVar
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.metrics import register_cache
+from app.services.snapshot_service import season_versions
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Resultados de analytics mantidos em memória por temporada. Duas formas de invalidação:
+# - no mesmo processo, a ingestão chama invalidate_analytics() com as temporadas cujo payload_hash mudou;
+# - entre processos (ingestão em CLI, API em outro), a versão das tabelas de origem (max(updated_at) e
+#   número de linhas) é conferida no máximo a cada analytics_version_check_seconds. Como o upsert com
+#   skip_unchanged só toca o updated_at de linhas com payload_hash novo, a versão só muda quando os dados mudam.
+
+T = TypeVar("T")
+
+@dataclass
+class _Entry(Generic[T]):
+    value: T
+    version: Tuple[Any, ...]
+    checked_at: float
+
+class SeasonCache(Generic[T]):
+    def __init__(self, name: str, tables: Sequence[Table], build: Callable[[Session, int], T]):
+        self.name = name
+        self.tables = list(tables)
+        self.build = build
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[int, _Entry[T]] = {}
+        # Um lock por temporada: requisições simultâneas esperam o mesmo cálculo em vez de repeti-lo
+        self._locks: Dict[int, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, db: Session, season: int) -> Tuple[Any, ...]:
+        parts = []
+        for table in self.tables:
+            current = season_versions(db, table, [season]).get(season, {})
+            parts.append((current.get("max_updated_at"), current.get("rows", 0)))
+        return tuple(parts)
+
+    def _lock(self, season: int) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(season, threading.Lock())
+
+    def _fresh(self, season: int) -> Optional[_Entry[T]]:
+        entry = self._entries.get(season)
+        if entry is not None and time.monotonic() - entry.checked_at < settings.analytics_version_check_seconds:
+            return entry
+        return None
+
+    def get(self, db: Session, season: int) -> T:
+        entry = self._fresh(season)
+        if entry is not None:
+            self.hits += 1
+            return entry.value
+
+        with self._lock(season):
+            entry = self._fresh(season)
+            if entry is not None:
+                self.hits += 1
+                return entry.value
+
+            version = self.version(db, season)
+            entry = self._entries.get(season)
+            if entry is not None and entry.version == version:
+                entry.checked_at = time.monotonic()
+                self.hits += 1
+                return entry.value
+
+            self.misses += 1
+            start = time.perf_counter()
+            value = self.build(db, season)
+            self._entries[season] = _Entry(value, version, time.monotonic())
+            logger.info(f"Analytics '{self.name}' da temporada {season} calculado em {(time.perf_counter() - start) * 1000:.1f} ms.")
+            return value
+
+    def peek(self, season: int) -> Optional[T]:
+        entry = self._entries.get(season)
+        return entry.value if entry is not None else None
+
+    def expire(self, seasons: Iterable[int]) -> None:
+        # A próxima leitura confere a versão das tabelas de origem já, sem esperar o intervalo;
+        # o resultado só é reconstruído se a versão mudou
+        for season in set(seasons):
+            entry = self._entries.get(season)
+            if entry is not None:
+                entry.checked_at = float("-inf")
+
+    def invalidate(self, seasons: Optional[Iterable[int]] = None) -> int:
+        if seasons is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        return sum(self._entries.pop(season, None) is not None for season in set(seasons))
+
+_caches: Dict[str, SeasonCache] = {}
+
+def season_cache(name: str, tables: Sequence[Table], build: Callable[[Session, int], T]) -> SeasonCache[T]:
+    cache = SeasonCache(name, tables, build)
+    _caches[name] = cache
+    register_cache(f"analytics_{name}", lambda: (cache.hits, cache.misses))
+    return cache
+
+def invalidate_analytics(seasons: Iterable[int]) -> int:
+    """
+    Descarta os resultados das temporadas informadas em todos os caches de analytics.
+    """
+    seasons = list(seasons)
+    if not seasons:
+        return 0
+    removed = sum(cache.invalidate(seasons) for cache in _caches.values())
+    if removed:
+        logger.info(f"{removed} resultados de analytics invalidados (temporadas {seasons}).")
+    return removed
+
+def expire_analytics(seasons: Iterable[int]) -> None:
+    """
+    Força a conferência de versão das temporadas informadas em todos os caches de analytics.
+    """
+    for cache in _caches.values():
+        cache.expire(seasons)
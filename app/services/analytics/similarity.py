@@ -0,0 +1,263 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import BASE_DIR, get_settings
+from app.core.database import SessionLocal, create_read_session
+from app.models.player_models import Player, PlayerStatistics
+from app.services.analytics.player_analytics import SHOOTING_SPLITS, STAT_INDEX, SeasonTable, get_season_table
+from app.services.snapshot_service import MANIFEST_NAME, load_manifest, save_manifest, season_versions
+
+logging.basicConfig(level=logging.INFO)
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Jogadores parecidos: cada (jogador, temporada) vira um vetor de estatísticas por 36 minutos e
+# aproveitamentos, padronizado (z-score) dentro da própria temporada e normalizado (norma 1), de modo
+# que o produto escalar é a similaridade do cosseno entre perfis da mesma era. A busca é exata, em
+# blocos de similarity_block_rows linhas (produto matriz-vetor + argpartition por bloco); VectorIndex.search
+# é o ponto de troca por uma estrutura aproximada (ANN) se o histórico crescer.
+# O índice fica em disco, um arquivo .npz por temporada em similarity_index_dir, com um manifesto das
+# versões de player_statistics: a reconstrução refaz só as temporadas cuja versão mudou.
+# Uso: python -m app.services.analytics.similarity --rebuild [--season 2024] [--force]
+#      python -m app.services.analytics.similarity --player 265 --season 2024 [--top 10]
+
+FEATURE_STATS = ("points", "fga", "fta", "tpa", "off_reb", "def_reb", "assists", "steals", "blocks", "turnovers", "p_fouls")
+FEATURES = (*(f"{name}_per_36" for name in FEATURE_STATS), *SHOOTING_SPLITS)
+# Muda quando FEATURES ou a normalização mudam: força a reconstrução de todas as temporadas
+INDEX_FORMAT = 1
+
+def index_root() -> Path:
+    root = Path(settings.similarity_index_dir)
+    return root if root.is_absolute() else BASE_DIR / root
+
+def season_file(root: Path, season: int) -> Path:
+    return root / f"season={season}.npz"
+
+def season_vectors(table: SeasonTable) -> Dict[str, np.ndarray]:
+    """
+    Vetores normalizados dos jogadores da temporada com ao menos similarity_min_minutes minutos.
+    """
+    eligible = table.minutes >= settings.similarity_min_minutes
+    if not eligible.any():
+        return {
+            "player_ids": np.empty(0, dtype=np.int64), "team_ids": np.empty(0, dtype=np.int64),
+            "vectors": np.empty((0, len(FEATURES)), dtype=np.float32),
+        }
+    features = np.column_stack([
+        *(table.per_36[:, STAT_INDEX[name]] for name in FEATURE_STATS),
+        *(table.shooting[name] for name in SHOOTING_SPLITS),
+    ])[eligible]
+    # Aproveitamento sem tentativas fica na média da temporada (z = 0)
+    means = np.nanmean(features, axis=0)
+    features = np.where(np.isnan(features), means, features)
+    deviations = features.std(axis=0)
+    scores = (features - features.mean(axis=0)) / np.where(deviations > 0, deviations, 1.0)
+    norms = np.linalg.norm(scores, axis=1, keepdims=True)
+    return {
+        "player_ids": table.player_ids[eligible],
+        "team_ids": table.team_ids[eligible],
+        "vectors": (scores / np.where(norms > 0, norms, 1.0)).astype(np.float32),
+    }
+
+@dataclass
+class VectorIndex:
+    player_ids: np.ndarray
+    seasons: np.ndarray
+    team_ids: np.ndarray
+    vectors: np.ndarray
+    stamp: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def locate(self, player_id: int, season: int) -> Optional[int]:
+        rows = np.flatnonzero((self.player_ids == player_id) & (self.seasons == season))
+        return int(rows[0]) if len(rows) else None
+
+    def search(self, query: np.ndarray, k: int, allowed: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        As k linhas de maior produto escalar com query (entre as permitidas), em ordem decrescente.
+        Cada bloco contribui com no máximo k candidatos; memória extra de O(bloco + k).
+        """
+        block = max(settings.similarity_block_rows, k)
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, len(self), block):
+            scores = self.vectors[start:start + block] @ query
+            if allowed is not None:
+                scores = np.where(allowed[start:start + block], scores, -np.inf)
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(scores))
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_rows) > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+        order = np.lexsort((best_rows, -best_scores))
+        valid = np.isfinite(best_scores[order])
+        return best_rows[order][valid], best_scores[order][valid]
+
+def refresh_similarity_index(db: Session, seasons: Optional[Iterable[int]] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    Regrava os arquivos das temporadas cuja versão de player_statistics mudou desde a última gravação.
+    """
+    root = index_root()
+    seasons = sorted(set(seasons)) if seasons is not None else None
+    manifest = load_manifest(root)
+    versions = season_versions(db, PlayerStatistics.__table__, seasons)
+    summary: Dict[str, Any] = {"root": str(root), "written": [], "removed": [], "skipped": 0, "rows": 0}
+
+    for season, version in sorted(versions.items()):
+        previous = manifest.get(str(season))
+        if (not force and previous and previous.get("format") == INDEX_FORMAT
+                and {key: previous.get(key) for key in version} == version):
+            summary["skipped"] += 1
+            continue
+
+        vectors = season_vectors(get_season_table(db, season))
+        root.mkdir(parents=True, exist_ok=True)
+        tmp_path = root / f"season={season}.tmp.npz"
+        np.savez(tmp_path, **vectors)
+        # Troca atômica: a API nunca carrega um arquivo pela metade
+        os.replace(tmp_path, season_file(root, season))
+        manifest[str(season)] = {
+            **version, "format": INDEX_FORMAT, "players": len(vectors["player_ids"]),
+            "written_at": datetime.now(timezone.utc).isoformat(),
+        }
+        save_manifest(root, manifest)
+        summary["written"].append(season)
+        summary["rows"] += len(vectors["player_ids"])
+        logger.info(f"Índice de similaridade da temporada {season} gravado: {len(vectors['player_ids'])} jogadores.")
+
+    # Temporadas que sumiram do banco saem do índice
+    for season in list(manifest):
+        if int(season) not in versions and (seasons is None or int(season) in seasons):
+            season_file(root, int(season)).unlink(missing_ok=True)
+            del manifest[season]
+            save_manifest(root, manifest)
+            summary["removed"].append(int(season))
+    return summary
+
+def load_index(root: Optional[Path] = None) -> VectorIndex:
+    root = root or index_root()
+    manifest_path = root / MANIFEST_NAME
+    stamp = manifest_path.stat().st_mtime if manifest_path.exists() else 0.0
+    parts: List[Dict[str, np.ndarray]] = []
+    for season in sorted(int(season) for season in load_manifest(root)):
+        with np.load(season_file(root, season)) as data:
+            part = {name: data[name] for name in data.files}
+        part["seasons"] = np.full(len(part["player_ids"]), season, dtype=np.int64)
+        parts.append(part)
+    if not parts:
+        return VectorIndex(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                           np.empty((0, len(FEATURES)), dtype=np.float32), stamp)
+    return VectorIndex(
+        player_ids=np.concatenate([part["player_ids"] for part in parts]),
+        seasons=np.concatenate([part["seasons"] for part in parts]),
+        team_ids=np.concatenate([part["team_ids"] for part in parts]),
+        vectors=np.ascontiguousarray(np.concatenate([part["vectors"] for part in parts])),
+        stamp=stamp,
+    )
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+def get_index() -> VectorIndex:
+    """
+    Índice em memória; recarregado quando o manifesto em disco muda (reconstrução em outro processo).
+    """
+    global _index
+    manifest_path = index_root() / MANIFEST_NAME
+    stamp = manifest_path.stat().st_mtime if manifest_path.exists() else 0.0
+    if _index is not None and _index.stamp == stamp:
+        return _index
+    with _index_lock:
+        if _index is None or _index.stamp != stamp:
+            start = time.perf_counter()
+            _index = load_index()
+            logger.info(f"Índice de similaridade carregado: {len(_index)} temporadas de jogadores em {(time.perf_counter() - start) * 1000:.1f} ms.")
+        return _index
+
+def find_similar(db: Session, player_id: int, season: int, limit: int = 10, include_self: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """
+    Temporadas de jogadores mais parecidas com a do jogador, em todo o histórico indexado.
+    Sem include_self, as outras temporadas do próprio jogador ficam de fora.
+    """
+    index = get_index()
+    row = index.locate(player_id, season)
+    if row is None:
+        return None
+    allowed = index.player_ids != player_id
+    if include_self:
+        allowed |= index.seasons != season
+    rows, scores = index.search(index.vectors[row], limit, allowed)
+
+    players = Player.__table__
+    names = {
+        source_id: f"{first_name} {last_name}".strip()
+        for source_id, first_name, last_name in db.execute(
+            select(players.c.source_id, players.c.first_name, players.c.last_name)
+            .where(players.c.source_id.in_({int(index.player_ids[match]) for match in rows}))
+        )
+    }
+    return [
+        {
+            "player_id": int(index.player_ids[match]),
+            "name": names.get(int(index.player_ids[match]), ""),
+            "season": int(index.seasons[match]),
+            "team_id": int(index.team_ids[match]),
+            "similarity": round(float(score), 4),
+        }
+        for match, score in zip(rows.tolist(), scores.tolist())
+    ]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Índice de similaridade de temporadas de jogadores.")
+    parser.add_argument("--rebuild", action="store_true", help="Atualiza os arquivos das temporadas alteradas.")
+    parser.add_argument("--force", action="store_true", help="Com --rebuild, regrava mesmo sem mudança de versão.")
+    parser.add_argument("--season", type=int, action="append", help="Temporada (pode repetir; na consulta, a do jogador).")
+    parser.add_argument("--player", type=int, help="Jogador consultado.")
+    parser.add_argument("--top", type=int, default=10, help="Resultados da consulta.")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        db = SessionLocal()
+        try:
+            print(json.dumps(refresh_similarity_index(db, args.season, force=args.force), indent=2))
+        finally:
+            db.close()
+
+    if args.player is not None:
+        if not args.season:
+            parser.error("--player exige --season.")
+        db = create_read_session()
+        try:
+            start = time.perf_counter()
+            results = find_similar(db, args.player, args.season[0], args.top)
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            db.close()
+        if results is None:
+            print(f"jogador {args.player} sem vetor na temporada {args.season[0]} (minutos abaixo do mínimo ou índice não construído)")
+            return 1
+        print(f"{len(get_index())} temporadas indexadas, consulta em {elapsed:.2f} ms")
+        for result in results:
+            print(f"  {result['similarity']:.4f}  jogador {result['player_id']:>6}  {result['season']}  time {result['team_id']:>5}  {result['name']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
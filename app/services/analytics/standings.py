@@ -0,0 +1,226 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import delete, extract, func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.response_cache import invalidate_cache, standings_tag
+from app.models.game_models import FINISHED_GAME_STATUSES, Game
+from app.models.standing_models import ComputedStanding, Standing
+from app.models.team_models import TeamLeague
+from app.repository.ingestion_repository import upsert_bulk
+from app.services.analytics.columnar import load_matrix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Classificação local: W-L, aproveitamento, jogos atrás, sequência e colocação na conferência/divisão
+# derivados de games + team_league, sem chamada à API. Cada atualização aplica só os jogos encerrados
+# depois do último aplicado na temporada (o contador de jogos confere que nenhum jogo antigo chegou
+# atrasado; se chegou, a temporada é refeita). As colocações são recalculadas sobre os ~30 times.
+# A leitura diária da API (standings) é conferida contra o cálculo a cada atualização: divergências ficam
+# em drift_fields, com o payload_hash da linha conferida; o aviso no log sai uma vez por payload_hash.
+# Critério de colocação: aproveitamento, vitórias e team_id (sem os desempates oficiais da NBA).
+# Uso: python -m app.services.analytics.standings --season 2024 [--full]
+
+# Conferência e divisão do cadastro na liga principal
+STANDING_LEAGUE = "standard"
+
+# Colunas da matriz de jogos
+GAME, LEAGUE, DATE, HOME, VISITOR, HOME_SCORE, VISITOR_SCORE = range(7)
+
+COUNTERS = ("win", "loss", "home_win", "home_loss", "away_win", "away_loss")
+# Campos comparados com a linha da API
+RECONCILED_FIELDS = ("win", "loss", "conference_rank", "division_rank", "games_behind", "streak", "win_streak")
+
+def load_finished_games(db: Session, season: int) -> np.ndarray:
+    """
+    Jogos encerrados da temporada com placar, ordenados por (data, source_id).
+    """
+    games = Game.__table__
+    matrix = load_matrix(db, select(
+        games.c.source_id,
+        games.c.league_id,
+        func.coalesce(extract("epoch", games.c.game_date), 0),
+        games.c.home_team_id,
+        games.c.visitor_team_id,
+        games.c.home_score,
+        games.c.visitor_score,
+    ).where(
+        games.c.season == season,
+        games.c.status.in_(FINISHED_GAME_STATUSES),
+        games.c.home_score.is_not(None),
+        games.c.visitor_score.is_not(None),
+    ))
+    return matrix[np.lexsort((matrix[:, GAME], matrix[:, DATE]))]
+
+def _empty_row(league_id: int, season: int, team_id: int) -> Dict[str, Any]:
+    return {
+        "league_id": league_id, "season": season, "team_id": team_id,
+        **{name: 0 for name in COUNTERS},
+        "streak": 0, "win_streak": None, "last_game_id": None, "last_game_date": None,
+        "api_payload_hash": None, "drift_fields": None, "reconciled_at": None,
+    }
+
+def load_state(db: Session, season: int) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    table = ComputedStanding.__table__
+    columns = ("league_id", "season", "team_id", *COUNTERS, "streak", "win_streak", "last_game_id", "last_game_date",
+               "api_payload_hash", "drift_fields", "reconciled_at")
+    result = db.execute(select(*(table.c[name] for name in columns)).where(table.c.season == season))
+    return {(row.league_id, row.team_id): dict(row._mapping) for row in result}
+
+def _last_applied(state: Dict[Tuple[int, int], Dict[str, Any]]) -> Tuple[float, int]:
+    # Chave (data, jogo) do último jogo aplicado na temporada
+    return max(
+        ((row["last_game_date"].timestamp() if row["last_game_date"] else 0.0, row["last_game_id"] or 0) for row in state.values()),
+        default=(-1.0, 0),
+    )
+
+def apply_games(state: Dict[Tuple[int, int], Dict[str, Any]], season: int, games: np.ndarray) -> None:
+    """
+    Aplica os jogos (já ordenados) sobre o estado de cada time: vitórias/derrotas, mando e sequência.
+    """
+    for game_id, league_id, date, home, visitor, home_score, visitor_score in games.tolist():
+        if home_score == visitor_score:
+            continue
+        game_date = datetime.fromtimestamp(date, tz=timezone.utc) if date else None
+        for team_id, won, at_home in ((home, home_score > visitor_score, True), (visitor, visitor_score > home_score, False)):
+            row = state.setdefault((int(league_id), int(team_id)), _empty_row(int(league_id), season, int(team_id)))
+            side = "home" if at_home else "away"
+            if won:
+                row["win"] += 1
+                row[f"{side}_win"] += 1
+            else:
+                row["loss"] += 1
+                row[f"{side}_loss"] += 1
+            row["streak"] = row["streak"] + 1 if row["win_streak"] is won else 1
+            row["win_streak"] = won
+            row["last_game_id"] = int(game_id)
+            row["last_game_date"] = game_date
+
+def load_team_groups(db: Session, team_ids: Iterable[int]) -> Dict[int, Tuple[Optional[str], Optional[str]]]:
+    table = TeamLeague.__table__
+    return {
+        team_id: (conference, division)
+        for team_id, conference, division in db.execute(
+            select(table.c.team_id, table.c.conference, table.c.division)
+            .where(table.c.league_name == STANDING_LEAGUE, table.c.team_id.in_(list(team_ids)))
+        )
+    }
+
+def rank_standings(state: Dict[Tuple[int, int], Dict[str, Any]], groups: Dict[int, Tuple[Optional[str], Optional[str]]]) -> None:
+    """
+    Aproveitamento, colocações na conferência e divisão e jogos atrás do líder da conferência.
+    """
+    for row in state.values():
+        played = row["win"] + row["loss"]
+        row["win_pct"] = round(row["win"] / played, 3) if played else None
+        row["conference_name"], row["division_name"] = groups.get(row["team_id"], (None, None))
+
+    def order(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return sorted(rows, key=lambda row: (-(row["win_pct"] or 0.0), -row["win"], row["team_id"]))
+
+    for group_field, rank_field in (("conference_name", "conference_rank"), ("division_name", "division_rank")):
+        grouped: Dict[Tuple[int, Optional[str]], List[Dict[str, Any]]] = {}
+        for row in state.values():
+            grouped.setdefault((row["league_id"], row[group_field]), []).append(row)
+        for (_, name), rows in grouped.items():
+            ranked = order(rows)
+            for position, row in enumerate(ranked, start=1):
+                row[rank_field] = position if name is not None else None
+            if group_field == "conference_name":
+                leader = ranked[0]
+                for row in ranked:
+                    row["games_behind"] = ((leader["win"] - row["win"]) + (row["loss"] - leader["loss"])) / 2.0
+
+def _api_games_behind(value: Optional[str]) -> float:
+    # A API manda "1.5", "-" ou nulo para o líder
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def reconcile(db: Session, season: int, state: Dict[Tuple[int, int], Dict[str, Any]]) -> int:
+    """
+    Confere a última leitura da API de cada time contra o cálculo local; devolve os times divergentes.
+    """
+    table = Standing.__table__
+    api_rows = {
+        (row.league_id, row.team_id): row
+        for row in db.execute(select(table).where(table.c.season == season, table.c.is_active == 1))
+    }
+    now = datetime.now(timezone.utc)
+    drifted = 0
+    for key, row in state.items():
+        api = api_rows.get(key)
+        if api is None:
+            row["api_payload_hash"], row["drift_fields"] = None, None
+            continue
+        api_values = {
+            "win": api.win, "loss": api.loss, "conference_rank": api.conference_rank, "division_rank": api.division_rank,
+            "games_behind": _api_games_behind(api.games_behind), "streak": api.streak, "win_streak": api.win_streak,
+        }
+        row["drift_fields"] = [name for name in RECONCILED_FIELDS if api_values[name] != row[name]]
+        if row["drift_fields"] and (row.get("api_payload_hash") != api.payload_hash or row.get("reconciled_at") is None):
+            logger.warning(f"Classificação da API diverge do cálculo local: temporada {season}, time {row['team_id']}, campos {row['drift_fields']}.")
+        row["api_payload_hash"] = api.payload_hash
+        row["reconciled_at"] = now
+        drifted += bool(row["drift_fields"])
+    return drifted
+
+def refresh_standings(db: Session, seasons: Iterable[int], full: bool = False) -> Dict[int, Dict[str, int]]:
+    """
+    Aplica os jogos encerrados ainda não contados e grava a classificação local das temporadas.
+    """
+    table = ComputedStanding.__table__
+    refreshed: Dict[int, Dict[str, int]] = {}
+    for season in sorted(set(seasons)):
+        start = time.perf_counter()
+        rebuild = full
+        games = load_finished_games(db, season)
+        state = {} if rebuild else load_state(db, season)
+
+        last_date, last_game = _last_applied(state)
+        new = games[(games[:, DATE] > last_date) | ((games[:, DATE] == last_date) & (games[:, GAME] > last_game))]
+        applied = sum(row["win"] + row["loss"] for row in state.values()) // 2
+        decided = int(np.count_nonzero(games[:, HOME_SCORE] != games[:, VISITOR_SCORE]))
+        if state and applied + int(np.count_nonzero(new[:, HOME_SCORE] != new[:, VISITOR_SCORE])) != decided:
+            # Jogo antigo chegou atrasado (ou saiu do banco): refaz a temporada
+            logger.info(f"Classificação da temporada {season}: jogos fora de ordem, recalculando do início.")
+            rebuild, state, new = True, {}, games
+
+        apply_games(state, season, new)
+        rank_standings(state, load_team_groups(db, {team_id for _, team_id in state}))
+        drifted = reconcile(db, season, state)
+
+        if rebuild:
+            db.execute(delete(table).where(table.c.season == season))
+        upsert_bulk(db=db, model=ComputedStanding, payloads=list(state.values()), unique_key=["league_id", "season", "team_id"])
+        db.commit()
+        invalidate_cache([standings_tag(season)])
+        refreshed[season] = {"games_applied": len(new), "teams": len(state), "drifted": drifted}
+        logger.info(f"Classificação local da temporada {season} em {(time.perf_counter() - start) * 1000:.1f} ms: {refreshed[season]}")
+    return refreshed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Atualiza a classificação calculada a partir dos jogos encerrados.")
+    parser.add_argument("--season", type=int, action="append", required=True, help="Temporada (pode repetir).")
+    parser.add_argument("--full", action="store_true", help="Recalcula a temporada inteira, não só os jogos novos.")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        refreshed = refresh_standings(db, args.season, full=args.full)
+    finally:
+        db.close()
+    print(json.dumps(refreshed, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy import Float, Integer, cast, extract, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.response_cache import invalidate_cache, season_tag
+from app.models.game_models import Game, TeamStatistics
+from app.models.team_models import TeamGameRating
+from app.repository.ingestion_repository import upsert_bulk
+from app.services.analytics.columnar import group_first_row, group_starts, load_matrix, ratio, rolling_sum
+from app.services.analytics.player_analytics import STAT_COLUMNS, STAT_INDEX
+
+logging.basicConfig(level=logging.INFO)
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Ratings de times por jogo: as duas linhas de team_statistics de cada game_id são pareadas
+# (time x adversário), as posses são estimadas com os dois box scores e ORtg/DRtg/net/pace saem
+# de operações vetorizadas sobre a temporada inteira; a janela móvel usa somas de prefixo por time.
+# A tabela team_game_ratings só recebe os jogos novos, a linha do adversário nesses jogos e os jogos
+# posteriores a eles do mesmo time (cuja janela móvel muda); --full recalcula a temporada.
+# Uso: python -m app.services.analytics.team_analytics --season 2024 [--full]
+
+# Colunas da matriz de time: game_id, team_id, data (epoch), mandante, minutos e STAT_COLUMNS
+GAME, TEAM, DATE, HOME, MINUTES = 0, 1, 2, 3, 4
+TEAM_STATS = 5
+REGULATION_MINUTES = 240.0
+
+RATING_COLUMNS = (
+    "minutes", "possessions", "pace", "off_rating", "def_rating", "net_rating",
+    "rolling_pace", "rolling_off_rating", "rolling_def_rating", "rolling_net_rating",
+)
+
+def _col(team: np.ndarray, name: str) -> np.ndarray:
+    return team[:, TEAM_STATS + STAT_INDEX[name]]
+
+def load_team_matrix(db: Session, season: int) -> np.ndarray:
+    """
+    Box score de cada time em cada jogo da temporada, ordenado por (jogo, time).
+    """
+    table = TeamStatistics.__table__
+    games = Game.__table__
+    matrix = load_matrix(db, select(
+        table.c.game_id,
+        table.c.team_id,
+        func.coalesce(extract("epoch", games.c.game_date), 0),
+        cast(table.c.team_id == games.c.home_team_id, Integer),
+        cast(func.parse_minutes(table.c.min_played), Float),
+        *(func.coalesce(table.c[name], 0) for name in STAT_COLUMNS),
+    ).select_from(table.join(games, games.c.source_id == table.c.game_id)).where(table.c.season == season))
+    return matrix[np.lexsort((matrix[:, TEAM], matrix[:, GAME]))]
+
+def opponent_rows(team: np.ndarray) -> np.ndarray:
+    """
+    Índice da linha do adversário (mesmo game_id) para cada linha; -1 quando o jogo não tem as duas.
+    """
+    opponent = np.full(len(team), -1, dtype=np.int64)
+    if len(team) < 2:
+        return opponent
+    paired = np.flatnonzero(team[1:, GAME] == team[:-1, GAME])
+    opponent[paired] = paired + 1
+    opponent[paired + 1] = paired
+    return opponent
+
+def estimate_possessions(team: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+    """
+    Posses do jogo (fórmula do Basketball-Reference): média das estimativas dos dois times, com o
+    rebote ofensivo ponderado pela disputa contra os rebotes defensivos do adversário.
+    """
+    has_opponent = opponent >= 0
+    other = np.where(has_opponent, opponent, np.arange(len(team)))
+    fga, fgm, fta = _col(team, "fga"), _col(team, "fgm"), _col(team, "fta")
+    off_reb, def_reb, turnovers = _col(team, "off_reb"), _col(team, "def_reb"), _col(team, "turnovers")
+    offensive_share = ratio(off_reb, off_reb + def_reb[other])
+    own = fga + 0.4 * fta - 1.07 * offensive_share * (fga - fgm) + turnovers
+    return np.where(has_opponent, 0.5 * (own + own[other]), own)
+
+def compute_team_ratings(team: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    """
+    Ratings por linha, ordenados por (time, data, jogo); "order" mapeia para as linhas de team.
+    """
+    opponent = opponent_rows(team)
+    possessions = estimate_possessions(team, opponent)
+    minutes = np.where(team[:, MINUTES] > 0, team[:, MINUTES], REGULATION_MINUTES)
+    points = _col(team, "points")
+    allowed = np.where(opponent >= 0, points[np.maximum(opponent, 0)], np.nan)
+
+    order = np.lexsort((team[:, GAME], team[:, DATE], team[:, TEAM]))
+    teams = team[order, TEAM].astype(np.int64)
+    starts = group_starts(teams)
+    possessions, minutes, points, allowed = possessions[order], minutes[order], points[order], allowed[order]
+
+    # Janela móvel ponderada por posses: razão das somas, não média das razões de cada jogo
+    has_allowed = ~np.isnan(allowed)
+    rolling = rolling_sum(np.column_stack([
+        possessions, minutes, points, np.nan_to_num(allowed), np.where(has_allowed, possessions, 0.0),
+    ]), starts, window)
+    rolling_off = ratio(100.0 * rolling[:, 2], rolling[:, 0], fill=np.nan)
+    rolling_def = ratio(100.0 * rolling[:, 3], rolling[:, 4], fill=np.nan)
+    off_rating = ratio(100.0 * points, possessions, fill=np.nan)
+    def_rating = np.where(has_allowed, ratio(100.0 * np.nan_to_num(allowed), possessions, fill=np.nan), np.nan)
+
+    return {
+        "order": order,
+        "opponent_id": np.where(opponent[order] >= 0, team[np.maximum(opponent, 0), TEAM][order], np.nan),
+        "game_number": np.arange(len(order)) - group_first_row(starts, len(order)) + 1,
+        "minutes": minutes,
+        "possessions": possessions,
+        "pace": ratio(48.0 * possessions, minutes / 5.0, fill=np.nan),
+        "off_rating": off_rating,
+        "def_rating": def_rating,
+        "net_rating": off_rating - def_rating,
+        "rolling_pace": ratio(48.0 * rolling[:, 0], rolling[:, 1] / 5.0, fill=np.nan),
+        "rolling_off_rating": rolling_off,
+        "rolling_def_rating": rolling_def,
+        "rolling_net_rating": rolling_off - rolling_def,
+    }
+
+def _rows_to_write(keys: np.ndarray, games: np.ndarray, teams: np.ndarray, stored: np.ndarray) -> np.ndarray:
+    # Linhas novas e a do adversário no mesmo jogo (o box score que faltava muda posses, adversário e
+    # DRtg dela); depois, no mesmo time, todos os jogos a partir do primeiro marcado (número e janela mudam)
+    new = ~np.isin(keys, stored)
+    new |= np.isin(games, games[new])
+    seen = np.cumsum(new)
+    first = group_first_row(group_starts(teams), len(new))
+    return seen - seen[first] + new[first] > 0
+
+def _value(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+def refresh_team_ratings(db: Session, seasons: Iterable[int], full: bool = False) -> Dict[int, int]:
+    """
+    Grava os ratings dos jogos ainda ausentes em team_game_ratings (ou da temporada inteira com full=True).
+    """
+    table = TeamGameRating.__table__
+    window = settings.analytics_rolling_window
+    written: Dict[int, int] = {}
+    for season in sorted(set(seasons)):
+        start = time.perf_counter()
+        team = load_team_matrix(db, season)
+        ratings = compute_team_ratings(team, window)
+        order = ratings["order"]
+        games = team[order, GAME].astype(np.int64)
+        teams = team[order, TEAM].astype(np.int64)
+        keys = games * (1 << 24) + teams
+
+        if full:
+            db.execute(table.delete().where(table.c.season == season))
+            selected = np.ones(len(order), dtype=bool)
+        else:
+            stored = np.array([
+                game_id * (1 << 24) + team_id
+                for game_id, team_id in db.execute(select(table.c.game_id, table.c.team_id).where(table.c.season == season))
+            ], dtype=np.int64)
+            selected = _rows_to_write(keys, games, teams, stored)
+
+        payloads: List[Dict[str, Any]] = []
+        for index in np.flatnonzero(selected):
+            row = team[order[index]]
+            payloads.append({
+                "team_id": int(teams[index]),
+                "season": season,
+                "game_id": int(games[index]),
+                "opponent_id": None if np.isnan(ratings["opponent_id"][index]) else int(ratings["opponent_id"][index]),
+                "game_date": datetime.fromtimestamp(row[DATE], tz=timezone.utc) if row[DATE] else None,
+                "is_home": bool(row[HOME]),
+                "game_number": int(ratings["game_number"][index]),
+                **{name: _value(ratings[name][index]) for name in RATING_COLUMNS},
+            })
+        upsert_bulk(db=db, model=TeamGameRating, payloads=payloads, unique_key=["team_id", "game_id"])
+        db.commit()
+        if payloads:
+            invalidate_cache([season_tag(season)])
+        written[season] = len(payloads)
+        logger.info(f"Ratings de times da temporada {season}: {len(payloads)} linhas gravadas em {time.perf_counter() - start:.2f}s.")
+    return written
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Atualiza os ratings de times por jogo (pace, ORtg, DRtg, net).")
+    parser.add_argument("--season", type=int, action="append", required=True, help="Temporada (pode repetir).")
+    parser.add_argument("--full", action="store_true", help="Recalcula a temporada inteira, não só os jogos novos.")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        written = refresh_team_ratings(db, args.season, full=args.full)
+    finally:
+        db.close()
+    print(json.dumps(written, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
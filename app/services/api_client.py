@@ -4,6 +4,7 @@ import time
 from typing import Dict, Any, Optional
 
 from app.core.config import get_settings
+from app.core.metrics import API_CLIENT_DURATION, API_CLIENT_REQUESTS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,17 +27,22 @@ class ApiClient:
         url = f"{self.base_url}/{endpoint}"
         attempt = 0
         while attempt < retries:
+            start = time.perf_counter()
             try:
                 response = requests.get(url, headers=self.headers, params=params, timeout=15)
                 response.raise_for_status()
                 data = response.json()
+                API_CLIENT_DURATION.labels(endpoint).observe(time.perf_counter() - start)
                 
                 if data and "response" in data:
+                    API_CLIENT_REQUESTS.labels(endpoint, "success").inc()
                     return data["response"]
                 else:
+                    API_CLIENT_REQUESTS.labels(endpoint, "empty").inc()
                     logger.warning(f"Resposta da API para {url} com params {params} não continha a chave 'response'.")
                     return None          
             except requests.exceptions.RequestException as e:
+                API_CLIENT_REQUESTS.labels(endpoint, "error").inc()
                 logger.error(f"Tentativa {attempt + 1} falhou para {url}: {e}")
                 attempt += 1
                 time.sleep(10)
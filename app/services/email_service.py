@@ -1,87 +1,96 @@
 import logging
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-from pydantic import EmailStr
-from typing import List
+from dataclasses import dataclass
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import Any, Dict
+from jinja2 import Environment, StrictUndefined, Template
+from sqlalchemy.orm import Session
 
-from app.core import security 
+from app.core import security
 from app.core.config import get_settings
+from app.models.email_models import EmailOutbox, EmailStatus
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.mail_username,
-    MAIL_PASSWORD=settings.mail_password,
-    MAIL_FROM=settings.mail_from,
-    MAIL_PORT=settings.mail_port,
-    MAIL_SERVER=settings.mail_server,
-    MAIL_STARTTLS=settings.mail_starttls,
-    MAIL_SSL_TLS=settings.mail_ssl_tls,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True
-)
+# As rotas só gravam a mensagem na fila (email_outbox); quem renderiza e envia é o worker
+# (python -m app.services.email_worker), com conexões SMTP reaproveitadas.
 
-async def send_verification_email(email: EmailStr, token: str):
-    # Exemplo: verification_url = f"http://seu-frontend.com/verify-email?token={token}"
-    verification_url = f"http://localhost:8000{settings.api_v1_str}/users/verify-email?token={token}" 
-    
-    html = f"""
-    <html>
-    <body>
-        <h1>Verifique seu endereço de e-mail</h1>
-        <p>Obrigado por se registrar na Plataforma de Dados NBA! Por favor, clique no link abaixo para verificar seu e-mail e ativar sua conta:</p>
-        <a href="{verification_url}" style="display: inline-block; padding: 10px 20px; background-color: #007bff; color: white; text-decoration: none; border-radius: 5px;">
-            Verificar E-mail
-        </a>
-        <p>Este link expirará em {settings.email_verification_token_expire_minutes // 60} horas.</p> 
-        <p>Se você não se registrou, por favor ignore este e-mail.</p>
-    </body>
-    </html>
-    """
+VERIFICATION_TEMPLATE = """
+<html>
+<body>
+    <h1>Verifique seu endereço de e-mail</h1>
+    <p>Obrigado por se registrar na Plataforma de Dados NBA! Por favor, clique no link abaixo para verificar seu e-mail e ativar sua conta:</p>
+    <a href="{{ base_url }}{{ api_v1_str }}/users/verify-email?token={{ token }}" style="display: inline-block; padding: 10px 20px; background-color: #007bff; color: white; text-decoration: none; border-radius: 5px;">
+        Verificar E-mail
+    </a>
+    <p>Este link expirará em {{ expire_hours }} horas.</p>
+    <p>Se você não se registrou, por favor ignore este e-mail.</p>
+</body>
+</html>
+"""
 
-    message = MessageSchema(
-        subject="Verificação de E-mail - NBA SCORE",
-        recipients=[email],
-        body=html,
-        subtype="html",
-        sender=(settings.mail_from_name, settings.mail_from)
-    )
+PASSWORD_RESET_TEMPLATE = """
+<html>
+<body>
+    <h1>Reset da sua Senha</h1>
+    <p>Você solicitou um reset de senha. Clique no link abaixo para definir uma nova senha:</p>
+    <a href="{{ base_url }}{{ api_v1_str }}/auth/reset-password-form?token={{ token }}" style="display: inline-block; padding: 10px 20px; background-color: #ffc107; color: black; text-decoration: none; border-radius: 5px;">
+        Resetar Senha
+    </a>
+    <p>Este link expirará em {{ expire_minutes }} minutos.</p>
+    <p>Se você não solicitou este reset, por favor ignore este e-mail.</p>
+</body>
+</html>
+"""
 
-    fm = FastMail(conf)
-    try:
-        await fm.send_message(message)
-        logging.info(f"E-mail de verificação enviado para {email}")
-    except Exception as e:
-        logging.error(f"Falha ao enviar e-mail de verificação para {email}: {e}")
+@dataclass(frozen=True)
+class EmailTemplate:
+    subject: str
+    html: Template
 
-async def send_password_reset_email(email: EmailStr, token: str):
-    # Exemplo: reset_url = f"http://seu-frontend.com/reset-password?token={token}"
-    reset_url = f"http://localhost:8000{settings.api_v1_str}/auth/reset-password-form?token={token}"
+# Compilados uma única vez, na importação; o worker só chama render()
+_environment = Environment(autoescape=True, undefined=StrictUndefined)
+_environment.globals.update(
+    base_url="http://localhost:8000",
+    api_v1_str=settings.api_v1_str,
+    expire_hours=settings.email_verification_token_expire_minutes // 60,
+    expire_minutes=security.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES,
+)
 
-    html = f"""
-    <html>
-    <body>
-        <h1>Reset da sua Senha</h1>
-        <p>Você solicitou um reset de senha. Clique no link abaixo para definir uma nova senha:</p>
-        <a href="{reset_url}" style="display: inline-block; padding: 10px 20px; background-color: #ffc107; color: black; text-decoration: none; border-radius: 5px;">
-            Resetar Senha
-        </a>
-        <p>Este link expirará em {security.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES} minutos.</p> 
-        <p>Se você não solicitou este reset, por favor ignore este e-mail.</p>
-    </body>
-    </html>
-    """
+TEMPLATES: Dict[str, EmailTemplate] = {
+    "verification": EmailTemplate("Verificação de E-mail - NBA SCORE", _environment.from_string(VERIFICATION_TEMPLATE)),
+    "password_reset": EmailTemplate("Reset de Senha - NBA SCORE", _environment.from_string(PASSWORD_RESET_TEMPLATE)),
+}
 
-    message = MessageSchema(
-        subject="Reset de Senha - NBA SCORE",
-        recipients=[email],
-        body=html,
-        subtype="html",
-        sender=(settings.mail_from_name, settings.mail_from)
+def render_email(recipient: str, template: str, context: Dict[str, Any]) -> EmailMessage:
+    email_template = TEMPLATES[template]
+    message = EmailMessage()
+    message["From"] = formataddr((settings.mail_from_name, settings.mail_from))
+    message["To"] = recipient
+    message["Subject"] = email_template.subject
+    message.set_content(email_template.html.render(**context), subtype="html")
+    return message
+
+def queue_email(db: Session, recipient: str, template: str, context: Dict[str, Any]) -> EmailOutbox:
+    if template not in TEMPLATES:
+        raise ValueError(f"Template de e-mail desconhecido: {template}")
+    email = EmailOutbox(
+        recipient=recipient,
+        template=template,
+        context=context,
+        status=EmailStatus.PENDING.value,
+        attempts=0,
     )
+    db.add(email)
+    db.flush()
+    email_id = email.id
+    db.commit()
+    logger.info(f"E-mail '{template}' enfileirado (id {email_id}).")
+    return email
+
+def queue_verification_email(db: Session, email: str, token: str) -> EmailOutbox:
+    return queue_email(db, email, "verification", {"token": token})
 
-    fm = FastMail(conf)
-    try:
-        await fm.send_message(message)
-        logging.info(f"E-mail de reset de senha enviado para {email}")
-    except Exception as e:
-        logging.error(f"Falha ao enviar e-mail de reset para {email}: {e}")
+def queue_password_reset_email(db: Session, email: str, token: str) -> EmailOutbox:
+    return queue_email(db, email, "password_reset", {"token": token})
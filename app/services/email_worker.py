@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+import aiosmtplib
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.email_models import EmailOutbox, EmailStatus
+from app.services.email_service import TEMPLATES, render_email
+
+logging.basicConfig(level=logging.INFO)
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Worker da fila de e-mails: reserva lotes com FOR UPDATE SKIP LOCKED (vários workers podem rodar
+# em paralelo), envia pelo pool de conexões SMTP e reagenda as falhas com backoff exponencial.
+# Uso: python -m app.services.email_worker [--once] [--batch-size 50]
+# Para testar sem um provedor real, aponte MAIL_SERVER/MAIL_PORT para um SMTP local
+# (ex.: python -m aiosmtpd -n -l localhost:1025) com MAIL_STARTTLS=false.
+
+SMTPFactory = Callable[[], Awaitable[aiosmtplib.SMTP]]
+
+async def connect_smtp() -> aiosmtplib.SMTP:
+    smtp = aiosmtplib.SMTP(
+        hostname=settings.mail_server,
+        port=settings.mail_port,
+        use_tls=settings.mail_ssl_tls,
+        start_tls=settings.mail_starttls,
+        timeout=settings.email_smtp_timeout_seconds,
+    )
+    await smtp.connect()
+    if settings.mail_username:
+        await smtp.login(settings.mail_username, settings.mail_password)
+    return smtp
+
+class SMTPPool:
+    """
+    Pool de conexões SMTP abertas e autenticadas uma vez e reaproveitadas entre mensagens e lotes.
+    O tamanho do pool limita quantos envios acontecem ao mesmo tempo.
+    """
+    def __init__(self, size: int, factory: Optional[SMTPFactory] = None):
+        self.size = size
+        self._factory = factory or connect_smtp
+        # Uma vaga por envio em andamento: conexão devolvida ou descartada libera a vaga para quem espera
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[aiosmtplib.SMTP] = []
+        self.connections_opened = 0
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        await self._slots.acquire()
+        while self._idle:
+            smtp = self._idle.pop()
+            if smtp.is_connected:
+                return smtp
+            # Servidor encerrou a sessão ociosa: segue para a próxima ou reconecta no lugar
+            smtp.close()
+        try:
+            smtp = await self._factory()
+        except BaseException:
+            self._slots.release()
+            raise
+        self.connections_opened += 1
+        return smtp
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        smtp = await self._acquire()
+        try:
+            yield smtp
+        except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, aiosmtplib.SMTPTimeoutError, OSError):
+            # Conexão em estado desconhecido: descartada, a próxima aquisição abre outra
+            smtp.close()
+            raise
+        except BaseException:
+            self._idle.append(smtp)
+            raise
+        else:
+            self._idle.append(smtp)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        while self._idle:
+            smtp = self._idle.pop()
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
+
+def _is_permanent(error: Exception) -> bool:
+    # Respostas 5xx (destinatário inexistente, mensagem recusada) não melhoram com nova tentativa
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(500 <= refusal.code < 600 for refusal in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 500 <= error.code < 600
+    # Template removido/renomeado desde o enfileiramento
+    return isinstance(error, KeyError)
+
+def claim_batch(db: Session, batch_size: int) -> List[Tuple[int, str, str, Dict[str, Any], int]]:
+    """
+    Reserva até batch_size e-mails vencidos (status 'sending'). Reservas mais antigas que o lease
+    são de um worker que caiu no meio do envio e voltam a ser elegíveis; o envio interrompido conta
+    como tentativa, e a mensagem que já esgotou email_max_attempts vai para 'failed' em vez de voltar.
+    """
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=settings.email_lease_seconds)
+    stmt = (
+        select(EmailOutbox.id, EmailOutbox.recipient, EmailOutbox.template, EmailOutbox.context, EmailOutbox.attempts, EmailOutbox.status)
+        .where(or_(
+            and_(EmailOutbox.status == EmailStatus.PENDING.value, EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == EmailStatus.SENDING.value, EmailOutbox.locked_at < stale),
+        ))
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    batch = []
+    pending, reclaimed, exhausted = [], [], []
+    for email_id, recipient, template, context, attempts, email_status in db.execute(stmt):
+        if email_status == EmailStatus.SENDING.value:
+            attempts += 1
+            if attempts >= settings.email_max_attempts:
+                exhausted.append(email_id)
+                continue
+            reclaimed.append(email_id)
+        else:
+            pending.append(email_id)
+        batch.append((email_id, recipient, template, context, attempts))
+
+    if pending:
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(pending))
+            .values(status=EmailStatus.SENDING.value, locked_at=now)
+        )
+    if reclaimed:
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(reclaimed))
+            .values(status=EmailStatus.SENDING.value, locked_at=now, attempts=EmailOutbox.attempts + 1)
+        )
+    if exhausted:
+        logger.warning(f"{len(exhausted)} e-mails com reserva expirada esgotaram as tentativas e foram marcados como falha.")
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(exhausted))
+            .values(
+                status=EmailStatus.FAILED.value,
+                locked_at=None,
+                attempts=EmailOutbox.attempts + 1,
+                last_error="Reserva expirada: o worker caiu durante o envio.",
+            )
+        )
+    db.commit()
+    return batch
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.email_retry_base_seconds * 2 ** (attempts - 1))
+
+def record_results(db: Session, sent: List[int], failures: List[Tuple[int, int, Exception]]) -> int:
+    now = datetime.now(timezone.utc)
+    if sent:
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(sent))
+            .values(status=EmailStatus.SENT.value, sent_at=now, locked_at=None, attempts=EmailOutbox.attempts + 1, last_error=None)
+        )
+    failed = 0
+    for email_id, attempts, error in failures:
+        attempts += 1
+        give_up = _is_permanent(error) or attempts >= settings.email_max_attempts
+        failed += int(give_up)
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == email_id)
+            .values(
+                status=EmailStatus.FAILED.value if give_up else EmailStatus.PENDING.value,
+                attempts=attempts,
+                next_attempt_at=now + _retry_delay(attempts),
+                locked_at=None,
+                last_error=f"{type(error).__name__}: {error}"[:2000],
+            )
+        )
+    db.commit()
+    return failed
+
+async def send_batch(pool: SMTPPool, batch: List[Tuple[int, str, str, Dict[str, Any], int]]) -> Tuple[List[int], List[Tuple[int, int, Exception]]]:
+    sent: List[int] = []
+    failures: List[Tuple[int, int, Exception]] = []
+
+    async def deliver(email_id: int, recipient: str, template: str, context: Dict[str, Any], attempts: int) -> None:
+        try:
+            message = render_email(recipient, template, context)
+            async with pool.connection() as smtp:
+                await smtp.send_message(message)
+            sent.append(email_id)
+        except Exception as e:
+            logger.warning(f"Falha ao enviar o e-mail {email_id} ('{template}', tentativa {attempts + 1}): {e}")
+            failures.append((email_id, attempts, e))
+
+    await asyncio.gather(*(deliver(*row) for row in batch))
+    return sent, failures
+
+async def process_batch(db: Session, pool: SMTPPool, batch_size: int) -> Dict[str, int]:
+    batch = claim_batch(db, batch_size)
+    if not batch:
+        return {"claimed": 0, "sent": 0, "retried": 0, "failed": 0}
+    sent, failures = await send_batch(pool, batch)
+    failed = record_results(db, sent, failures)
+    logger.info(f"Lote de e-mails: {len(sent)} enviados, {len(failures) - failed} reagendados, {failed} com falha definitiva.")
+    return {"claimed": len(batch), "sent": len(sent), "retried": len(failures) - failed, "failed": failed}
+
+async def run_worker(
+    db: Session,
+    pool: Optional[SMTPPool] = None,
+    batch_size: Optional[int] = None,
+    once: bool = False,
+) -> Dict[str, int]:
+    """
+    Processa a fila continuamente. Com once=True esvazia os e-mails vencidos e retorna.
+    """
+    pool = pool or SMTPPool(settings.email_pool_size)
+    batch_size = batch_size or settings.email_batch_size
+    totals = {"claimed": 0, "sent": 0, "retried": 0, "failed": 0, "batches": 0}
+    try:
+        while True:
+            result = await process_batch(db, pool, batch_size)
+            for key, value in result.items():
+                totals[key] += value
+            totals["batches"] += int(result["claimed"] > 0)
+            if result["claimed"] < batch_size:
+                if once:
+                    break
+                await asyncio.sleep(settings.email_poll_interval_seconds)
+    finally:
+        await pool.close()
+    totals["connections_opened"] = pool.connections_opened
+    return totals
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Worker da fila de e-mails (email_outbox).")
+    parser.add_argument("--once", action="store_true", help="Envia os e-mails vencidos e encerra.")
+    parser.add_argument("--batch-size", type=int, help="E-mails reservados por lote (padrão: EMAIL_BATCH_SIZE).")
+    args = parser.parse_args(argv)
+
+    logger.info(f"Worker de e-mails iniciado (templates: {', '.join(TEMPLATES)}).")
+    db = SessionLocal()
+    try:
+        totals = asyncio.run(run_worker(db, batch_size=args.batch_size, once=args.once))
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        db.close()
+
+    print(json.dumps(totals, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
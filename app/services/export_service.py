@@ -0,0 +1,87 @@
+import csv
+import io
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+from sqlalchemy import Table, select
+
+from app.core.config import get_settings
+from app.core.database import create_read_session
+from app.core.responses import dumps
+from app.models.game_models import Game, TeamStatistics
+from app.models.player_models import PlayerStatistics
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+EXPORT_TABLES: Dict[str, Table] = {
+    "player_statistics": PlayerStatistics.__table__,
+    "team_statistics": TeamStatistics.__table__,
+    "games": Game.__table__,
+}
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def export_columns(dataset: str) -> List[str]:
+    return [column.name for column in EXPORT_TABLES[dataset].columns]
+
+def iter_batches(dataset: str, season: int, batch_size: int) -> Iterator[Tuple[List[str], Sequence[tuple]]]:
+    """
+    Lê a temporada com cursor do lado do servidor (yield_per): o processo mantém em memória apenas
+    um lote por vez, independentemente do tamanho da exportação.
+    """
+    table = EXPORT_TABLES[dataset]
+    # Sem ORDER BY: leitura sequencial da partição/tabela, sem ordenação da temporada inteira no banco
+    stmt = select(*table.columns).where(table.c.season == season).execution_options(yield_per=batch_size)
+
+    db = create_read_session()
+    exported = 0
+    try:
+        result = db.execute(stmt)
+        keys = list(result.keys())
+        for batch in result.partitions():
+            exported += len(batch)
+            yield keys, batch
+        logger.info(f"Exportação de '{dataset}' da temporada {season} concluída: {exported} linhas.")
+    finally:
+        db.close()
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return value
+
+def stream_ndjson(dataset: str, season: int, batch_size: int) -> Iterator[bytes]:
+    for keys, batch in iter_batches(dataset, season, batch_size):
+        yield b"".join(dumps(dict(zip(keys, row))) + b"\n" for row in batch)
+
+def stream_csv(dataset: str, season: int, batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # O cabeçalho sai antes da primeira consulta: o cliente recebe os primeiros bytes imediatamente
+    writer.writerow(export_columns(dataset))
+    yield buffer.getvalue().encode()
+
+    for _, batch in iter_batches(dataset, season, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+def gzip_stream(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+    # wbits=31 produz o formato gzip; o flush por lote mantém a resposta fluindo
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_stream(dataset: str, season: int, export_format: str, compress: bool = False) -> Iterator[bytes]:
+    stream = stream_csv if export_format == "csv" else stream_ndjson
+    chunks = stream(dataset, season, settings.export_batch_size)
+    return gzip_stream(chunks) if compress else chunks
@@ -4,10 +4,12 @@ from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime, date, timedelta
 
+from app.core.response_cache import invalidate_cache, resource_tags
 from app.services.api_client import ApiClient
-from app.models.game_models import Game,TeamStatistics
+from app.models.game_models import Game, TeamStatistics, FINISHED_GAME_STATUSES
 from app.models.team_models import Team
-from app.repository.ingestion_repository import upsert_bulk
+from app.repository.ingestion_repository import upsert_bulk, group_by_season
+from app.repository.partition_repository import ensure_season_partitions
 from app.schemas.game_schemas import GameCreate, TeamStatisticsCreate
 from app.utils.hashing import generate_payload_hash
 
@@ -29,6 +31,19 @@ def fetch_games_by_date(api_client: ApiClient, date: str) -> Optional[List[Dict[
         logger.error(error_msg)
         return None
 
+def parse_linescore(periods: Optional[List[Any]]) -> Optional[List[int]]:
+    """
+    Pontos por período (4 quartos e prorrogações). A API manda texto ("27"); o primeiro período vazio
+    (ainda não jogado) encerra a lista.
+    """
+    points = []
+    for value in periods or []:
+        try:
+            points.append(int(value))
+        except (TypeError, ValueError):
+            break
+    return points or None
+
 def transform_game_data(game_line: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     transform_game = []    
     for game in game_line:
@@ -67,13 +82,15 @@ def transform_game_data(game_line: List[Dict[str, Any]]) -> List[Dict[str, Any]]
             "visitor_team_id": visitor_team_info.get("id"),
             "home_score": home_score_info.get("points"),
             "visitor_score": visitor_score_info.get("points"),
+            "home_linescore": parse_linescore(home_score_info.get("linescore")),
+            "visitor_linescore": parse_linescore(visitor_score_info.get("linescore")),
             "arena_name": arena_info.get("name"),
             "arena_city": arena_info.get("city"),
             "payload_hash": generate_payload_hash(game)
         }
         if payload_game["home_team_id"] and payload_game["visitor_team_id"]:
             game_schema = GameCreate(**payload_game)
-            transform_game.append(game_schema.model.dump())
+            transform_game.append(game_schema.model_dump())
         else:
             logger.warning(f"Dados incompletos para o jogo ID {game.get('id')}, pulando.")
     return transform_game
@@ -93,7 +110,7 @@ def fetch_game_statistics(api_client: ApiClient, game_id: int) -> Optional[List[
         logger.error(error_msg)
         return None
     
-def transform_team_statistics_data(stats_line: List[Dict[str, Any]], game_source_id: int) -> List[Dict[str, Any]]:
+def transform_team_statistics_data(stats_line: List[Dict[str, Any]], game_source_id: int, season: int) -> List[Dict[str, Any]]:
     transform_stats = []    
     for stats in stats_line:
         team_info = stats.get("team", {})
@@ -109,6 +126,7 @@ def transform_team_statistics_data(stats_line: List[Dict[str, Any]], game_source
         payload_stats = {
                 "team_id": team_id,
                 "game_id": game_source_id,
+                "season": season,
                 "points": stats.get("points"),
                 "fgm": stats.get("fgm"),
                 "fga": stats.get("fga"),
@@ -128,6 +146,7 @@ def transform_team_statistics_data(stats_line: List[Dict[str, Any]], game_source
                 "turnovers": stats.get("turnovers"),
                 "blocks": stats.get("blocks"),
                 "plus_minus": stats.get("plusMinus"),
+                "min_played": stats.get("min"),
                 "fast_break_points": stats.get("fastBreakPoints"),
                 "points_in_paint": stats.get("pointsInPaint"),
                 "biggest_lead": stats.get("biggestLead"),
@@ -138,14 +157,14 @@ def transform_team_statistics_data(stats_line: List[Dict[str, Any]], game_source
             }
         try:
             stats_schema = TeamStatisticsCreate(**payload_stats)
-            transform_stats.append(stats_schema.model.dump())
+            transform_stats.append(stats_schema.model_dump())
         except Exception as e:
             logger.warning(f"Erro ao criar schema para as estatísticas do time ID {team_id} no jogo ID {game_source_id}: {e}")  
             logger.debug(f"Dados de estatísticas problemáticos: {payload_stats}")
     return transform_stats
 
 def ingest_games_for_date(db: Session, api_client: ApiClient, date: str) -> Dict[str, Any]:
-    summary = {"source": "games_and_stats", "date": date, "status": "failure","processed": 0, "processed_stats": 0, "errors": []}
+    summary = {"source": "games_and_stats", "date": date, "status": "failure","processed": 0, "processed_stats": 0, "seasons": [], "errors": []}
     
     list_games = []
     try:
@@ -170,21 +189,31 @@ def ingest_games_for_date(db: Session, api_client: ApiClient, date: str) -> Dict
         for game in transformed_games:
             game_id = game["source_id"]
             
-            if game.get("status") in ["Finished", "Completed", "FT"]:
+            if game.get("status") in FINISHED_GAME_STATUSES:
                 stats_data = fetch_game_statistics(api_client, game_id)
                 if stats_data:
-                    transformed_stats = transform_team_statistics_data(stats_data, game_id)
+                    transformed_stats = transform_team_statistics_data(stats_data, game_id, game["season"])
                     all_stats.extend(transformed_stats)
                 else:
                     logger.debug(f"O jogo ID {game_id} não possui estatísticas para ingestão.")
         if all_stats:
             logger.info(f"Iniciando a ingestão de {len(all_stats)} registros de estatísticas de times para a data {date}.")
-            upsert_bulk(db=db, model=TeamStatistics, payloads=all_stats, unique_key="id")
+            for stats_season, season_payloads in group_by_season(all_stats).items():
+                ensure_season_partitions(db, [stats_season])
+                upsert_bulk(db=db, model=TeamStatistics, payloads=season_payloads, unique_key=["game_id", "team_id", "season"])
             summary["processed_stats"] = len(all_stats)
             logger.info(f"Número de registros de estatísticas ingeridos para a data {date}: {summary['processed_stats']}")
         
         summary["status"] = "sucess"
         db.commit()
+        # Temporadas tocadas pela carga: apenas elas têm os agregados recalculados
+        summary["seasons"] = sorted({game["season"] for game in transformed_games if game.get("season")})
+        invalidate_cache(resource_tags(
+            games=[game["source_id"] for game in transformed_games],
+            teams={team_id for game in transformed_games for team_id in (game["home_team_id"], game["visitor_team_id"])},
+            seasons=summary["seasons"],
+            collections=["games"],
+        ))
     except Exception as e:
         db.rollback()
         error_msg = f"Erro durante a ingestão de jogos e estatísticas para a data {date}: {e}"
@@ -3,13 +3,15 @@ from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime
 
+from app.core.response_cache import invalidate_cache, resource_tags
 from app.services.api_client import ApiClient
 from app.models.player_models import Player, PlayerLeague, PlayerStatistics
 from app.models.team_models import Team
 from app.models.game_models import Game
-from app.repository.ingestion_repository import upsert_bulk
-from app.schemas.player_schemas import PlayerCreate, PlayerLeagueCreate
-from app.schemas.game_schemas import PlayerStatisticsCreate
+from app.repository.ingestion_repository import upsert_bulk, group_by_season
+from app.repository.partition_repository import ensure_season_partitions
+from app.services.analytics.season_cache import invalidate_analytics
+from app.schemas.player_schemas import PlayerCreate, PlayerLeagueCreate, PlayerStatisticsCreate
 from app.utils.hashing import generate_payload_hash
 
 logging.basicConfig(level=logging.INFO)
@@ -104,6 +106,7 @@ def ingest_players(db: Session, api_client: ApiClient, season: int) -> Dict[str,
             upsert_bulk(db=db, model=PlayerLeague, payloads=league_to_upsert, unique_key="id")
         
         db.commit()
+        invalidate_cache(resource_tags(players=[player["source_id"] for player in players_to_upsert], collections=["players"]))
         
         summary["status"] = "success"
         summary["processed"] = len(players_to_upsert)
@@ -133,7 +136,7 @@ def fetch_player_stats(api_client: ApiClient, season: int, player_id: int) -> Op
         logger.error(f"Erro ao buscar estatísticas para o jogador {player_id} na temporada {season}: {e}")
         return None
 
-def transform_player_stats(stats_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def transform_player_stats(stats_data: List[Dict[str, Any]], season: int) -> List[Dict[str, Any]]:
     stats_to_upsert = []
     
     for raw_stat in stats_data:
@@ -141,6 +144,7 @@ def transform_player_stats(stats_data: List[Dict[str, Any]]) -> List[Dict[str, A
             "player_id": raw_stat["player"]["id"],
             "team_id": raw_stat["team"]["id"],
             "game_id": raw_stat["game"]["id"],
+            "season": season,
             "points": raw_stat.get("points"),
             "position": raw_stat.get("pos"),
             "min_played": raw_stat.get("min"),
@@ -170,8 +174,9 @@ def transform_player_stats(stats_data: List[Dict[str, Any]]) -> List[Dict[str, A
     return stats_to_upsert
 
 def ingest_player_stats(db: Session, api_client: ApiClient, season: int) -> Dict[str, Any]:    
-    summary = {"source": "player_stats", "season": season, "status": "failure", "processed": 0, "errors": []}
+    summary = {"source": "player_stats", "season": season, "status": "failure", "processed": 0, "seasons": [], "changed_seasons": [], "errors": []}
     stats_to_upsert = []
+    changed_seasons = []
     
     try:
         players_in_db = db.query(Player).all()
@@ -184,17 +189,34 @@ def ingest_player_stats(db: Session, api_client: ApiClient, season: int) -> Dict
         for player in players_in_db:
             stats_data = fetch_player_stats(api_client, season, player.source_id)
             if stats_data:
-                transformed_stats = transform_player_stats(stats_data)
+                transformed_stats = transform_player_stats(stats_data, season)
                 stats_to_upsert.extend(transformed_stats)
 
         if stats_to_upsert:
             logger.info(f"Inserindo/atualizando {len(stats_to_upsert)} registros de estatísticas de jogadores...")
-            upsert_bulk(db=db, model=PlayerStatistics, payloads=stats_to_upsert, unique_key="id")
+            for stats_season, season_payloads in group_by_season(stats_to_upsert).items():
+                ensure_season_partitions(db, [stats_season])
+                changed = upsert_bulk(
+                    db=db, model=PlayerStatistics, payloads=season_payloads,
+                    unique_key=["player_id", "game_id", "season"], skip_unchanged=True,
+                )
+                if changed:
+                    changed_seasons.append(stats_season)
         
         db.commit()
         
         summary["status"] = "success"
         summary["processed"] = len(stats_to_upsert)
+        summary["seasons"] = sorted(group_by_season(stats_to_upsert))
+        summary["changed_seasons"] = sorted(changed_seasons)
+        invalidate_cache(resource_tags(
+            games={stats["game_id"] for stats in stats_to_upsert},
+            teams={stats["team_id"] for stats in stats_to_upsert},
+            players={stats["player_id"] for stats in stats_to_upsert},
+            seasons=summary["seasons"],
+        ))
+        # Só as temporadas com payload_hash novo: reingestão sem mudança mantém o analytics em cache
+        invalidate_analytics(summary["changed_seasons"])
         logger.info(f"Ingestão de estatísticas de jogadores concluída com sucesso para a temporada {season}.")
     
     except Exception as e:
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.services.api_client import ApiClient
 from app.repository.ingestion_repository import upsert_bulk
+from app.repository.partition_repository import ensure_season_partitions
 from app.models.season_models import Season
 from app.schemas.season_schemas import SeasonCreate
 
@@ -55,6 +56,7 @@ def ingest_seasons(db: Session, api_client: ApiClient) -> Dict[str, Any]:
         if seasons_data:
             transformed_seasons = transform_season_data(seasons_data)
             upsert_seasons(db, transformed_seasons)
+            ensure_season_partitions(db, [season["season"] for season in transformed_seasons])
             
             db.commit()
             
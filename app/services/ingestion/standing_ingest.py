@@ -3,6 +3,7 @@ import time
 from typing import Any, Dict, Optional, List
 from sqlalchemy.orm import Session
 
+from app.core.response_cache import invalidate_cache, standings_tag
 from app.services.api_client import ApiClient
 from app.models.standing_models import Standing
 from app.repository.ingestion_repository import upsert_bulk
@@ -48,6 +49,8 @@ def transfrom_standings_data(standings_data: List[Dict[str, Any]], league_id: in
             "games_behind": record.get("gamesBehind"),
             "streak": record.get("streak"),
             "win_streak": record.get("winStreak"),
+            # A API não tem id próprio para a linha de classificação: o time a identifica na liga/temporada
+            "source_id": team_info.get("id"),
             "payload_hash": generate_payload_hash(record)
         }
         
@@ -68,7 +71,7 @@ def upsert_standings(db: Session, standings: List[Dict[str, Any]]) -> None:
         return
     
     try:
-        upsert_bulk(db_session=db, model=Standing, payloads=standings, unique_key="id")
+        upsert_bulk(db=db, model=Standing, payloads=standings, unique_key=["league_id", "season", "team_id"])
         logger.info(f"Upsert concluído para {len(standings)} registros de standings.")
     except Exception as e:
         logger.error(f"Erro ao realizar upsert dos standings: {e}")
@@ -86,6 +89,7 @@ def ingest_standings(db: Session, api_client: ApiClient, league_id: int, season:
             return summary
         upsert_standings(db, [standing.dict() for standing in transformed_standings])
         db.commit()
+        invalidate_cache([standings_tag(season)])
         
         summary["status"] = "success"
         summary["processed"] = len(transformed_standings)
@@ -2,6 +2,7 @@ import logging
 from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 
+from app.core.response_cache import invalidate_cache, resource_tags
 from app.services.api_client import APIClient
 from app.models.team_models import Team, TeamLeague, TeamSeasonStatistics
 from app.repository.ingestion_repository import upsert_bulk
@@ -96,6 +97,7 @@ def ingest_teams(db: Session, api_client: APIClient) -> Dict[str, Any]:
             upsert_teams_and_leagues(db, teams_to_upsert, leagues_to_upsert)
             
             db.commit()
+            invalidate_cache(resource_tags(teams=[team["source_id"] for team in teams_to_upsert], collections=["teams"]))
             
             summary["status"] = "success"
             summary["processed"] = len(teams_to_upsert)
@@ -201,6 +203,7 @@ def ingest_team_season_statistics(db: Session, api_client: APIClient, season: in
             logger.info(f"Upsert concluído para {len(stats_to_upsert)} estatísticas de temporada de times.")
             
             db.commit()
+            invalidate_cache(resource_tags(teams=[stats["team_id"] for stats in stats_to_upsert]))
             
             summary["status"] = "success"
             summary["processed"] = len(stats_to_upsert)
@@ -0,0 +1,340 @@
+import argparse
+import json
+import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.game_models import FINISHED_GAME_STATUSES
+from app.repository.partition_repository import SEASON_PARTITIONED_TABLES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tabelas pequenas (dimensões) em que uma varredura sequencial é o plano esperado
+SMALL_TABLES = {"seasons", "leagues", "teams", "team_league", "team_season_aggregates"}
+
+# A carga sintética usa IDs e temporadas fora do intervalo real, e é desfeita ao final (rollback).
+# Dez temporadas deixam a seletividade de "uma temporada" próxima à do banco de produção.
+AUDIT_ID_OFFSET = 900_000_000
+AUDIT_SEASONS = tuple(range(2090, 2100))
+AUDIT_TEAMS = 30
+AUDIT_PLAYERS_PER_TEAM = 15
+AUDIT_PLAYERS_PER_GAME = 10
+AUDIT_GAMES_PER_SEASON = 1230
+
+# Tabelas lidas pelo catálogo; o ANALYZE delas roda antes de toda auditoria, com ou sem --seed
+AUDITED_TABLES = ("seasons", "leagues", "teams", "players", "games", "player_statistics", "team_statistics",
+                  "player_season_statistics", "team_season_aggregates", "users")
+
+# Abaixo disso a varredura sequencial é o plano certo mesmo com índice (a tabela cabe em poucas páginas),
+# então um Seq Scan não é cobrado: acontece com as partições vazias de temporadas sem estatísticas
+MIN_AUDITED_ROWS = 1000
+
+@dataclass
+class AuditQuery:
+    name: str
+    sql: str
+    description: str
+    allow_seq_scan: Tuple[str, ...] = ()
+
+@dataclass
+class AuditResult:
+    name: str
+    execution_ms: float
+    node_types: List[str]
+    indexes: List[str]
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    heap_fetches: int
+    seq_scans: List[str]
+    regressions: List[str] = field(default_factory=list)
+    small_seq_scans: List[str] = field(default_factory=list)
+
+_FINISHED = ", ".join(f"'{status}'" for status in FINISHED_GAME_STATUSES)
+
+# Catálogo com as consultas reais da aplicação (leitura e ingestão)
+QUERY_CATALOGUE = [
+    AuditQuery(
+        "jogos_por_data",
+        "SELECT source_id, season, status FROM games "
+        "WHERE game_date >= CAST(:game_day AS date) AND game_date < CAST(:game_day AS date) + 1 ORDER BY game_date",
+        "Jogos de um dia (ingestão diária e agenda).",
+    ),
+    AuditQuery(
+        "calendario_time_temporada",
+        "SELECT source_id, game_date, home_team_id, visitor_team_id, home_score, visitor_score FROM games "
+        "WHERE season = :season AND (home_team_id = :team_id OR visitor_team_id = :team_id) ORDER BY game_date",
+        "Todos os jogos de um time na temporada, em ordem de data.",
+    ),
+    AuditQuery(
+        "jogos_em_casa_temporada",
+        "SELECT game_date, source_id, visitor_team_id, home_score, visitor_score FROM games "
+        "WHERE season = :season AND home_team_id = :team_id ORDER BY game_date",
+        "Jogos em casa de um time na temporada (index-only).",
+    ),
+    AuditQuery(
+        "resultados_temporada",
+        "SELECT source_id, game_date, home_team_id, visitor_team_id, home_score, visitor_score FROM games "
+        f"WHERE season = :season AND status IN ({_FINISHED}) ORDER BY game_date",
+        "Resultados encerrados da temporada (classificação, ratings).",
+    ),
+    AuditQuery(
+        "historico_jogador_temporada",
+        "SELECT game_id, team_id, min_played, points, tot_reb, assists FROM player_statistics "
+        "WHERE season = :season AND player_id = :player_id ORDER BY game_id",
+        "Histórico jogo a jogo de um jogador na temporada.",
+    ),
+    AuditQuery(
+        "box_score_jogo",
+        "SELECT player_id, team_id, min_played, points, tot_reb, assists FROM player_statistics "
+        "WHERE season = :season AND game_id = :game_id",
+        "Box score dos jogadores de um jogo.",
+    ),
+    AuditQuery(
+        "estatisticas_times_jogo",
+        "SELECT team_id, points, fgm, fga, tot_reb, assists FROM team_statistics "
+        "WHERE season = :season AND game_id = :game_id",
+        "Estatísticas dos dois times em um jogo.",
+    ),
+    AuditQuery(
+        "agregado_jogador_temporada",
+        "SELECT * FROM player_season_statistics WHERE player_id = :player_id AND season = :season",
+        "Agregado de temporada de um jogador.",
+    ),
+    AuditQuery(
+        "agregado_time_temporada",
+        "SELECT * FROM team_season_aggregates WHERE team_id = :team_id AND season = :season",
+        "Agregado de temporada de um time.",
+    ),
+    AuditQuery(
+        "usuario_por_email",
+        "SELECT id, email, password_hash, is_active, is_verified FROM users WHERE email = :email",
+        "Login e autenticação.",
+    ),
+    AuditQuery(
+        "times_franquia_nba",
+        "SELECT source_id FROM teams WHERE is_nba_franchise = true",
+        "Times usados pela ingestão de jogadores.",
+    ),
+    AuditQuery(
+        "jogadores_para_estatisticas",
+        "SELECT source_id FROM players",
+        "Jogadores percorridos pela ingestão de estatísticas (leitura completa intencional).",
+        allow_seq_scan=("players",),
+    ),
+]
+
+def seed_database(db: Session) -> None:
+    """
+    Popula o banco com uma carga sintética no volume de uma temporada real da NBA.
+    Roda na mesma transação da auditoria e é descartada no rollback final.
+    """
+    offset = AUDIT_ID_OFFSET
+    params = {
+        "offset": offset,
+        "teams": AUDIT_TEAMS,
+        "per_team": AUDIT_PLAYERS_PER_TEAM,
+        "per_game": AUDIT_PLAYERS_PER_GAME,
+        "games": AUDIT_GAMES_PER_SEASON,
+        "first_season": AUDIT_SEASONS[0],
+        "last_season": AUDIT_SEASONS[-1],
+    }
+    logger.info(f"Populando o banco com a carga sintética das temporadas {list(AUDIT_SEASONS)}.")
+
+    db.execute(text("INSERT INTO seasons (season) SELECT generate_series(:first_season, :last_season) ON CONFLICT DO NOTHING"), params)
+    db.execute(text("INSERT INTO leagues (source_id, name) VALUES (:offset, 'auditoria') ON CONFLICT DO NOTHING"), params)
+    db.execute(text(
+        "INSERT INTO teams (source_id, name, code, is_nba_franchise) "
+        "SELECT :offset + t, 'Auditoria ' || t, 'A' || t, true FROM generate_series(1, :teams) t ON CONFLICT DO NOTHING"
+    ), params)
+    db.execute(text(
+        "INSERT INTO players (source_id, first_name, last_name) "
+        "SELECT :offset + p, 'Jogador', 'Auditoria ' || p FROM generate_series(1, :teams * :per_team) p ON CONFLICT DO NOTHING"
+    ), params)
+    for season in AUDIT_SEASONS:
+        for table in SEASON_PARTITIONED_TABLES:
+            db.execute(text("SELECT create_season_partition(:table, :season)"), {"table": table, "season": season})
+
+    # O mandante gira entre os times e o visitante fica a uma distância de 1 a 29 posições
+    db.execute(text("""
+        INSERT INTO games (source_id, league_id, season, game_date, status, home_team_id, visitor_team_id, home_score, visitor_score)
+        SELECT :offset + (s - :first_season) * 10000 + g, :offset, s,
+               make_timestamptz(s, 10, 20, 19, 0, 0) + (g / 8) * interval '1 day',
+               CASE WHEN s = :last_season AND g > :games * 0.9 THEN 'Scheduled' ELSE 'Finished' END,
+               :offset + 1 + g % :teams,
+               :offset + 1 + (g % :teams + 1 + (g / :teams) % (:teams - 1)) % :teams,
+               90 + (random() * 40)::int, 90 + (random() * 40)::int
+        FROM generate_series(:first_season, :last_season) s, generate_series(1, :games) g
+        ON CONFLICT DO NOTHING
+    """), params)
+    db.execute(text(f"""
+        INSERT INTO team_statistics (season, game_id, team_id, points, fgm, fga, tot_reb, assists, min_played)
+        SELECT g.season, g.source_id, side.team_id, side.score, 40, 88, 44, 25, '240:00'
+        FROM games g
+        CROSS JOIN LATERAL (VALUES (g.home_team_id, g.home_score), (g.visitor_team_id, g.visitor_score)) AS side(team_id, score)
+        WHERE g.league_id = :offset AND g.status IN ({_FINISHED})
+    """), params)
+    db.execute(text(f"""
+        INSERT INTO player_statistics (season, player_id, team_id, game_id, points, min_played, tot_reb, assists, steals, blocks, turnovers)
+        SELECT g.season, :offset + (side.team_id - :offset - 1) * :per_team + slot, side.team_id, g.source_id,
+               (random() * 30)::int, (10 + slot * 3) || '\\:00', (random() * 12)::int, (random() * 10)::int,
+               (random() * 3)::int, (random() * 3)::int, (random() * 4)::int
+        FROM games g
+        CROSS JOIN LATERAL (VALUES (g.home_team_id), (g.visitor_team_id)) AS side(team_id)
+        CROSS JOIN generate_series(1, :per_game) slot
+        WHERE g.league_id = :offset AND g.status IN ({_FINISHED})
+    """), params)
+    for season in AUDIT_SEASONS:
+        db.execute(text("SELECT refresh_player_season_statistics(:season), refresh_team_season_aggregates(:season)"), {"season": season})
+
+def analyze_tables(db: Session) -> None:
+    """
+    Atualiza as estatísticas do planejador (e o reltuples usado em explain_query) das tabelas auditadas.
+    Nas tabelas particionadas o ANALYZE também percorre as partições.
+    """
+    for table in AUDITED_TABLES:
+        db.execute(text(f"ANALYZE {table}"))
+
+def relation_rows(db: Session, relations: List[str]) -> Dict[str, int]:
+    """
+    Linhas estimadas (pg_class.reltuples, atualizado pelo ANALYZE) de cada relação, pelo nome.
+    """
+    if not relations:
+        return {}
+    rows = db.execute(text(
+        "SELECT relname, reltuples FROM pg_class WHERE relname = ANY(:relations) AND relkind = 'r'"
+    ), {"relations": relations}).all()
+    return {relname: max(int(reltuples), 0) for relname, reltuples in rows}
+
+def sample_parameters(db: Session) -> Dict[str, Any]:
+    """
+    Escolhe valores reais do banco para os parâmetros do catálogo (a temporada mais recente com jogos).
+    """
+    game = db.execute(text(
+        "SELECT source_id, season, home_team_id, CAST(game_date AS date) AS game_day FROM games "
+        "WHERE game_date IS NOT NULL ORDER BY season DESC, game_date DESC LIMIT 1"
+    )).mappings().first()
+    if not game:
+        raise ValueError("Banco sem jogos: rode a auditoria com --seed.")
+
+    player_id = db.execute(text(
+        "SELECT player_id FROM player_statistics WHERE season = :season LIMIT 1"
+    ), {"season": game["season"]}).scalar()
+    email = db.execute(text("SELECT email FROM users LIMIT 1")).scalar()
+
+    return {
+        "season": game["season"],
+        "team_id": game["home_team_id"],
+        "game_id": game["source_id"],
+        "game_day": game["game_day"],
+        "player_id": player_id or 0,
+        "email": email or "auditoria@example.com",
+    }
+
+def _walk_plan(node: Dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk_plan(child)
+
+def _base_table(relation: str) -> str:
+    # Partições por temporada (player_statistics_2023) são reportadas pela tabela pai
+    for table in SEASON_PARTITIONED_TABLES:
+        if re.fullmatch(rf"{table}_\d{{4}}", relation):
+            return table
+    return relation
+
+def explain_query(db: Session, query: AuditQuery, params: Dict[str, Any]) -> AuditResult:
+    raw = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.sql}"), params).scalar_one()
+    explained = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    plan = explained["Plan"]
+    nodes = list(_walk_plan(plan))
+
+    scanned = sorted({node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"})
+    rows = relation_rows(db, scanned)
+    # Relações sem estatística no pg_class contam como grandes: na dúvida, o Seq Scan é cobrado
+    small = {_base_table(relation) for relation in scanned if rows.get(relation, MIN_AUDITED_ROWS) < MIN_AUDITED_ROWS}
+    seq_scans = sorted({_base_table(relation) for relation in scanned})
+    regressions = [
+        f"Seq Scan em '{table}'"
+        for table in seq_scans
+        if table not in SMALL_TABLES and table not in query.allow_seq_scan and table not in small
+    ]
+    return AuditResult(
+        name=query.name,
+        execution_ms=round(explained.get("Execution Time", 0.0), 3),
+        node_types=[node["Node Type"] for node in nodes],
+        indexes=sorted({node["Index Name"] for node in nodes if "Index Name" in node}),
+        shared_hit_blocks=plan.get("Shared Hit Blocks", 0),
+        shared_read_blocks=plan.get("Shared Read Blocks", 0),
+        heap_fetches=sum(node.get("Heap Fetches", 0) for node in nodes),
+        seq_scans=seq_scans,
+        regressions=regressions,
+        small_seq_scans=sorted(small - SMALL_TABLES - set(query.allow_seq_scan)),
+    )
+
+def run_audit(db: Session, seed: bool = False, queries: Optional[List[AuditQuery]] = None) -> List[AuditResult]:
+    """
+    Executa EXPLAIN (ANALYZE, BUFFERS) sobre o catálogo. Tudo roda em uma única transação
+    que é desfeita ao final, então a carga sintética (--seed) não fica no banco. Sem --seed, os planos
+    saem das estatísticas atuais do banco: Seq Scans em partições com menos de MIN_AUDITED_ROWS linhas
+    (temporadas ainda sem estatísticas) são listados, mas não contam como regressão.
+    """
+    try:
+        if seed:
+            seed_database(db)
+        analyze_tables(db)
+        params = sample_parameters(db)
+        logger.info(f"Parâmetros da auditoria: {params}")
+        return [explain_query(db, query, params) for query in (QUERY_CATALOGUE if queries is None else queries)]
+    finally:
+        db.rollback()
+
+def format_report(results: List[AuditResult]) -> str:
+    lines = []
+    for result in results:
+        status = "REGRESSÃO" if result.regressions else "ok"
+        lines.append(
+            f"[{status}] {result.name}: {result.execution_ms} ms, buffers hit={result.shared_hit_blocks} "
+            f"read={result.shared_read_blocks}, heap fetches={result.heap_fetches}"
+        )
+        lines.append(f"    nós: {' > '.join(result.node_types)}")
+        if result.indexes:
+            lines.append(f"    índices: {', '.join(result.indexes)}")
+        for regression in result.regressions:
+            lines.append(f"    !! {regression}")
+        if result.small_seq_scans:
+            lines.append(
+                f"    Seq Scan não avaliado (menos de {MIN_AUDITED_ROWS} linhas): {', '.join(result.small_seq_scans)}; "
+                "rode com --seed para auditar o plano no volume real"
+            )
+    total = sum(1 for result in results if result.regressions)
+    lines.append(f"{len(results)} consultas auditadas, {total} com regressão.")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Auditoria dos planos de execução das consultas da aplicação.")
+    parser.add_argument("--seed", action="store_true", help="Popula (temporariamente) o banco com uma carga sintética.")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON.")
+    parser.add_argument("--query", action="append", help="Audita apenas as consultas informadas (pelo nome).")
+    args = parser.parse_args(argv)
+
+    queries = [query for query in QUERY_CATALOGUE if not args.query or query.name in args.query]
+    db = SessionLocal()
+    try:
+        results = run_audit(db, seed=args.seed, queries=queries)
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps([result.__dict__ for result in results], indent=2, ensure_ascii=False))
+    else:
+        print(format_report(results))
+    return 1 if any(result.regressions for result in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
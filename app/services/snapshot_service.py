@@ -0,0 +1,220 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    JSON, BigInteger, Boolean, Column, Date, DateTime, Float, Integer, Numeric, SmallInteger, Table, func, select
+)
+from sqlalchemy.orm import Session
+
+from app.core.config import BASE_DIR, get_settings
+from app.core.database import create_read_session
+from app.models.game_models import Game, TeamStatistics
+from app.models.player_models import PlayerStatistics
+from app.models.standing_models import Standing
+from app.models.team_models import TeamSeasonStatistics
+
+logging.basicConfig(level=logging.INFO)
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Snapshot colunar (Parquet) das tabelas do warehouse, particionado por temporada no layout Hive:
+#   <snapshot_dir>/<tabela>/season=<ano>/data.parquet
+# Leitura: pyarrow.dataset.dataset("<snapshot_dir>/player_statistics", partitioning="hive")
+# Uso: python -m app.services.snapshot_service [--table games] [--season 2024] [--force]
+
+SNAPSHOT_TABLES: Dict[str, Table] = {
+    "games": Game.__table__,
+    "team_statistics": TeamStatistics.__table__,
+    "player_statistics": PlayerStatistics.__table__,
+    "standings": Standing.__table__,
+    "team_season_statistics": TeamSeasonStatistics.__table__,
+}
+
+# Ordenar cada temporada pela chave de consulta deixa as estatísticas min/max dos row groups
+# seletivas, e o leitor consegue pular row groups inteiros nos filtros por jogo/time
+SORT_KEYS: Dict[str, List[str]] = {
+    "games": ["game_date", "source_id"],
+    "team_statistics": ["game_id", "team_id"],
+    "player_statistics": ["game_id", "player_id"],
+    "standings": ["league_id", "team_id"],
+    "team_season_statistics": ["team_id"],
+}
+
+MANIFEST_NAME = "_manifest.json"
+PARTITION_FILE = "data.parquet"
+
+def snapshot_root() -> Path:
+    root = Path(settings.snapshot_dir)
+    return root if root.is_absolute() else BASE_DIR / root
+
+def arrow_field(column: Column) -> pa.Field:
+    column_type = column.type
+    if isinstance(column_type, BigInteger):
+        arrow_type = pa.int64()
+    elif isinstance(column_type, SmallInteger):
+        arrow_type = pa.int16()
+    elif isinstance(column_type, Integer):
+        arrow_type = pa.int32()
+    elif isinstance(column_type, (Numeric, Float)):
+        # Numeric(5,2) vira float64: é o que NumPy/pandas consomem sem conversão
+        arrow_type = pa.float64()
+    elif isinstance(column_type, Boolean):
+        arrow_type = pa.bool_()
+    elif isinstance(column_type, DateTime):
+        arrow_type = pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    elif isinstance(column_type, Date):
+        arrow_type = pa.date32()
+    else:
+        # String, Text, Enum e JSON (serializado)
+        arrow_type = pa.string()
+    return pa.field(column.name, arrow_type, nullable=column.nullable)
+
+def _converter(column: Column) -> Optional[Callable[[Any], Any]]:
+    if isinstance(column.type, Numeric) and not isinstance(column.type, Float):
+        return lambda value: None if value is None else float(value)
+    if isinstance(column.type, JSON):
+        return lambda value: None if value is None else json.dumps(value, separators=(",", ":"))
+    return None
+
+def snapshot_columns(table: Table) -> List[Column]:
+    # A temporada fica no caminho da partição, não dentro do arquivo
+    return [column for column in table.columns if column.name != "season"]
+
+def season_versions(db: Session, table: Table, seasons: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, Any]]:
+    """
+    Versão atual de cada temporada no banco: max(updated_at) e número de linhas.
+    A contagem detecta exclusões, que não alteram o max(updated_at).
+    """
+    stmt = select(table.c.season, func.max(table.c.updated_at), func.count()).group_by(table.c.season)
+    if seasons is not None:
+        stmt = stmt.where(table.c.season.in_(list(seasons)))
+    return {
+        season: {"max_updated_at": max_updated_at.isoformat() if max_updated_at else None, "rows": rows}
+        for season, max_updated_at, rows in db.execute(stmt)
+    }
+
+def load_manifest(root: Path) -> Dict[str, Dict[str, Any]]:
+    path = root / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def save_manifest(root: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    tmp_path = root / f"{MANIFEST_NAME}.tmp"
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, root / MANIFEST_NAME)
+
+def partition_dir(root: Path, table_name: str, season: int) -> Path:
+    return root / table_name / f"season={season}"
+
+def write_partition(db: Session, table_name: str, season: int, root: Path) -> int:
+    """
+    Reescreve a partição da temporada lendo o banco com cursor do lado do servidor: cada lote
+    lido vira um row group, então a memória fica limitada ao tamanho do row group.
+    """
+    table = SNAPSHOT_TABLES[table_name]
+    columns = snapshot_columns(table)
+    schema = pa.schema([arrow_field(column) for column in columns])
+    converters = [_converter(column) for column in columns]
+    row_group_size = settings.snapshot_row_group_size
+
+    stmt = (
+        select(*columns)
+        .where(table.c.season == season)
+        .order_by(*(table.c[key] for key in SORT_KEYS[table_name]))
+        .execution_options(yield_per=row_group_size)
+    )
+
+    target_dir = partition_dir(root, table_name, season)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = target_dir / f"{PARTITION_FILE}.tmp"
+
+    rows = 0
+    with pq.ParquetWriter(tmp_path, schema, compression=settings.snapshot_compression, write_statistics=True) as writer:
+        for batch in db.execute(stmt).partitions():
+            values = list(zip(*batch))
+            arrays = [
+                pa.array([convert(value) for value in column_values] if convert else column_values, type=field.type)
+                for column_values, convert, field in zip(values, converters, schema)
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema), row_group_size=row_group_size)
+            rows += len(batch)
+
+    # Troca atômica: leitores nunca enxergam uma partição pela metade
+    os.replace(tmp_path, target_dir / PARTITION_FILE)
+    return rows
+
+def run_snapshot(
+    db: Session,
+    root: Optional[Path] = None,
+    tables: Optional[Iterable[str]] = None,
+    seasons: Optional[Iterable[int]] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    root = root or snapshot_root()
+    seasons = sorted(set(seasons)) if seasons is not None else None
+    manifest = load_manifest(root)
+    summary = {"root": str(root), "written": [], "removed": [], "skipped": 0, "rows": 0}
+
+    for table_name in tables or SNAPSHOT_TABLES:
+        table = SNAPSHOT_TABLES[table_name]
+        table_manifest = manifest.setdefault(table_name, {})
+        versions = season_versions(db, table, seasons)
+
+        for season, version in sorted(versions.items()):
+            previous = table_manifest.get(str(season))
+            if not force and previous and {key: previous.get(key) for key in version} == version:
+                summary["skipped"] += 1
+                continue
+
+            rows = write_partition(db, table_name, season, root)
+            table_manifest[str(season)] = {**version, "written_at": datetime.now(timezone.utc).isoformat()}
+            save_manifest(root, manifest)
+            summary["written"].append(f"{table_name}/season={season}")
+            summary["rows"] += rows
+            logger.info(f"Snapshot de '{table_name}' da temporada {season} gravado: {rows} linhas.")
+
+        # Temporadas que sumiram do banco saem do snapshot
+        for season in list(table_manifest):
+            if int(season) not in versions and (seasons is None or int(season) in seasons):
+                shutil.rmtree(partition_dir(root, table_name, int(season)), ignore_errors=True)
+                del table_manifest[season]
+                save_manifest(root, manifest)
+                summary["removed"].append(f"{table_name}/season={season}")
+
+    return summary
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Snapshot incremental das tabelas do warehouse em Parquet.")
+    parser.add_argument("--out", help="Diretório do snapshot (padrão: SNAPSHOT_DIR).")
+    parser.add_argument("--table", action="append", choices=list(SNAPSHOT_TABLES), help="Tabela a exportar (pode repetir).")
+    parser.add_argument("--season", type=int, action="append", help="Temporada a exportar (pode repetir).")
+    parser.add_argument("--force", action="store_true", help="Reescreve as partições mesmo sem mudanças.")
+    args = parser.parse_args(argv)
+
+    db = create_read_session()
+    try:
+        summary = run_snapshot(
+            db,
+            root=Path(args.out) if args.out else None,
+            tables=args.table,
+            seasons=args.season,
+            force=args.force,
+        )
+    finally:
+        db.close()
+
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import logging
+import time
+from typing import Iterable
+from sqlalchemy.orm import Session
+
+from app.core.query_stats import tracked_task
+from app.repository.aggregate_repository import refresh_season_aggregates
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@tracked_task
+def run_season_aggregates_task(db: Session, seasons: Iterable[int]):
+    start_time = time.time()
+    seasons = sorted(set(seasons))
+
+    summary = {
+        "task": "season_aggregates_refresh",
+        "seasons": seasons,
+        "status": "failure",
+        "refreshed_rows": 0,
+        "errors": [],
+        "duration_seconds": 0
+    }
+
+    try:
+        refreshed = refresh_season_aggregates(db, seasons)
+
+        summary["status"] = "success"
+        summary["refreshed_rows"] = sum(sum(tables.values()) for tables in refreshed.values())
+    except Exception as e:
+        db.rollback()
+        error_msg = "Erro durante a atualização dos agregados de temporada: {}".format(str(e))
+        logger.error(error_msg)
+        summary["errors"].append(error_msg)
+
+    end_time = time.time()
+    summary["duration_seconds"] = round(end_time - start_time, 2)
+    logger.info(f"Task terminada: {summary}")
+    return summary
@@ -0,0 +1,63 @@
+import logging
+import time
+from typing import Iterable
+from sqlalchemy.orm import Session
+
+from app.core.query_stats import tracked_task
+from app.services.analytics.advanced_metrics import refresh_advanced_metrics
+from app.services.analytics.elo_ratings import refresh_elo_ratings
+from app.services.analytics.leaderboards import warm_leaderboards
+from app.services.analytics.player_form import refresh_player_form
+from app.services.analytics.playoff_simulator import refresh_playoff_odds
+from app.services.analytics.similarity import refresh_similarity_index
+from app.services.analytics.standings import refresh_standings
+from app.services.analytics.team_analytics import refresh_team_ratings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@tracked_task
+def run_analytics_task(db: Session, seasons: Iterable[int]):
+    start_time = time.time()
+    seasons = sorted(set(seasons))
+
+    summary = {
+        "task": "season_analytics_refresh",
+        "seasons": seasons,
+        "status": "failure",
+        "refreshed_rows": 0,
+        "errors": [],
+        "duration_seconds": 0
+    }
+
+    try:
+        standings = refresh_standings(db, seasons)
+        ratings = refresh_team_ratings(db, seasons)
+        refreshed = refresh_advanced_metrics(db, seasons)
+        form = refresh_player_form(db, seasons)
+        # O Elo não é por temporada: aplica os jogos encerrados ainda fora do histórico
+        elo = refresh_elo_ratings(db)
+        # Depende da classificação e do Elo já atualizados; temporadas sem mudança nas entradas não rodam
+        odds = refresh_playoff_odds(db, seasons)
+        # Na API (ingestão em segundo plano) os quadros de líderes já ficam prontos para o próximo pedido
+        warm_leaderboards(db, seasons)
+        similarity = refresh_similarity_index(db, seasons)
+
+        summary["status"] = "success"
+        summary["standings_games"] = sum(result["games_applied"] for result in standings.values())
+        summary["team_ratings_rows"] = sum(ratings.values())
+        summary["elo_games"] = elo["games"]
+        summary["playoff_odds_seasons"] = [season for season, result in odds.items() if result["status"] == "simulated"]
+        summary["player_form_rows"] = sum(form.values())
+        summary["similarity_seasons"] = similarity["written"]
+        summary["refreshed_rows"] = sum(ratings.values()) + sum(sum(tables.values()) for tables in refreshed.values())
+    except Exception as e:
+        db.rollback()
+        error_msg = "Erro durante a atualização dos analytics de temporada: {}".format(str(e))
+        logger.error(error_msg)
+        summary["errors"].append(error_msg)
+
+    end_time = time.time()
+    summary["duration_seconds"] = round(end_time - start_time, 2)
+    logger.info(f"Task terminada: {summary}")
+    return summary
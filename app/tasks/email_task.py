@@ -0,0 +1,44 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.core.query_stats import tracked_task
+from app.services import email_worker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@tracked_task
+def run_email_outbox_task(db: Session, batch_size: Optional[int] = None):
+    start_time = time.time()
+
+    summary = {
+        "task": "email_outbox",
+        "status": "failure",
+        "sent": 0,
+        "retried": 0,
+        "failed": 0,
+        "errors": [],
+        "duration_seconds": 0
+    }
+
+    try:
+        # Uma passada: envia tudo que está vencido na fila e encerra
+        totals = asyncio.run(email_worker.run_worker(db, batch_size=batch_size, once=True))
+
+        summary["status"] = "success"
+        summary["sent"] = totals["sent"]
+        summary["retried"] = totals["retried"]
+        summary["failed"] = totals["failed"]
+        summary["batches"] = totals["batches"]
+    except Exception as e:
+        error_msg = "Erro ao processar a fila de e-mails: {}".format(str(e))
+        logger.error(error_msg)
+        summary["errors"].append(error_msg)
+
+    end_time = time.time()
+    summary["duration_seconds"] = round(end_time - start_time, 2)
+    logger.info(f"Task terminada: {summary}")
+    return summary
@@ -3,12 +3,16 @@ import time
 from sqlalchemy.orm import Session
 from datetime import date, datetime, timedelta
 
+from app.core.query_stats import tracked_task
 from app.services.api_client import ApiClient
 from app.services.ingestion import game_ingest
+from app.tasks.aggregate_task import run_season_aggregates_task
+from app.tasks.analytics_task import run_analytics_task
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@tracked_task
 def run_daily_game_task(db: Session, api_client: ApiClient, game_date: str):
     date_str = game_date.strftime("%Y-%m-%d")
     start_time = time.time()
@@ -30,6 +34,10 @@ def run_daily_game_task(db: Session, api_client: ApiClient, game_date: str):
         summary["processed_games"] = ingest.get("processed_games", 0)
         summary["processed_teams_stats"] = ingest.get("processed_teams_stats", 0)
         summary["errors"] = ingest.get("errors", [])
+
+        if ingest.get("seasons"):
+            summary["aggregates"] = run_season_aggregates_task(db, ingest["seasons"])
+            summary["analytics"] = run_analytics_task(db, ingest["seasons"])
     except Exception as e:
         error_msg = "Erro durante a ingestão diária do jogo: {}".format(str(e))
         logger.error(error_msg)
@@ -40,6 +48,7 @@ def run_daily_game_task(db: Session, api_client: ApiClient, game_date: str):
     logger.info(f"Task terminada: {summary}")
     return summary
 
+@tracked_task
 def run_historical_game_task(db: Session, api_client: ApiClient, season: int):
     start_time = time.time()
     
@@ -55,6 +64,8 @@ def run_historical_game_task(db: Session, api_client: ApiClient, season: int):
         ingest = game_ingest.ingest_games_for_season(db, api_client, season)
         
         summary["status"] = "success"
+        summary["aggregates"] = run_season_aggregates_task(db, [season])
+        summary["analytics"] = run_analytics_task(db, [season])
     except Exception as e:
         error_msg = "Erro durante a ingestão histórica do jogo: {}".format(str(e))
         logger.error(error_msg)
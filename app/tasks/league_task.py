@@ -2,12 +2,14 @@ import logging
 import time
 from sqlalchemy.orm import Session
 
+from app.core.query_stats import tracked_task
 from app.services.api_client import ApiClient
 from app.services.ingestion import leagues_ingest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@tracked_task
 def run_league_task(db: Session, api_client: ApiClient):
     start_time = time.time()
     
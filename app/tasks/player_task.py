@@ -2,12 +2,16 @@ import logging
 import time
 from sqlalchemy.orm import Session
 
+from app.core.query_stats import tracked_task
 from app.services.api_client import ApiClient
 from app.services.ingestion import player_ingest
+from app.tasks.aggregate_task import run_season_aggregates_task
+from app.tasks.analytics_task import run_analytics_task
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@tracked_task
 def run_players_task(db: Session, client: ApiClient, season: int):
     start_time = time.time()
     
@@ -38,6 +42,7 @@ def run_players_task(db: Session, client: ApiClient, season: int):
     logger.info(f"Tarefa de ingestão de jogadores ({season}) finalizada. Resumo: {summary}")
     return summary
 
+@tracked_task
 def run_players_stats_task(db: Session, client: ApiClient, season: int):
     start_time = time.time()
     
@@ -52,13 +57,18 @@ def run_players_stats_task(db: Session, client: ApiClient, season: int):
     }
 
     try:
-        ingestion_summary = player_ingest.ingest_player_stats(db=db, client=client, season=season)
+        ingestion_summary = player_ingest.ingest_player_stats(db=db, api_client=client, season=season)
         
         summary["status"] = ingestion_summary.get("status", "failure")
         summary["processed_players"] = ingestion_summary.get("processed_players", 0)
         summary["total_stats_lines"] = ingestion_summary.get("total_stats_lines", 0)
         summary["errors"] = ingestion_summary.get("errors", [])
 
+        if ingestion_summary.get("seasons"):
+            summary["aggregates"] = run_season_aggregates_task(db, ingestion_summary["seasons"])
+        if ingestion_summary.get("changed_seasons"):
+            summary["analytics"] = run_analytics_task(db, ingestion_summary["changed_seasons"])
+
     except Exception as e:
         error_message = f"Erro inesperado ao executar a tarefa de estatísticas de jogadores para a temporada {season}: {e}"
         logger.exception(error_message)
@@ -0,0 +1,42 @@
+import logging
+import time
+from typing import Iterable, Optional
+from sqlalchemy.orm import Session
+
+from app.core.query_stats import tracked_task
+from app.services import snapshot_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@tracked_task
+def run_snapshot_task(db: Session, seasons: Optional[Iterable[int]] = None, force: bool = False):
+    start_time = time.time()
+
+    summary = {
+        "task": "parquet_snapshot",
+        "seasons": sorted(set(seasons)) if seasons is not None else None,
+        "status": "failure",
+        "written": [],
+        "skipped": 0,
+        "errors": [],
+        "duration_seconds": 0
+    }
+
+    try:
+        snapshot = snapshot_service.run_snapshot(db, seasons=seasons, force=force)
+
+        summary["status"] = "success"
+        summary["written"] = snapshot["written"]
+        summary["removed"] = snapshot["removed"]
+        summary["skipped"] = snapshot["skipped"]
+        summary["rows"] = snapshot["rows"]
+    except Exception as e:
+        error_msg = "Erro durante o snapshot Parquet: {}".format(str(e))
+        logger.error(error_msg)
+        summary["errors"].append(error_msg)
+
+    end_time = time.time()
+    summary["duration_seconds"] = round(end_time - start_time, 2)
+    logger.info(f"Task terminada: {summary}")
+    return summary
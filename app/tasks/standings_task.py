@@ -2,12 +2,15 @@ import logging
 import time
 from sqlalchemy.orm import Session
 
+from app.core.query_stats import tracked_task
 from app.services.api_client import ApiClient
+from app.services.analytics.standings import refresh_standings
 from app.services.ingestion import standing_ingest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@tracked_task
 def run_standings_task(db: Session, api_client: ApiClient, league_id: int, season: int):
     start_time = time.time()
     
@@ -27,6 +30,10 @@ def run_standings_task(db: Session, api_client: ApiClient, league_id: int, seaso
         summary["status"] = ingest.get("status", "failure")
         summary["processed_standings"] = ingest.get("processed_standings", 0)
         summary["errors"] = ingest.get("errors", [])
+
+        if summary["status"] == "success":
+            # Confere a leitura nova da API contra a classificação calculada dos jogos
+            summary["local_standings"] = refresh_standings(db, [season]).get(season)
     except Exception as e:
         error_msg = "Erro durante a ingestão da classificação: {}".format(str(e))
         logger.error(error_msg)
@@ -2,12 +2,14 @@ import logging
 import time
 from sqlalchemy.orm import Session
 
+from app.core.query_stats import tracked_task
 from app.services.api_client import ApiClient
 from app.services.ingestion import teams_ingest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@tracked_task
 def run_team_task(db: Session, api_client: ApiClient):
     start_time = time.time()
     
@@ -35,6 +37,7 @@ def run_team_task(db: Session, api_client: ApiClient):
     logger.info(f"Task terminada: {summary}")
     return summary
 
+@tracked_task
 def run_team_season_task(db: Session, api_client: ApiClient, season: int):
     start_time = time.time()
     
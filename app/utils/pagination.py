@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+MAX_PAGE_SIZE = 200
+DEFAULT_PAGE_SIZE = 50
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return {"__dt__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Tipo não suportado no cursor: {type(value).__name__}")
+
+def _json_hook(value: dict) -> Any:
+    if "__dt__" in value:
+        return datetime.fromisoformat(value["__dt__"])
+    return value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Codifica os valores da chave de ordenação da última linha da página (paginação keyset).
+    """
+    raw = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _matches(value: Any, expected: type) -> bool:
+    # bool é subclasse de int, mas nunca é chave de ordenação; nulo vem de coluna anulável
+    return value is None or (isinstance(value, expected) and not isinstance(value, bool))
+
+def decode_cursor(cursor: Optional[str], types: Sequence[type]) -> Optional[List[Any]]:
+    """
+    Valida o cursor contra os tipos das chaves de ordenação: um valor de outro tipo iria direto
+    para a comparação no banco e viraria erro 500 em vez de 400.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()), object_hook=_json_hook)
+    except (ValueError, TypeError):
+        raise ValueError("Cursor de paginação inválido.")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Cursor de paginação inválido.")
+    if not all(_matches(value, expected) for value, expected in zip(values, types)):
+        raise ValueError("Cursor de paginação inválido.")
+    return values
+
+def escape_like(value: str) -> str:
+    # O texto do usuário vira prefixo literal no LIKE/ILIKE (com escape="\\"), sem curingas
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], default: Sequence[str], required: Sequence[str] = ()) -> List[str]:
+    """
+    Converte ?fields=a,b,c na lista de colunas projetadas. As colunas obrigatórias (chave da
+    paginação) entram sempre, mesmo que não tenham sido pedidas.
+    """
+    if not fields:
+        selected = list(default)
+    else:
+        selected = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in allowed]
+        if unknown:
+            raise ValueError(f"Campos inválidos: {', '.join(unknown)}. Permitidos: {', '.join(allowed)}.")
+    return list(dict.fromkeys([*required, *selected]))
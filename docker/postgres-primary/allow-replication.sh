@@ -0,0 +1,4 @@
+#!/bin/bash
+# Executado só na criação do volume do primário: libera conexões de replicação para a réplica de leitura
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,84 @@
+import asyncio
+import aiosmtplib
+
+from app.services.email_worker import SMTPPool, send_batch
+
+# Stand-in do servidor SMTP: conta as conexões abertas ao mesmo tempo e pode derrubar a sessão no envio.
+
+class FakeSMTP:
+    def __init__(self, server: "FakeServer"):
+        self.server = server
+        self.is_connected = True
+
+    async def send_message(self, message) -> None:
+        self.server.active += 1
+        self.server.peak = max(self.server.peak, self.server.active)
+        try:
+            await asyncio.sleep(0)
+            if self.server.disconnect:
+                self.is_connected = False
+                raise aiosmtplib.SMTPServerDisconnected("Conexão encerrada pelo servidor")
+            self.server.delivered.append(message["To"])
+        finally:
+            self.server.active -= 1
+
+    async def quit(self) -> None:
+        self.is_connected = False
+
+    def close(self) -> None:
+        self.is_connected = False
+
+class FakeServer:
+    def __init__(self, disconnect: bool = False):
+        self.disconnect = disconnect
+        self.active = 0
+        self.peak = 0
+        self.delivered = []
+
+    async def connect(self) -> FakeSMTP:
+        return FakeSMTP(self)
+
+def _batch(size: int):
+    return [(email_id, f"user{email_id}@example.com", "verification", {"token": "t", "base_url": "http://localhost", "api_v1_str": "/api/v1", "expire_hours": 24}, 0) for email_id in range(size)]
+
+def _send(server: FakeServer, pool_size: int, messages: int):
+    async def run():
+        pool = SMTPPool(pool_size, factory=server.connect)
+        try:
+            return await asyncio.wait_for(send_batch(pool, _batch(messages)), timeout=5), pool
+        finally:
+            await pool.close()
+    return asyncio.run(run())
+
+def test_pool_reuses_connections():
+    server = FakeServer()
+    (sent, failures), pool = _send(server, pool_size=2, messages=6)
+    assert sorted(sent) == list(range(6))
+    assert failures == []
+    assert pool.connections_opened == 2
+    assert server.peak <= 2
+
+def test_discarded_connections_release_waiters():
+    # Toda sessão cai no envio: quem espera uma vaga precisa ser acordado para abrir outra conexão
+    server = FakeServer(disconnect=True)
+    (sent, failures), pool = _send(server, pool_size=2, messages=6)
+    assert sent == []
+    assert len(failures) == 6
+    assert all(isinstance(error, aiosmtplib.SMTPServerDisconnected) for _, _, error in failures)
+    assert pool.connections_opened == 6
+    assert server.peak <= 2
+
+def test_idle_connection_closed_by_server_is_replaced():
+    server = FakeServer()
+
+    async def run():
+        pool = SMTPPool(1, factory=server.connect)
+        await send_batch(pool, _batch(1))
+        pool._idle[0].is_connected = False
+        sent, failures = await send_batch(pool, _batch(1))
+        await pool.close()
+        return sent, failures, pool
+
+    sent, failures, pool = asyncio.run(run())
+    assert sent == [0] and failures == []
+    assert pool.connections_opened == 2
@@ -0,0 +1,42 @@
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.core.middleware import install_middleware
+from app.core.response_cache import CACHE_STATUS_HEADER, cache_response
+
+# Mesma pilha de middlewares da API, com duas origens liberadas no CORS
+os.environ["BACKEND_CORS_ORIGINS"] = '["http://a.example", "http://b.example"]'
+get_settings.cache_clear()
+settings = get_settings()
+
+PATH = f"{settings.api_v1_str}/standings/cors-probe"
+
+app = FastAPI()
+install_middleware(app)
+
+@app.get(PATH)
+def cached_probe(request: Request):
+    cache_response(request, ["cors-probe"])
+    return {"ok": True}
+
+client = TestClient(app)
+
+def test_cached_response_carries_the_requesting_origin():
+    first = client.get(PATH, headers={"Origin": "http://a.example"})
+    assert first.headers[CACHE_STATUS_HEADER] == "MISS"
+    assert first.headers["access-control-allow-origin"] == "http://a.example"
+
+    second = client.get(PATH, headers={"Origin": "http://b.example"})
+    assert second.headers[CACHE_STATUS_HEADER] == "HIT"
+    assert second.headers["access-control-allow-origin"] == "http://b.example"
+
+    revalidated = client.get(PATH, headers={"Origin": "http://b.example", "If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["access-control-allow-origin"] == "http://b.example"
+
+    same_origin = client.get(PATH)
+    assert same_origin.headers[CACHE_STATUS_HEADER] == "HIT"
+    assert "access-control-allow-origin" not in same_origin.headers